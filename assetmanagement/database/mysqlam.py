@@ -1,5 +1,9 @@
 from typing import Optional, Union
+import itertools
 import os
+import re
+import threading
+import time
 
 import pandas as pd
 
@@ -26,9 +30,32 @@ class MySQLAM(MySQLBase):
 
     This class contains functionality for AM MySQL database interactions.
 
+    *_read functions that return a list return a generator of the same elements instead if self.fetch_cursor is
+    FetchCursor.ITER. Rows are then read from the database self.fetch_chunk_size at a time.
+
+    RealEstate, ServiceProvider and RealPropertyValues objects added to records by self._help_read_fk() come from a
+    process wide identity map cache, so bills that reference the same real estate share one instance. Treat these
+    instances as read only. The cache for a table is invalidated by any execute_commit() or execute_bulk_commit() that
+    writes to that table, or explicitly with fk_cache_invalidate(). Entries older than the MYSQL_FK_CACHE_TTL
+    environment variable (seconds) are read again. Default no expiry. 0 disables the cache
+
     Inherits:
         MySQLBase
     """
+    # table: {id: (object, time.monotonic() when read)}
+    _fk_cache = {"real_estate": {}, "service_provider": {}, "real_property_values": {}}
+    _fk_cache_stats = {"hits": 0, "misses": 0, "invalidations": 0}
+    _fk_cache_lock = threading.Lock()
+    _fk_write_re = re.compile(r"\b(?:INTO|UPDATE|FROM|TABLE)\s+`?(real_estate|service_provider|real_property_values)\b",
+                              re.IGNORECASE)
+    # columns in every bill data table (or service_provider). see bill_data_union_read()
+    BILL_UNION_FIELDS = ("tax_category", "provider", "paid_date", "start_date", "end_date", "total_cost",
+                         "tax_rel_cost", "notes")
+    # columns always read by *_bill_data_read() with fields, so bills can be identified, have their foreign key objects
+    # and be put in a BillDict. see _bill_fields()
+    BILL_KEY_FIELDS = ("id", "real_estate_id", "service_provider_id", "start_date", "end_date")
+    COMPLEX_BILL_KEY_FIELDS = BILL_KEY_FIELDS + ("is_actual",)
+
     def __init__(self, fetch_cursor=FetchCursor.LIST_DICT):
         """Init MySQLAM """
         super(MySQLAM, self).__init__(host=os.getenv("MYSQL_HOST"), user=os.getenv("MYSQL_USER"),
@@ -57,11 +84,9 @@ class MySQLAM(MySQLBase):
             MySQLException: if database read issue occurs
         """
         qw = QueryWriter("real_estate", fields=fields, wheres=wheres, order_bys=order_bys)
-        query, params = qw.write_read_query()
-
-        dict_list = self.execute_fetch(query, params=params)
+        query, params = self.write_read_query(qw)
 
-        return [RealEstate.db_dict_constructor(d) for d in dict_list]
+        return self._fetch_construct(query, params, RealEstate.db_dict_list_constructor, read_fk=False)
 
     def service_provider_read(self, fields="*", wheres=(), order_bys=()):
         """ Read fields from service_provider table
@@ -76,11 +101,9 @@ class MySQLAM(MySQLBase):
             MySQLException: if database read issue occurs
         """
         qw = QueryWriter("service_provider", fields=fields, wheres=wheres, order_bys=order_bys)
-        query, params = qw.write_read_query()
+        query, params = self.write_read_query(qw)
 
-        dict_list = self.execute_fetch(query, params=params)
-
-        return [ServiceProvider.db_dict_constructor(d) for d in dict_list]
+        return self._fetch_construct(query, params, ServiceProvider.db_dict_list_constructor, read_fk=False)
 
     def real_property_values_read(self, wheres=(), order_bys=()):
         """ Read from real_property_values table
@@ -95,12 +118,9 @@ class MySQLAM(MySQLBase):
             MySQLException: if database read issue occurs
         """
         qw = QueryWriter("real_property_values", wheres=wheres, order_bys=order_bys)
-        query, params = qw.write_read_query()
-
-        dict_list = self.execute_fetch(query, params=params)
-        dict_list = self._help_read_fk(dict_list)
+        query, params = self.write_read_query(qw)
 
-        return [RealPropertyValues.db_dict_constructor(d) for d in dict_list]
+        return self._fetch_construct(query, params, RealPropertyValues.db_dict_list_constructor)
 
     def mysunpower_hourly_data_read(self, distinct=False, wheres=(), order_bys=()):
         """ Read from mysunpower_hourly_data table
@@ -109,34 +129,200 @@ class MySQLAM(MySQLBase):
             see QueryWriter
 
         Returns:
-            Union[list[dict], pd.DataFrame]: depending on self._fetch_cursor. all fields as keys or columns
+            Union[list[dict], pd.DataFrame, Iterator[dict], Iterator[pd.DataFrame]]: depending on self._fetch_cursor.
+                all fields as keys or columns. Use FetchCursor.ITER or FetchCursor.PD_DF_ITER for large date ranges
         """
         qw = QueryWriter("mysunpower_hourly_data", distinct=distinct, wheres=wheres, order_bys=order_bys,)
-        query, params = qw.write_read_query()
+        query, params = self.write_read_query(qw)
 
         return self.execute_fetch(query, params=params)
 
-    def mysunpower_hourly_data_insert(self, data_list):
+    def mysunpower_hourly_data_insert(self, data_list, local_infile=None, fields=None, ignore=None):
         """ Insert into mysunpower_hourly_data table
 
+        Rows are inserted with multi-row insert statements (see self.bulk_insert()) or, if local_infile is True, with
+        LOAD DATA LOCAL INFILE (see self.load_data_local_infile()), which requires local_infile enabled on the server
+
         Args:
-            data_list (list[dict]): each dict in the list must have the same keys
+            data_list (Union[list[dict], list[list]]): each dict in the list must have the same keys. lists must be in
+                fields order
+            local_infile (Optional[boolean]): True to insert with LOAD DATA LOCAL INFILE. Default None for False
+            fields (Optional[list[str]]): table columns. Default None to use the keys of the first dict in data_list
+            ignore (Optional[boolean]): True to skip rows that duplicate an existing primary key. Default None for False
 
         Raises:
-            MySQLException: if data_list element dicts do not all have the same keys, or other issue occurs
+            ValueError: if data_list element dicts do not all have the same keys
+            MySQLException: if issue occurs
         """
-        if len(data_list) == 0:
-            return
+        if local_infile:
+            self.load_data_local_infile("mysunpower_hourly_data", data_list, fields=fields, ignore=ignore)
+        else:
+            self.bulk_insert("mysunpower_hourly_data", data_list, fields=fields, ignore=ignore)
+
+    def _fetch_construct(self, query, params, constructor, read_fk=True):
+        """ Execute read query, add foreign key table data and construct an object from each record
+
+        If self._fetch_cursor is FetchCursor.ITER, records are read, have foreign key table data added and are
+        constructed self.fetch_chunk_size at a time. See self._iter_construct().
+
+        Args:
+            query (str): read query
+            params (tuple): query parameters
+            constructor (Optional[Callable[[list[dict]], list]]): called with record dicts (all of them, or a chunk at a
+                time for FetchCursor.ITER) to construct one object per record, e.g.
+                ClassConstructors.db_dict_list_constructor(). None to return record dicts
+            read_fk (boolean): True to add foreign key table data to each record. See self._help_read_fk(). Default True
+
+        Returns:
+            Union[list, Iterator]: constructed objects (or record dicts if constructor is None). generator if
+                self._fetch_cursor is FetchCursor.ITER, otherwise list
+
+        Raises:
+            MySQLException: if database read issue occurs
+        """
+        if self._fetch_cursor == FetchCursor.ITER:
+            return self._iter_construct(self.execute_fetch(query, params=params), constructor, read_fk)
+
+        dict_list = self.execute_fetch(query, params=params)
+        if read_fk:
+            dict_list = self._help_read_fk(dict_list)
+
+        return dict_list if constructor is None else constructor(dict_list)
+
+    def _iter_construct(self, dict_iter, constructor, read_fk):
+        """ Generator of objects constructed from a FetchCursor.ITER record generator
+
+        The connection of this instance is busy with dict_iter until it is exhausted, so foreign key table data is read
+        with a second MySQLAM instance.
+
+        Args:
+            dict_iter (Iterator[dict]): from self.execute_fetch() with self._fetch_cursor FetchCursor.ITER
+            constructor (Optional[Callable[[list[dict]], list]]): see self._fetch_construct()
+            read_fk (boolean): see self._fetch_construct()
+
+        Yields:
+            object: constructed object (or record dict if constructor is None)
+        """
+        fk_mam = MySQLAM() if read_fk else None
+        try:
+            while True:
+                dict_list = list(itertools.islice(dict_iter, self.fetch_chunk_size))
+                if len(dict_list) == 0:
+                    break
+                if read_fk:
+                    dict_list = fk_mam._help_read_fk(dict_list)
+                yield from (dict_list if constructor is None else constructor(dict_list))
+        finally:
+            dict_iter.close()
+            if fk_mam is not None:
+                fk_mam.db_close()
+
+    @classmethod
+    def fk_cache_invalidate(cls, table=None, ids=None):
+        """ Remove objects from the foreign key identity map cache
+
+        Args:
+            table (Optional[str]): "real_estate", "service_provider" or "real_property_values". Default None for all
+            ids (Optional[list[int]]): ids to remove. Default None for all ids in table
+        """
+        with cls._fk_cache_lock:
+            for tbl in ([table] if table is not None else list(cls._fk_cache)):
+                if ids is None:
+                    cls._fk_cache[tbl].clear()
+                else:
+                    for i in ids:
+                        cls._fk_cache[tbl].pop(i, None)
+            cls._fk_cache_stats["invalidations"] += 1
+
+    @staticmethod
+    def fk_cache_ttl():
+        """ Foreign key identity map cache entry expiry
+
+        Read from the environment on each call, so MYSQL_FK_CACHE_TTL loaded from .env after this module is imported is
+        used
+
+        Returns:
+            Optional[float]: seconds. None for no expiry
+        """
+        ttl = os.getenv("MYSQL_FK_CACHE_TTL")
+
+        return None if ttl is None else float(ttl)
 
-        qw = QueryWriter("mysunpower_hourly_data", fields=list(data_list[0].keys()))
-        query, data_list = qw.write_insert_query(data_list)
+    @classmethod
+    def fk_cache_stats(cls):
+        """ Foreign key identity map cache counters
 
-        self.execute_commit(query, params_list=data_list, execute_many=True)
+        Returns:
+            dict: keys "hits", "misses" and "invalidations" counted since process start and "size" with the number of
+                cached objects for each table
+        """
+        with cls._fk_cache_lock:
+            return {**cls._fk_cache_stats, "size": {tbl: len(cache) for tbl, cache in cls._fk_cache.items()}}
+
+    def _fk_cache_read(self, table, ids, read_func):
+        """ Get objects by id from the foreign key identity map cache, reading any missing or expired from the database
+
+        Args:
+            table (str): "real_estate", "service_provider" or "real_property_values"
+            ids (set[int]): ids of objects to get
+            read_func (Callable): self.real_estate_read, self.service_provider_read or self.real_property_values_read
+
+        Returns:
+            dict[int, object]: id: object for each id found in the database
+        """
+        now = time.monotonic()
+        ttl = self.fk_cache_ttl()
+        obj_dict, miss_ids = {}, []
+        with self._fk_cache_lock:
+            cache = self._fk_cache[table]
+            for i in ids:
+                entry = cache.get(i)
+                if entry is not None and (ttl is None or now - entry[1] < ttl):
+                    obj_dict[i] = entry[0]
+                else:
+                    miss_ids.append(i)
+            self._fk_cache_stats["hits"] += len(obj_dict)
+            self._fk_cache_stats["misses"] += len(miss_ids)
+
+        if len(miss_ids) > 0:
+            read_dict = {obj.id: obj for obj in read_func(wheres=[["id", "in", miss_ids]])}
+            with self._fk_cache_lock:
+                for i, obj in read_dict.items():
+                    self._fk_cache[table][i] = (obj, now)
+            obj_dict.update(read_dict)
+
+        return obj_dict
+
+    def _fk_cache_invalidate_written(self, query_list):
+        """ Invalidate the foreign key identity map cache of any table written by a query in query_list
+
+        Args:
+            query_list (Union[str, list[str]]): insert, update and/or delete queries
+        """
+        for query in ([query_list] if isinstance(query_list, str) else query_list):
+            for table in set(self._fk_write_re.findall(query)):
+                self.fk_cache_invalidate(table=table.lower())
+
+    def execute_commit(self, query_list, params_list, execute_many: bool = False, pipeline: Optional[bool] = None):
+        """ See MySQLBase.execute_commit(). Also invalidates the foreign key identity map cache of written tables """
+        try:
+            return super().execute_commit(query_list, params_list, execute_many=execute_many, pipeline=pipeline)
+        finally:
+            self._fk_cache_invalidate_written(query_list)
+
+    def execute_bulk_commit(self, query_params_list):
+        """ See MySQLBase.execute_bulk_commit(). Also invalidates the foreign key identity map cache of written tables
+        """
+        try:
+            return super().execute_bulk_commit(query_params_list)
+        finally:
+            self._fk_cache_invalidate_written([query for query, _ in query_params_list])
 
     def _help_read_fk(self, dict_list):
         """ Use this function to get foreign key table data
 
-        Works for real_estate_id, service_provider_id and real_property_values_id fields
+        Works for real_estate_id, service_provider_id and real_property_values_id fields. Objects come from the foreign
+        key identity map cache (see class docstring) and are shared between dicts and calls
 
         Args:
             dict_list (list[dict]): dicts not required to have real_estate_id or service_provider_id
@@ -155,17 +341,15 @@ class MySQLAM(MySQLBase):
 
         re_dict, sp_dict, rpv_dict = {}, {}, {}
         if has_real_estate:
-            re_dict = self.real_estate_read(
-                wheres=[["id", "in", list(set([d["real_estate_id"] for d in dict_list]))]])
-            re_dict = {real_estate.id: real_estate for real_estate in re_dict}
+            re_dict = self._fk_cache_read(
+                "real_estate", set([d["real_estate_id"] for d in dict_list]), self.real_estate_read)
         if has_service_provider:
-            sp_dict = self.service_provider_read(
-                wheres=[["id", "in", list(set([d["service_provider_id"] for d in dict_list]))]])
-            sp_dict = {service_provider.id: service_provider for service_provider in sp_dict}
+            sp_dict = self._fk_cache_read(
+                "service_provider", set([d["service_provider_id"] for d in dict_list]), self.service_provider_read)
         if has_real_property_values:
-            rpv_dict = self.real_property_values_read(
-                wheres=[["id", "in", list(set([d["real_property_values_id"] for d in dict_list]))]])
-            rpv_dict = {real_property_values.id: real_property_values for real_property_values in rpv_dict}
+            rpv_dict = self._fk_cache_read(
+                "real_property_values", set([d["real_property_values_id"] for d in dict_list]),
+                self.real_property_values_read)
 
         if has_real_estate or has_service_provider or has_real_property_values:
             for d in dict_list:
@@ -178,11 +362,112 @@ class MySQLAM(MySQLBase):
 
         return dict_list
 
-    def solar_bill_data_read(self, wheres=(), order_bys=(), limit=None):
-        """ Read all fields from solar_bill_data table
+    def _bill_data_update(self, table, fields, set_params, wheres, where_params, bill_list):
+        """ Update a bill data table. See the *_bill_data_update() functions
+
+        If bills in bill_list are updated by id (wheres is [["id", "=", None]] and where_params is None), all bills are
+        updated with one statement per self.bulk_chunk_size bills (see self.bulk_update()) instead of one statement per
+        bill.
+
+        Args:
+            table (str): bill data table
+            fields, set_params, wheres, where_params, bill_list: see the *_bill_data_update() functions
+
+        Raises:
+            Union[AttributeError, ValueError]: if sql query and parameters can't be properly compiled
+            MySQLException: if update issue occurs
+        """
+        if len(bill_list) > 0 and where_params is None and isinstance(fields, list) and \
+                [list(cond) for cond in wheres] == [["id", "=", None]]:
+            self.bulk_update(table, fields, objects=bill_list)
+            return
+
+        qw = QueryWriter(table, fields=fields, wheres=wheres)
+        query, final_params = qw.write_update_query(set_params, where_params, objects=bill_list)
+
+        if query == "0":  # length of set_params is 0
+            return
+
+        self.execute_commit(query, params_list=final_params, execute_many=True)
+
+    @staticmethod
+    def _bill_fields(fields, key_fields=BILL_KEY_FIELDS):
+        """ Columns to select for the fields argument of a *_bill_data_read() function
+
+        Args:
+            fields (Optional[list[str]]): bill table columns. None for all columns
+            key_fields (tuple[str]): columns always selected. Default BILL_KEY_FIELDS
+
+        Returns:
+            Union[str, list[str]]: "*" if fields is None, otherwise key_fields followed by the other fields
+        """
+        if fields is None:
+            return "*"
+
+        return list(key_fields) + [f for f in fields if f not in key_fields]
+
+    def bill_data_union_read(self, tables, fields=BILL_UNION_FIELDS, wheres=(), order_bys=(), aliases=None):
+        """ Read fields common to bill data tables from several tables with one UNION ALL query
+
+        Each table is joined to service_provider, so "provider" and "tax_category" can be used as fields and in wheres.
+        The same wheres apply to every table, so where columns must be in every table (unqualified, e.g.
+        "real_estate_id", "paid_date"). Foreign key objects are not read and no bill objects are constructed.
+        "in" lists are always expanded (never read from a temporary table, see QueryWriter.where_clause()), since the
+        where clause is repeated in each UNION ALL select and MySQL can't open a temporary table twice in one query.
+
+        Args:
+            tables (list[str]): bill data tables (e.g. ["simple_bill_data", "electric_bill_data"])
+            fields (Union[list[str], tuple[str]]): output columns. Default BILL_UNION_FIELDS
+            wheres: see QueryWriter. Default ()
+            order_bys: see QueryWriter. output column names. Default ()
+            aliases (Optional[dict[str, dict[str, Optional[str]]]]): table: {output column: table column} for output
+                columns that have a different name in a table, or None for NULL if a table does not have the column.
+                e.g. {"electric_bill_data": {"usage": "total_kwh"}, "natgas_bill_data": {"usage": "total_therms"}}.
+                Default None for output column names in every table
+
+        Returns:
+            pd.DataFrame: "bill_table" column with the table of each row followed by fields columns. read with
+                FetchCursor.PD_DF_COLUMNAR, so DECIMAL columns are float64 and DATE columns are datetime64. Empty
+                dataframe will have column headers
+
+        Raises:
+            MySQLException: if database read issue occurs
+        """
+        aliases = {} if aliases is None else aliases
+        where_str, where_params = QueryWriter(tables[0], wheres=wheres).where_clause(expand_in_lists=True)
+
+        select_list = []
+        for table in tables:
+            select_str = "SELECT '" + table + "' AS bill_table"
+            for field in fields:
+                col = aliases.get(table, {}).get(field, field)
+                if col is None:
+                    col = "NULL"
+                elif col in ("provider", "tax_category"):
+                    col = "service_provider." + col
+                else:
+                    col = table + "." + col
+                select_str += ", " + col + " AS " + field
+            select_list.append(select_str + " FROM " + table + " JOIN service_provider ON service_provider.id = " +
+                               table + ".service_provider_id " + where_str)
+
+        query = " UNION ALL ".join(select_list) + " " + QueryWriter(tables[0], order_bys=order_bys).order_by_stmt()
+        query = query.rstrip() + ";"
+
+        fetch_cursor = self.fetch_cursor
+        self.fetch_cursor = FetchCursor.PD_DF_COLUMNAR
+        try:
+            return self.execute_fetch(query, params=where_params * len(tables))
+        finally:
+            self.fetch_cursor = fetch_cursor
+
+    def solar_bill_data_read(self, wheres=(), order_bys=(), limit=None, fields=None):
+        """ Read all fields (or fields) from solar_bill_data table
 
         Args:
             see QueryWriter
+            fields (Optional[list[str]]): columns to read. BILL_KEY_FIELDS are always read. Bills only have these
+                attributes set (others are left at their default_constructor() values). Default None for all columns
 
         Returns:
             list[SolarBillData]: list will be empty if no bill data found matching wheres
@@ -190,13 +475,11 @@ class MySQLAM(MySQLBase):
         Raises:
             MySQLException: if database read issue occurs
         """
-        qw = QueryWriter("solar_bill_data", wheres=wheres, order_bys=order_bys, limit=limit)
-        query, params = qw.write_read_query()
-
-        dict_list = self.execute_fetch(query, params=params)
-        dict_list = self._help_read_fk(dict_list)
+        qw = QueryWriter("solar_bill_data", fields=self._bill_fields(fields), wheres=wheres, order_bys=order_bys,
+                         limit=limit)
+        query, params = self.write_read_query(qw)
 
-        return [SolarBillData.db_dict_constructor(d) for d in dict_list]
+        return self._fetch_construct(query, params, SolarBillData.db_dict_list_constructor)
 
     def solar_bill_data_insert(self, bill_list, ignore=None):
         """ Insert into solar_bill_data table
@@ -213,7 +496,8 @@ class MySQLAM(MySQLBase):
     def solar_bill_data_update(self, fields, set_params=(), wheres=(), where_params=None, bill_list=()):
         """ Update solar_bill_data table
 
-        See QueryWriter write_update_query() for an example
+        See QueryWriter write_update_query() for an example. Updates by id are done in bulk, see
+        self._bill_data_update()
 
         Args:
             fields: See QueryWriter __init__ docstring. must be list[str] (not str) if bill_list is not empty
@@ -228,19 +512,16 @@ class MySQLAM(MySQLBase):
             Union[AttributeError, ValueError]: if sql query and parameters can't be properly compiled
             MySQLException: if update issue occurs
         """
-        qw = QueryWriter("solar_bill_data", fields=fields, wheres=wheres)
-        query, final_params = qw.write_update_query(set_params, where_params, objects=bill_list)
+        self._bill_data_update("solar_bill_data", fields, set_params, wheres, where_params, bill_list)
 
-        if query == "0":  # length of set_params is 0
-            return
-
-        self.execute_commit(query, params_list=final_params, execute_many=True)
-
-    def electric_bill_data_read(self, wheres=(), order_bys=(), limit=None):
-        """ Read all fields from electric_bill_data table
+    def electric_bill_data_read(self, wheres=(), order_bys=(), limit=None, fields=None):
+        """ Read all fields (or fields) from electric_bill_data table
 
         Args:
             see QueryWriter
+            fields (Optional[list[str]]): columns to read. COMPLEX_BILL_KEY_FIELDS are always read. Bills only have
+                these attributes set (others are left at their default_constructor() values). Default None for all
+                columns
 
         Returns:
             list[ElectricBillData]: list will be empty if no bill data found matching wheres
@@ -248,13 +529,12 @@ class MySQLAM(MySQLBase):
         Raises:
             MySQLException: if database read issue occurs
         """
-        qw = QueryWriter("electric_bill_data", wheres=wheres, order_bys=order_bys, limit=limit)
-        query, params = qw.write_read_query()
+        qw = QueryWriter("electric_bill_data",
+                         fields=self._bill_fields(fields, key_fields=self.COMPLEX_BILL_KEY_FIELDS),
+                         wheres=wheres, order_bys=order_bys, limit=limit)
+        query, params = self.write_read_query(qw)
 
-        dict_list = self.execute_fetch(query, params=params)
-        dict_list = self._help_read_fk(dict_list)
-
-        return [ElectricBillData.db_dict_constructor(db_dict=d) for d in dict_list]
+        return self._fetch_construct(query, params, ElectricBillData.db_dict_list_constructor)
 
     def electric_bill_data_insert(self, bill_list, ignore=None):
         """ Insert into electric_bill_data table
@@ -271,7 +551,8 @@ class MySQLAM(MySQLBase):
     def electric_bill_data_update(self, fields, set_params=(), wheres=(), where_params=None, bill_list=()):
         """ Update electric_bill_data table
 
-        See QueryWriter write_update_query() for an example
+        See QueryWriter write_update_query() for an example. Updates by id are done in bulk, see
+        self._bill_data_update()
 
         Args:
             fields: See QueryWriter __init__ docstring. must be list[str] (not str) if bill_list is not empty
@@ -286,13 +567,7 @@ class MySQLAM(MySQLBase):
             Union[AttributeError, ValueError]: if sql query and parameters can't be properly compiled
             MySQLException: if update issue occurs
         """
-        qw = QueryWriter("electric_bill_data", fields=fields, wheres=wheres)
-        query, final_params = qw.write_update_query(set_params, where_params, objects=bill_list)
-
-        if query == "0":  # length of set_params is 0
-            return
-
-        self.execute_commit(query, params_list=final_params, execute_many=True)
+        self._bill_data_update("electric_bill_data", fields, set_params, wheres, where_params, bill_list)
 
     def electric_data_read(self, wheres=(), order_bys=()):
         """ Read from electric_data table
@@ -307,12 +582,9 @@ class MySQLAM(MySQLBase):
             MySQLException: if database read issue occurs
         """
         qw = QueryWriter("electric_data", wheres=wheres, order_bys=order_bys)
-        query, params = qw.write_read_query()
+        query, params = self.write_read_query(qw)
 
-        dict_list = self.execute_fetch(query, params=params)
-        dict_list = self._help_read_fk(dict_list)
-
-        return [ElectricData.db_dict_constructor(d) for d in dict_list]
+        return self._fetch_construct(query, params, ElectricData.db_dict_list_constructor)
 
     def electric_data_insert(self, data_list):
         """ Insert into electric_data table
@@ -338,18 +610,18 @@ class MySQLAM(MySQLBase):
             MySQLException:
         """
         qw = QueryWriter("estimate_notes", wheres=wheres, order_bys=order_bys)
-        query, params = qw.write_read_query()
+        query, params = self.write_read_query(qw)
 
-        notes_list = self.execute_fetch(query, params=params)
-        notes_list = self._help_read_fk(notes_list)
+        return self._fetch_construct(query, params, None)
 
-        return notes_list
-
-    def natgas_bill_data_read(self, wheres=(), order_bys=(), limit=None):
-        """ Read all fields from natgas_bill_data table
+    def natgas_bill_data_read(self, wheres=(), order_bys=(), limit=None, fields=None):
+        """ Read all fields (or fields) from natgas_bill_data table
 
         Args:
             see QueryWriter
+            fields (Optional[list[str]]): columns to read. COMPLEX_BILL_KEY_FIELDS are always read. Bills only have
+                these attributes set (others are left at their default_constructor() values). Default None for all
+                columns
 
         Returns:
             list[NatGasBillData]: list will be empty if no bill data found matching wheres
@@ -357,13 +629,11 @@ class MySQLAM(MySQLBase):
         Raises:
             MySQLException: if database read issue occurs
         """
-        qw = QueryWriter("natgas_bill_data", wheres=wheres, order_bys=order_bys, limit=limit)
-        query, params = qw.write_read_query()
+        qw = QueryWriter("natgas_bill_data", fields=self._bill_fields(fields, key_fields=self.COMPLEX_BILL_KEY_FIELDS),
+                         wheres=wheres, order_bys=order_bys, limit=limit)
+        query, params = self.write_read_query(qw)
 
-        dict_list = self.execute_fetch(query, params=params)
-        dict_list = self._help_read_fk(dict_list)
-
-        return [NatGasBillData.db_dict_constructor(d) for d in dict_list]
+        return self._fetch_construct(query, params, NatGasBillData.db_dict_list_constructor)
 
     def natgas_bill_data_insert(self, bill_list, ignore=None):
         """ Insert into natgas_bill_data table
@@ -380,7 +650,8 @@ class MySQLAM(MySQLBase):
     def natgas_bill_data_update(self, fields, set_params=(), wheres=(), where_params=None, bill_list=()):
         """ Update natgas_bill_data table
 
-        See QueryWriter write_update_query() for an example
+        See QueryWriter write_update_query() for an example. Updates by id are done in bulk, see
+        self._bill_data_update()
 
         Args:
             fields: See QueryWriter __init__ docstring. must be list[str] (not str) if bill_list is not empty
@@ -395,13 +666,7 @@ class MySQLAM(MySQLBase):
             Union[AttributeError, ValueError]: if sql query and parameters can't be properly compiled
             MySQLException: if update issue occurs
         """
-        qw = QueryWriter("natgas_bill_data", fields=fields, wheres=wheres)
-        query, final_params = qw.write_update_query(set_params, where_params, objects=bill_list)
-
-        if query == "0":  # length of set_params is 0
-            return
-
-        self.execute_commit(query, params_list=final_params, execute_many=True)
+        self._bill_data_update("natgas_bill_data", fields, set_params, wheres, where_params, bill_list)
 
     def natgas_data_read(self, wheres=(), order_bys=()):
         """ Read from natgas_data table
@@ -416,12 +681,9 @@ class MySQLAM(MySQLBase):
             MySQLException if database read issue occurs
         """
         qw = QueryWriter("natgas_data", wheres=wheres, order_bys=order_bys)
-        query, params = qw.write_read_query()
-
-        dict_list = self.execute_fetch(query, params=params)
-        dict_list = self._help_read_fk(dict_list)
+        query, params = self.write_read_query(qw)
 
-        return [NatGasData.db_dict_constructor(d) for d in dict_list]
+        return self._fetch_construct(query, params, NatGasData.db_dict_list_constructor)
 
     def natgas_data_insert(self, data_list):
         """ Insert into natgas_data table
@@ -449,7 +711,8 @@ class MySQLAM(MySQLBase):
     def simple_bill_data_update(self, fields, set_params=(), wheres=(), where_params=None, bill_list=()):
         """ Update simple_bill_data table
 
-        See QueryWriter write_update_query() for an example
+        See QueryWriter write_update_query() for an example. Updates by id are done in bulk, see
+        self._bill_data_update()
 
         Args:
             fields: See QueryWriter __init__ docstring. must be list[str] (not str) if bill_list is not empty
@@ -464,19 +727,15 @@ class MySQLAM(MySQLBase):
             Union[AttributeError, ValueError]: if sql query and parameters can't be properly compiled
             MySQLException: if update issue occurs
         """
-        qw = QueryWriter("simple_bill_data", fields=fields, wheres=wheres)
-        query, final_params = qw.write_update_query(set_params, where_params, objects=bill_list)
-
-        if query == "0":  # length of set_params is 0
-            return
+        self._bill_data_update("simple_bill_data", fields, set_params, wheres, where_params, bill_list)
 
-        self.execute_commit(query, params_list=final_params, execute_many=True)
-
-    def simple_bill_data_read(self, wheres=(), order_bys=(), limit=None):
-        """ Read all fields from simple_bill_data table
+    def simple_bill_data_read(self, wheres=(), order_bys=(), limit=None, fields=None):
+        """ Read all fields (or fields) from simple_bill_data table
 
         Args:
             see QueryWriter
+            fields (Optional[list[str]]): columns to read. BILL_KEY_FIELDS are always read. Bills only have these
+                attributes set (others are left at their default_constructor() values). Default None for all columns
 
         Returns:
             list[SimpleServiceBillData]: list will be empty if no bill data found matching wheres
@@ -484,13 +743,11 @@ class MySQLAM(MySQLBase):
         Raises:
             MySQLException: if database read issue occurs
         """
-        qw = QueryWriter("simple_bill_data", wheres=wheres, order_bys=order_bys, limit=limit)
-        query, params = qw.write_read_query()
-
-        dict_list = self.execute_fetch(query, params=params)
-        dict_list = self._help_read_fk(dict_list)
+        qw = QueryWriter("simple_bill_data", fields=self._bill_fields(fields), wheres=wheres, order_bys=order_bys,
+                         limit=limit)
+        query, params = self.write_read_query(qw)
 
-        return [SimpleServiceBillData.db_dict_constructor(d) for d in dict_list]
+        return self._fetch_construct(query, params, SimpleServiceBillData.db_dict_list_constructor)
 
     def mortgage_bill_data_insert(self, bill_list, ignore=None):
         """ Insert into mortgage_bill_data table
@@ -507,7 +764,8 @@ class MySQLAM(MySQLBase):
     def mortgage_bill_data_update(self, fields, set_params=(), wheres=(), where_params=None, bill_list=()):
         """ Update mortgage_bill_data table
 
-        See QueryWriter write_update_query() for an example
+        See QueryWriter write_update_query() for an example. Updates by id are done in bulk, see
+        self._bill_data_update()
 
         Args:
             fields: See QueryWriter __init__ docstring. must be list[str] (not str) if bill_list is not empty
@@ -522,19 +780,15 @@ class MySQLAM(MySQLBase):
             Union[AttributeError, ValueError]: if sql query and parameters can't be properly compiled
             MySQLException: if update issue occurs
         """
-        qw = QueryWriter("mortgage_bill_data", fields=fields, wheres=wheres)
-        query, final_params = qw.write_update_query(set_params, where_params, objects=bill_list)
-
-        if query == "0":  # length of set_params is 0
-            return
+        self._bill_data_update("mortgage_bill_data", fields, set_params, wheres, where_params, bill_list)
 
-        self.execute_commit(query, params_list=final_params, execute_many=True)
-
-    def mortgage_bill_data_read(self, wheres=(), order_bys=(), limit=None):
-        """ Read all fields from mortgage_bill_data table
+    def mortgage_bill_data_read(self, wheres=(), order_bys=(), limit=None, fields=None):
+        """ Read all fields (or fields) from mortgage_bill_data table
 
         Args:
             see QueryWriter
+            fields (Optional[list[str]]): columns to read. BILL_KEY_FIELDS are always read. Bills only have these
+                attributes set (others are left at their default_constructor() values). Default None for all columns
 
         Returns:
             list[MortgageBillData]: list will be empty if no bill data found matching wheres
@@ -542,13 +796,11 @@ class MySQLAM(MySQLBase):
         Raises:
             MySQLException: if database read issue occurs
         """
-        qw = QueryWriter("mortgage_bill_data", wheres=wheres, order_bys=order_bys, limit=limit)
-        query, params = qw.write_read_query()
-
-        dict_list = self.execute_fetch(query, params=params)
-        dict_list = self._help_read_fk(dict_list)
+        qw = QueryWriter("mortgage_bill_data", fields=self._bill_fields(fields), wheres=wheres, order_bys=order_bys,
+                         limit=limit)
+        query, params = self.write_read_query(qw)
 
-        return [MortgageBillData.db_dict_constructor(d) for d in dict_list]
+        return self._fetch_construct(query, params, MortgageBillData.db_dict_list_constructor)
 
     def depreciation_bill_data_insert(self, bill_list, ignore=None):
         """ Insert into depreciation_bill_data table
@@ -565,7 +817,8 @@ class MySQLAM(MySQLBase):
     def depreciation_bill_data_update(self, fields, set_params=(), wheres=(), where_params=None, bill_list=()):
         """ Update depreciation_bill_data table
 
-        See QueryWriter write_update_query() for an example
+        See QueryWriter write_update_query() for an example. Updates by id are done in bulk, see
+        self._bill_data_update()
 
         Args:
             fields: See QueryWriter __init__ docstring. must be list[str] (not str) if bill_list is not empty
@@ -580,19 +833,16 @@ class MySQLAM(MySQLBase):
             Union[AttributeError, ValueError]: if sql query and parameters can't be properly compiled
             MySQLException: if update issue occurs
         """
-        qw = QueryWriter("depreciation_bill_data", fields=fields, wheres=wheres)
-        query, final_params = qw.write_update_query(set_params, where_params, objects=bill_list)
-
-        if query == "0":  # length of set_params is 0
-            return
+        self._bill_data_update("depreciation_bill_data", fields, set_params, wheres, where_params, bill_list)
 
-        self.execute_commit(query, params_list=final_params, execute_many=True)
-
-    def depreciation_bill_data_read(self, wheres=(), order_bys=(), limit=None):
-        """ Read all fields from depreciation_bill_data table
+    def depreciation_bill_data_read(self, wheres=(), order_bys=(), limit=None, fields=None):
+        """ Read all fields (or fields) from depreciation_bill_data table
 
         Args:
             see QueryWriter
+            fields (Optional[list[str]]): columns to read. BILL_KEY_FIELDS and real_property_values_id are always read.
+                Bills only have these attributes set (others are left at their default_constructor() values). Default
+                None for all columns
 
         Returns:
             list[DepreciationBillData]: list will be empty if no bill data found matching wheres
@@ -600,10 +850,10 @@ class MySQLAM(MySQLBase):
         Raises:
             MySQLException: if database read issue occurs
         """
-        qw = QueryWriter("depreciation_bill_data", wheres=wheres, order_bys=order_bys, limit=limit)
-        query, params = qw.write_read_query()
-
-        dict_list = self.execute_fetch(query, params=params)
-        dict_list = self._help_read_fk(dict_list)
+        qw = QueryWriter("depreciation_bill_data",
+                         fields=self._bill_fields(fields,
+                                                  key_fields=self.BILL_KEY_FIELDS + ("real_property_values_id",)),
+                         wheres=wheres, order_bys=order_bys, limit=limit)
+        query, params = self.write_read_query(qw)
 
-        return [DepreciationBillData.db_dict_constructor(d) for d in dict_list]
\ No newline at end of file
+        return self._fetch_construct(query, params, DepreciationBillData.db_dict_list_constructor)
\ No newline at end of file
@@ -1,19 +1,43 @@
 """Module for base class for MySQL database connections. """
 from abc import ABC, abstractmethod
+from collections import OrderedDict, deque
+from decimal import Decimal
 from enum import Enum
 from typing import Optional, Union
+import datetime
+import math
+import os
+import tempfile
+import threading
+import time
 import traceback
 
+from mysql.connector import errorcode
+from mysql.connector.constants import FieldFlag, FieldType
 import mysql.connector
+import numpy as np
 import pandas as pd
 
 from .mysqlexception import MySQLException
+from .querystats import QueryStats
 from .querywriter import QueryWriter
+from .sqlitebackend import SQLitePool
 from assetmanagement.loggingam.logger import Logger
 
 
+# mysql client and server error codes that mean the connection to the server is gone
+DISCONNECT_ERRNOS = (errorcode.CR_SERVER_GONE_ERROR, errorcode.CR_SERVER_LOST, errorcode.CR_SERVER_LOST_EXTENDED,
+                     errorcode.ER_CLIENT_INTERACTION_TIMEOUT)
+# statements that can be prepared and explained
+PREPARABLE_STATEMENTS = ("SELECT", "INSERT", "REPLACE", "UPDATE", "DELETE")
+# parameter types the binary protocol of prepared statements handles (bool is an int)
+PREPARED_PARAM_TYPES = (int, float, str, bytes, Decimal, datetime.date, datetime.time, datetime.timedelta)
+
+
 class DictInsertable(ABC):
     """ Classes that implement this class can call MySQLBase.dictinsertable_insert() function """
+    __slots__ = ()
+
     @abstractmethod
     def __init__(self):
         pass
@@ -37,18 +61,532 @@ class FetchCursor(Enum):
     PD_DF: use pd.read_sql(). data returned as a pd.DataFrame. Empty dataframe will have column headers.
     LIST_DICT: return data as list(dict), directly from dictionary cursor. No data returns empty list.
     LIST_LIST: return data as list(list), directly from cursor. No data returns empty list.
+    ITER: return a generator of dict rows (or tuple rows if a non-dict cursor is requested) read from an unbuffered
+        cursor in chunks. Only one chunk of rows is held in memory at a time. No data yields nothing.
+    PD_DF_ITER: return a generator of pd.DataFrame chunks read from an unbuffered cursor. Each dataframe has up to
+        chunk size rows. No data yields nothing.
+    COLUMNAR: return a dict of column name: typed np.ndarray built from unbuffered cursor chunks, without creating a
+        dict per row. Column types come from the result set metadata: DECIMAL, FLOAT and DOUBLE as float64, integers as
+        int64 (float64 if there are NULLs), DATE, DATETIME and TIMESTAMP as datetime64[us], ENUM as pd.Categorical and
+        anything else as object. NULL is NaN or NaT where the type allows. No data returns empty arrays.
+    PD_DF_COLUMNAR: COLUMNAR wrapped in a pd.DataFrame without copying. Faster than PD_DF and DECIMAL columns are
+        float64 instead of object. Empty dataframe will have column headers.
+
+    ITER and PD_DF_ITER keep the result set open on the connection until the generator is exhausted or closed. No other
+    query can be executed on the same MySQLBase instance until then.
     """
     PD_DF = "pandas_dataframe"
     LIST_DICT = "list_dict"
     LIST_LIST = "list_list"
+    ITER = "iterator"
+    PD_DF_ITER = "pandas_dataframe_iterator"
+    COLUMNAR = "columnar"
+    PD_DF_COLUMNAR = "pandas_dataframe_columnar"
+
+
+class ConnectionPool:
+    """ Process wide pool of mysql database connections
+
+    One pool exists per (host, user, db_name, ssl_ca_path) combination. See ConnectionPool.get_pool(). MySQLBase
+    instances check a connection out of the pool when they need one and check it back in when db_close() is called,
+    so the many short lived "with MySQLAM() as mam:" blocks reuse open connections instead of opening a new connection
+    each time.
+
+    Checkout never blocks. If no idle connection is available a new connection is created. On checkin, the connection is
+    kept for reuse if fewer than pool_size connections are idle, otherwise it is closed. Connections are assumed to be
+    alive. They are only pinged at checkout if they have been idle longer than ping_interval.
+
+    Pool size, idle timeout and ping interval default to MYSQL_POOL_SIZE, MYSQL_POOL_IDLE_TIMEOUT and
+    MYSQL_PING_INTERVAL in .env, or 5 connections, 300 seconds and 60 seconds if not set.
+
+    Each connection has an LRU cache of up to stmt_cache_size server side prepared statements keyed by SQL text (see
+    prepared_cursor()), kept for as long as the connection is open, so statements MySQLBase executes repeatedly are
+    parsed and planned by the server once per connection. stmt_cache_size defaults to MYSQL_STMT_CACHE_SIZE in .env, or
+    32 if not set. 0 disables prepared statements.
+
+    Attributes:
+        pool_size (int): max number of idle connections kept for reuse. 0 to disable reuse
+        idle_timeout (float): seconds a connection can be idle in the pool before it is closed instead of reused
+        ping_interval (float): seconds a connection can be idle before it is pinged to check it is still connected.
+            MySQLBase also uses this between queries on the same instance
+        connect_kwargs (dict): keyword arguments passed to mysql.connector.connect()
+        max_params (Optional[int]): max number of parameters in one statement. None for no limit (mysql.connector
+            substitutes parameters client side)
+        stmt_cache_size (int): max number of prepared statements cached per connection. 0 to disable
+        multi_statements (boolean): True. connections can execute several statements sent as one batch with
+            cursor.execute(batch, params, multi=True) (mysql.connector sets the multi statements client flag by default
+            and requires multi=True to read the result of each statement). see MySQLBase.execute_commit() pipeline
+    """
+    _pools = {}
+    _pools_lock = threading.Lock()
+
+    max_params = None
+    multi_statements = True
+
+    def __init__(self, pool_size, idle_timeout, ping_interval, stmt_cache_size, **connect_kwargs):
+        """ init ConnectionPool. Use ConnectionPool.get_pool() instead of calling this directly
+
+        Args:
+            pool_size (int): see class docstring
+            idle_timeout (float): see class docstring
+            ping_interval (float): see class docstring
+            stmt_cache_size (int): see class docstring
+            **connect_kwargs: see class docstring
+        """
+        self.pool_size = pool_size
+        self.idle_timeout = idle_timeout
+        self.ping_interval = ping_interval
+        self.stmt_cache_size = stmt_cache_size
+        self.connect_kwargs = connect_kwargs
+
+        self._lock = threading.Lock()
+        # (connection, time.monotonic() when checked in). most recently checked in on the right
+        self._idle = deque()
+        self._in_use = 0
+        self._stats = {"checkouts": 0, "reuses": 0, "creates": 0, "checkins": 0, "closed_idle_timeout": 0,
+                       "closed_pool_full": 0, "discards": 0, "pings": 0,
+                       "closed_ping_failed": 0, "stmt_hits": 0, "stmt_misses": 0, "stmt_evictions": 0}
+        # id(connection): OrderedDict of SQL text: (prepared cursor, SQL text). least recently used first
+        self._stmt_caches = {}
+
+    @classmethod
+    def get_pool(cls, host, user, password, db_name, ssl_ca_path=None):
+        """ Get the process wide pool for the connection parameters. Create the pool if it doesn't exist
+
+        Args:
+            host (str): database host url.
+            user (str): database user name.
+            password (str): database password.
+            db_name (str): database name.
+            ssl_ca_path (Optional[str]): full path to ssl certificate authority file. Default None for no certificate
+
+        Returns:
+            ConnectionPool: pool for the connection parameters
+        """
+        key = (host, user, db_name, ssl_ca_path)
+        with cls._pools_lock:
+            pool = cls._pools.get(key, None)
+            if pool is None:
+                pool = ConnectionPool(int(os.getenv("MYSQL_POOL_SIZE", "5")),
+                                      float(os.getenv("MYSQL_POOL_IDLE_TIMEOUT", "300")),
+                                      float(os.getenv("MYSQL_PING_INTERVAL", "60")),
+                                      int(os.getenv("MYSQL_STMT_CACHE_SIZE", "32")), host=host, user=user,
+                                      passwd=password, database=db_name, ssl_ca=ssl_ca_path,
+                                      ssl_verify_cert=(ssl_ca_path is not None),
+                                      allow_local_infile_in_path=tempfile.gettempdir())
+                cls._pools[key] = pool
+
+        return pool
+
+    @classmethod
+    def close_all_pools(cls):
+        """ Close all idle connections in all pools and forget the pools. Connections checked out are not affected """
+        with cls._pools_lock:
+            pools = list(cls._pools.values())
+            cls._pools.clear()
+
+        for pool in pools:
+            pool.close_idle()
+
+    def _close_quietly(self, cnx):
+        """ Close connection, forget its prepared statements and ignore any mysql.connector.Error. The connection is
+        being thrown away anyway. Its prepared statements are deallocated by the server when it is closed
+        """
+        with self._lock:
+            self._stmt_caches.pop(id(cnx), None)
+
+        try:
+            cnx.close()
+        except mysql.connector.Error:
+            pass
+
+    def prepared_cursor(self, cnx, query):
+        """ Get the prepared statement cursor of query on cnx from the LRU cache, or a new one if it is not cached
+
+        A new cursor prepares query on its first execute. The least recently used cursor is closed (deallocating its
+        statement on the server) if the cache of cnx is full. Only the MySQLBase instance that checked out cnx may use
+        the cursor.
+
+        Args:
+            cnx (mysql.connector.connection): connection from self.checkout()
+            query (str): SQL text with %s parameter markers
+
+        Returns:
+            tuple[mysql.connector.cursor.MySQLCursorPrepared, str]: (cursor, SQL text). Always execute the cursor with
+                the returned SQL text object. The cursor only reuses its prepared statement if it is executed with the
+                same str object again
+        """
+        evicted = None
+        with self._lock:
+            cache = self._stmt_caches.setdefault(id(cnx), OrderedDict())
+            entry = cache.get(query, None)
+            if entry is not None:
+                cache.move_to_end(query)
+                self._stats["stmt_hits"] += 1
+                return entry
+            self._stats["stmt_misses"] += 1
+            if len(cache) >= self.stmt_cache_size:
+                evicted = cache.popitem(last=False)[1][0]
+                self._stats["stmt_evictions"] += 1
+
+        if evicted is not None:
+            try:
+                evicted.close()
+            except mysql.connector.Error:
+                pass
+
+        entry = (cnx.cursor(prepared=True), query)
+        with self._lock:
+            self._stmt_caches.setdefault(id(cnx), OrderedDict())[query] = entry
+
+        return entry
+
+    def forget_prepared(self, cnx, query):
+        """ Remove query from the prepared statement cache of cnx and close its cursor, e.g. after it failed
+
+        Args:
+            cnx (mysql.connector.connection): connection from self.checkout()
+            query (str): SQL text
+        """
+        with self._lock:
+            entry = self._stmt_caches.get(id(cnx), {}).pop(query, None)
+
+        if entry is not None:
+            try:
+                entry[0].close()
+            except mysql.connector.Error:
+                pass
+
+    def checkout(self):
+        """ Get an idle connection from the pool or create a new connection if none are available
+
+        Idle connections past self.idle_timeout are closed and not returned. An idle connection past
+        self.ping_interval is pinged first and closed instead of returned if the ping fails.
+
+        Returns:
+            mysql.connector.connection: open database connection
+
+        Raises:
+            mysql.connector.Error: if a new connection can't be created
+        """
+        expired = []
+        cnx = None
+        idle_since = None
+        with self._lock:
+            now = time.monotonic()
+            while len(self._idle) > 0:
+                idle_cnx, idle_cnx_since = self._idle.pop()
+                if now - idle_cnx_since > self.idle_timeout:
+                    expired.append(idle_cnx)
+                else:
+                    cnx, idle_since = idle_cnx, idle_cnx_since
+                    break
+            # connections on the left were checked in earlier than the one reused. close any that have expired
+            while len(self._idle) > 0 and now - self._idle[0][1] > self.idle_timeout:
+                expired.append(self._idle.popleft()[0])
+
+            self._stats["checkouts"] += 1
+            self._stats["closed_idle_timeout"] += len(expired)
+            if cnx is not None:
+                self._stats["reuses"] += 1
+            self._in_use += 1
+
+        for old_cnx in expired:
+            self._close_quietly(old_cnx)
+
+        if cnx is not None and time.monotonic() - idle_since > self.ping_interval:
+            try:
+                cnx.ping()
+                with self._lock:
+                    self._stats["pings"] += 1
+            except mysql.connector.Error:
+                self._close_quietly(cnx)
+                cnx = None
+                with self._lock:
+                    self._stats["pings"] += 1
+                    self._stats["closed_ping_failed"] += 1
+
+        if cnx is None:
+            try:
+                cnx = mysql.connector.connect(**self.connect_kwargs)
+            except mysql.connector.Error:
+                with self._lock:
+                    self._in_use -= 1
+                raise
+            with self._lock:
+                self._stats["creates"] += 1
+
+        return cnx
+
+    def checkin(self, cnx):
+        """ Return a connection to the pool
+
+        Any open transaction is rolled back so the next user of the connection doesn't see a stale snapshot or
+        uncommitted changes. The connection is closed instead of kept if the pool is full or the rollback fails.
+
+        Args:
+            cnx (mysql.connector.connection): connection from self.checkout()
+        """
+        keep = True
+        try:
+            if cnx.in_transaction:
+                cnx.rollback()
+        except mysql.connector.Error:
+            keep = False
+
+        with self._lock:
+            self._in_use -= 1
+            self._stats["checkins"] += 1
+            if keep and len(self._idle) < self.pool_size:
+                self._idle.append((cnx, time.monotonic()))
+                cnx = None
+            elif keep:
+                self._stats["closed_pool_full"] += 1
+            else:
+                self._stats["discards"] += 1
+
+        if cnx is not None:
+            self._close_quietly(cnx)
+
+    def discard(self, cnx):
+        """ Close a checked out connection that should not be reused (e.g. it was disconnected)
+
+        Args:
+            cnx (mysql.connector.connection): connection from self.checkout()
+        """
+        with self._lock:
+            self._in_use -= 1
+            self._stats["discards"] += 1
+
+        self._close_quietly(cnx)
+
+    def close_idle(self):
+        """ Close all idle connections in the pool """
+        with self._lock:
+            idle = [cnx for cnx, _ in self._idle]
+            self._idle.clear()
+
+        for cnx in idle:
+            self._close_quietly(cnx)
+
+    def stats(self):
+        """ Pool statistics
+
+        Returns:
+            dict: counts of checkouts, reuses (checkouts served by an idle connection), creates, checkins,
+                closed_idle_timeout, closed_pool_full, discards, pings, closed_ping_failed and prepared statement cache
+                stmt_hits, stmt_misses and stmt_evictions since the pool was created, plus current idle and in_use
+                connection counts, stmt_cached (prepared statements cached over all connections) and the pool_size,
+                idle_timeout, ping_interval and stmt_cache_size settings
+        """
+        with self._lock:
+            stats = self._stats.copy()
+            stats.update({"idle": len(self._idle), "in_use": self._in_use,
+                          "stmt_cached": sum([len(cache) for cache in self._stmt_caches.values()]),
+                          "pool_size": self.pool_size, "idle_timeout": self.idle_timeout,
+                          "ping_interval": self.ping_interval, "stmt_cache_size": self.stmt_cache_size})
+
+        return stats
+
+
+class UnitOfWork:
+    """ One transaction shared by every MySQLBase instance of a workflow on this thread
+
+    While a unit of work is active (with UnitOfWork(db):), MySQLBase instances created on the same thread for the same
+    pool (e.g. each "with MySQLAM() as mam:" in a model) use the connection of db instead of checking one out, so the
+    whole workflow is one transaction on one connection:
+        execute_commit() statements are queued instead of executed and committed. Consecutive statements with the
+            same SQL text are executed together with executemany (mysql.connector sends consecutive inserts as one
+            multi-row insert)
+        the queue is flushed (executed without commit) before any read, so reads see the queued writes
+        execute_bulk_commit() (and so bulk_insert(), bulk_update(), etc.) flushes the queue and executes its
+            statements without commit
+        on exit, the queue is flushed and committed once. If an exception is raised in the with block or by a
+        statement, the whole unit is rolled back and every rollback callback is called (see add_rollback_callback())
+
+    A unit of work started while another is active on the same thread joins the outer one. Streamed reads
+    (FetchCursor.ITER, FetchCursor.PD_DF_ITER) must be exhausted before the next statement of the unit.
+
+    Attributes:
+        db (MySQLBase): instance whose connection the unit uses. closed on exit
+        stats (dict): counts of statements queued, batches (executes of queued statements), flushes and commits
+    """
+    _local = threading.local()
+    _rollback_callbacks = []
+    _rollback_callbacks_lock = threading.Lock()
+
+    def __init__(self, db):
+        """ init UnitOfWork
+
+        Args:
+            db (MySQLBase): subclass instance (e.g. MySQLAM()). its connection is used for the unit and it is closed on
+                exit
+        """
+        self.db = db
+        self.stats = {"queued": 0, "batches": 0, "flushes": 0, "commits": 0}
+        # [SQL text, list of params] of consecutive statements with the same SQL text, in order
+        self._queue = []
+        self._outer = None
+
+    @classmethod
+    def current(cls):
+        """ Active unit of work of this thread
+
+        Returns:
+            Optional[UnitOfWork]: None if no unit of work is active
+        """
+        return getattr(cls._local, "unit", None)
+
+    @classmethod
+    def add_rollback_callback(cls, callback):
+        """ Call callback whenever a unit of work is not committed (rolled back or commit failed)
+
+        Process wide caches of rows read inside a unit of work use this to drop rows the rollback undid
+
+        Args:
+            callback (Callable[[], None]): called with no arguments on the thread of the unit, after its connection is
+                closed. exceptions are logged and ignored
+        """
+        with cls._rollback_callbacks_lock:
+            if callback not in cls._rollback_callbacks:
+                cls._rollback_callbacks.append(callback)
+
+    def __enter__(self):
+        """ Context manager __enter__. Start the unit (or join the active one)
+
+        Returns:
+            UnitOfWork: self, or the active unit of work if one was already started on this thread
+        """
+        self._outer = self.current()
+        if self._outer is not None:
+            self.db.db_close()
+            return self._outer
+
+        self.db._db_initialize()
+        self.db._unit = self
+        UnitOfWork._local.unit = self
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """ Context manager __exit__. Commit the unit, or roll it back if an exception was raised
+
+        Raises:
+            MySQLException: if flush or commit fails. the unit is rolled back
+        """
+        if self._outer is not None:
+            return
+
+        UnitOfWork._local.unit = None
+        committed = False
+        try:
+            if exc_type is None:
+                self.commit()
+                committed = True
+            else:
+                self._queue.clear()
+                if self.db._DB is not None:
+                    try:
+                        self.db._DB.rollback()
+                    except mysql.connector.Error:
+                        self.db.logger.exception("Unit of work rollback exception")
+        finally:
+            self.db._unit = None
+            self.db.db_close()
+            if not committed:
+                with UnitOfWork._rollback_callbacks_lock:
+                    callbacks = list(UnitOfWork._rollback_callbacks)
+                for callback in callbacks:
+                    try:
+                        callback()
+                    except Exception:
+                        self.db.logger.exception("Unit of work rollback callback exception")
+
+    def queue(self, query_list, params_list):
+        """ Queue statements to execute at the next flush. see MySQLBase.execute_commit()
+
+        Args:
+            query_list (list[str]): SQL text of each statement
+            params_list (list[Union[tuple, list, dict]]): parameters of each statement
+        """
+        for query, params in zip(query_list, params_list):
+            if len(self._queue) > 0 and self._queue[-1][0] == query and \
+                    isinstance(params, dict) == isinstance(self._queue[-1][1][0], dict):
+                self._queue[-1][1].append(params)
+            else:
+                self._queue.append([query, [params]])
+            self.stats["queued"] += 1
+
+    def flush(self):
+        """ Execute queued statements in order without commit
+
+        Raises:
+            MySQLException: execute error is logged, the unit is rolled back and the error is wrapped and raised
+        """
+        if len(self._queue) == 0:
+            return
+
+        queue = self._queue
+        self._queue = []
+        self.stats["flushes"] += 1
+
+        db = self.db
+        timings = []
+        try:
+            for query, params_list in queue:
+                start = time.perf_counter()
+                if len(params_list) == 1:
+                    db.cursor.execute(query, params_list[0])
+                else:
+                    db.cursor.executemany(query, params_list)
+                timings.append((query, params_list[0], time.perf_counter() - start, db.cursor.rowcount))
+                self.stats["batches"] += 1
+            db._last_used = time.monotonic()
+        except mysql.connector.Error as err1:
+            db.logger.exception("Unit of work flush exception: ")
+            db._handle_commit_error(err1)
+
+        if QueryStats.is_enabled():
+            for query, params, seconds, rows in timings:
+                db._record_query(query, params, seconds, rows=rows)
+
+    def commit(self):
+        """ Flush queued statements and commit the unit
+
+        Raises:
+            MySQLException: execute or commit error is logged, the unit is rolled back and the error is wrapped and
+                raised
+        """
+        self.flush()
+        try:
+            start = time.perf_counter()
+            self.db._DB.commit()
+            seconds = time.perf_counter() - start
+            self.stats["commits"] += 1
+        except mysql.connector.Error as err1:
+            self.db.logger.exception("Unit of work commit exception: ")
+            self.db._handle_commit_error(err1)
+
+        if QueryStats.is_enabled():
+            self.db._record_query("COMMIT", None, seconds)
 
 
 class MySQLBase(ABC):
     """Base class for MySQL database connections.
 
-    This class contains functionality common to all MySQL database interactions. Init creates a database connection and
-    creates a default cursor and a dictionary cursor. This class and subclasses can be instantiated as part of a
-    context manager (i.e. with).
+    This class contains functionality common to all MySQL database interactions. Init checks a database connection out
+    of the process wide ConnectionPool and creates a default cursor and a dictionary cursor. db_close() returns the
+    connection to the pool. This class and subclasses can be instantiated as part of a context manager (i.e. with).
+
+    Every statement executed is timed and recorded in QueryStats if QueryStats.is_enabled() (MYSQL_QUERY_STATS in .env).
+
+    FetchCursor.LIST_DICT and FetchCursor.LIST_LIST reads and execute_commit() statements (but not execute_many, which
+    mysql.connector already batches) with tuple or list parameters run as server side prepared statements cached per
+    connection by the pool. See ConnectionPool.prepared_cursor() and self._prepared_cursor().
+
+    Instances created while a UnitOfWork is active on the thread share its connection and transaction. See UnitOfWork.
+
+    If DB_BACKEND is "sqlite" in .env, connections come from SQLitePool instead and queries run against the local SQLite
+    database at SQLITE_PATH (default ":memory:"). See sqlitebackend.py. host, user, password and db_name are ignored.
 
     Attributes:
         host (str): database host url.
@@ -57,13 +595,19 @@ class MySQLBase(ABC):
         db_name (str): database name.
         _fetch_cursor (FetchCursor): how data loaded from tables is returned. no guarantee that subclasses will handle
             all enums of FetchCursor properly so this variable is "private" to indicate it shouldn't be set directly.
+        fetch_chunk_size (int): number of rows read from the database at a time for FetchCursor.ITER and
+            FetchCursor.PD_DF_ITER. Default 10000
+        bulk_chunk_size (int): max number of rows inserted by each statement in bulk_insert(). Default 1000
+        pipeline_statements (boolean): default of execute_commit() pipeline. MYSQL_PIPELINE_STATEMENTS in .env ("1" for
+            True). Default False
         logger (Logger.logger instance):.
+        pool (Union[ConnectionPool, SQLitePool]): pool that database connections are checked out of and returned to
         cursor (mysql.connector.CMySQLCursor): rows returned as list.
         dict_cursor (mysql.connector.CMySQLCursor): rows returned as dictionary.
     """
 
     def __init__(self, host, user, password, db_name, fetch_cursor, ssl_ca_path=None):
-        """Init MySQLBase. Create mysql database connection, cursor and dictionary cursor.
+        """Init MySQLBase. Check out mysql database connection from pool and create cursor and dictionary cursor.
 
         Args:
             host (str): database host url.
@@ -82,13 +626,27 @@ class MySQLBase(ABC):
         self.password = password
         self.db_name = db_name
         self._fetch_cursor = fetch_cursor
+        self.fetch_chunk_size = 10000
+        self.bulk_chunk_size = 1000
+        self.pipeline_statements = os.getenv("MYSQL_PIPELINE_STATEMENTS", "0") == "1"
         self.ssl_ca_path = ssl_ca_path
 
         self.logger = Logger(self.__class__.__name__).logger
+        if os.getenv("DB_BACKEND", "mysql").lower() == "sqlite":
+            self.pool = SQLitePool.get_pool(os.getenv("SQLITE_PATH", ":memory:"))
+        else:
+            self.pool = ConnectionPool.get_pool(host, user, password, db_name, ssl_ca_path=ssl_ca_path)
 
         self._DB = None
         self.cursor = None
         self.dict_cursor = None
+        # time.monotonic() of the last successful use of self._DB. see self._db_initialize()
+        self._last_used = 0.0
+        # UnitOfWork whose connection self._DB is. see UnitOfWork
+        self._unit = None
+        # (query, QueryWriter) of the last read query whose "in" list temporary tables were loaded on self._DB. see
+        # self.write_read_query() and self.execute_fetch()
+        self._in_list_read = None
 
         self._db_initialize()
 
@@ -101,14 +659,14 @@ class MySQLBase(ABC):
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
-        """ Context manager __exit__. Close database connection and log exception arguments if not None. """
+        """ Context manager __exit__. Return database connection to pool and log exception arguments if not None. """
         self.db_close()
 
         if exc_type is not None:
             self.logger.error("".join(traceback.format_exception(exc_type, exc_val, exc_tb)))
 
     def __del__(self):
-        """ Close database connection.
+        """ Return database connection to pool.
 
         Python does not guarantee that __del__ will be called on "destruction" of the object. User should always call
         db_close explicitly if not using the class instance in a context manager
@@ -116,18 +674,31 @@ class MySQLBase(ABC):
         self.db_close()
 
     def _db_initialize(self):
-        """ Create db connection and cursors if not already created and connected
+        """ Check out db connection from pool and create cursors if not already checked out and connected
+
+        The connection is assumed to be alive. It is only pinged if it has not been used for longer than
+        self.pool.ping_interval. Lost connections found while executing a query are handled in execute_fetch() and
+        execute_commit().
 
         Raises:
             MySQLException: mysql.connector.Error during database connect or cursor create is logged then raised as
                 MySQLException with is_logged=True
         """
+        if self._DB is not None and time.monotonic() - self._last_used > self.pool.ping_interval and \
+                not self._DB.is_connected():
+            self._db_reset()
+
         create_cursor = False
-        if self._DB is None or not self._DB.is_connected():
+        unit = UnitOfWork.current() if self._DB is None else None
+        if unit is not None and unit.db is not self and unit.db.pool is self.pool and unit.db._DB is not None:
+            self._DB = unit.db._DB
+            self._unit = unit
+            self._last_used = time.monotonic()
+            create_cursor = True
+        elif self._DB is None:
             try:
-                self._DB = mysql.connector.connect(host=self.host, user=self.user, passwd=self.password,
-                                                   database=self.db_name, ssl_ca=self.ssl_ca_path,
-                                                   ssl_verify_cert=(self.ssl_ca_path is not None))
+                self._DB = self.pool.checkout()
+                self._last_used = time.monotonic()
                 create_cursor = True
             except mysql.connector.Error as err:
                 self.logger.exception("DB Connect exception")
@@ -147,6 +718,40 @@ class MySQLBase(ABC):
                 self.logger.exception("Dict Cursor create exception")
                 raise MySQLException(str(err) + " See log for full trace.") from err
 
+    def _db_reset(self):
+        """ Discard the current db connection (e.g. it was lost) so self._db_initialize() checks out another one
+
+        Raises:
+            MySQLException: if the connection is the connection of a UnitOfWork. the unit can't continue on another
+                connection
+        """
+        if self._unit is not None:
+            raise MySQLException("Unit of work connection lost. Changes were not committed")
+        if self._DB is not None:
+            self.pool.discard(self._DB)
+        self._DB = None
+        self.cursor = None
+        self.dict_cursor = None
+
+    def _is_disconnect_error(self, err):
+        """ Check if err means the connection to the server is gone
+
+        Args:
+            err (mysql.connector.Error):
+
+        Returns:
+            boolean: True if err errno is in DISCONNECT_ERRNOS, or err is an operational or interface error and the
+                connection is no longer connected
+        """
+        if err.errno in DISCONNECT_ERRNOS:
+            return True
+        if isinstance(err, (mysql.connector.OperationalError, mysql.connector.InterfaceError)):
+            try:
+                return self._DB is None or not self._DB.is_connected()
+            except mysql.connector.Error:
+                return True
+        return False
+
     def build_alias_dict(self, fields, orig_upper: bool = False):
         """ Create dict mapping original fields (to uppercase) to aliases or original field
 
@@ -183,60 +788,335 @@ class MySQLBase(ABC):
         return alias_dict
 
     def db_close(self):
-        """Close cursor and dict_cursor and mysql database connection.
+        """Close cursor and dict_cursor and return mysql database connection to pool.
 
-        Close cursors then close database connection.
-        DB must be connected to close cursors. This usually isn't a problem, but calling this function from __del__
-        causes an exception.
+        Close cursors then return database connection to pool. Safe to call more than once.
+        The connection is not pinged. The pool rolls back any open transaction on checkin (a connection whose rollback
+        fails is closed) and pings connections idle past its ping_interval on checkout, and execute_fetch() reconnects
+        if a connection turns out to be lost.
 
         Raises:
-            MySQLException: cursor or database close error is logged then raised as MySQLException with
-                is_logged=True.
+            MySQLException: cursor close error is logged then raised as MySQLException with is_logged=True. The
+                connection is discarded instead of returned to the pool in this case.
         """
-        try:
-            if self._DB is not None and self._DB.is_connected():
-                if self.cursor is not None:
-                    self.cursor.close()
-                if self.dict_cursor is not None:
-                    self.dict_cursor.close()
+        if self._DB is None:
+            return
 
-                self._DB.close()
+        cnx = self._DB
+        self._DB = None
+        if self._unit is not None and self._unit.db is not self:
+            # connection belongs to the unit of work. only close this instance's cursors, which needs no round trip
+            self._unit = None
+            try:
+                for cursor in (self.cursor, self.dict_cursor):
+                    if cursor is not None:
+                        cursor.close()
+            finally:
+                self.cursor = None
+                self.dict_cursor = None
+            return
+        try:
+            for cursor in (self.cursor, self.dict_cursor):
+                if cursor is not None:
+                    cursor.close()
         except mysql.connector.Error as err:
+            self.pool.discard(cnx)
             self.logger.exception("DB and cursor close exception")
             raise MySQLException(str(err) + " See log for full trace.") from err
+        else:
+            self.pool.checkin(cnx)
+        finally:
+            self.cursor = None
+            self.dict_cursor = None
 
-    def execute_fetch(self, query, params=None, cursor=None):
+    def execute_fetch(self, query, params=None, cursor=None, chunk_size=None):
         """Execute read query and return query results
 
+        If the connection turns out to be lost when the query is executed, reconnect and execute the query once more.
+        If query is from self.write_read_query(), its "in" list temporary tables are loaded again on the new connection
+        first, since they only existed on the lost one. Rows already being streamed by FetchCursor.ITER or
+        FetchCursor.PD_DF_ITER are not retried.
+
         Args:
             query (str): SQL query.
             params (Optional[tuple, dict]): query parameters. Default None.
             cursor (Optional[boolean]): None to use self.dict_cursor. Any other value to use self.cursor. Default None.
+                For FetchCursor.ITER, None for dict rows and any other value for tuple rows.
+            chunk_size (Optional[int]): rows read at a time for FetchCursor.ITER, FetchCursor.PD_DF_ITER,
+                FetchCursor.COLUMNAR and FetchCursor.PD_DF_COLUMNAR. Default None to use self.fetch_chunk_size
 
         Returns:
-            Union[list[list], list[dict], pd.DataFrame]: Results of the query and fetch depending on self._fetch_cursor
+            Union[list[list], list[dict], pd.DataFrame, Iterator[dict], Iterator[pd.DataFrame], dict[str, np.ndarray]]:
+                Results of the query and fetch depending on self._fetch_cursor
 
         Raises:
             MySQLException: cursor execute mysql.connector.Error is logged then raised as MySQLException with
                 is_logged=True
         """
-        # check db connection and cursor creation and recreate if not connected or created
-        self._db_initialize()
+        for attempt in range(2):
+            # check db connection and cursor creation and recreate if not created or lost
+            self._db_initialize()
+            if self._unit is not None:
+                # reads see the writes queued by the unit of work
+                self._unit.flush()
+            if attempt > 0 and self._in_list_read is not None and self._in_list_read[0] == query:
+                self.load_in_list_tables(self._in_list_read[1])
+
+            try:
+                start = time.perf_counter()
+                df_or_list = self._execute_fetch(query, params, cursor, chunk_size)
+                self._last_used = time.monotonic()
+                break
+            except mysql.connector.Error as err:
+                if attempt == 0 and self._is_disconnect_error(err):
+                    self.logger.warning("Connection lost. Reconnecting and retrying read query. " + str(err))
+                    self._db_reset()
+                    continue
+                self.logger.exception("Execute fetch exception")
+                raise MySQLException(str(err) + " See log for full trace.") from err
+
+        if QueryStats.is_enabled():
+            # streamed rows are not read yet. time is to the first chunk and size is unknown
+            seconds = time.perf_counter() - start
+            rows, nbytes = QueryStats.result_size(df_or_list)
+            self._record_query(query, params, seconds, rows=rows, nbytes=nbytes,
+                               explain=self._fetch_cursor not in (FetchCursor.ITER, FetchCursor.PD_DF_ITER))
+
+        return df_or_list
+
+    def _record_query(self, query, params, seconds, rows=None, nbytes=None, explain=True):
+        """ Record a statement in QueryStats. Write it to the slow query log with its EXPLAIN output if it was slow
+
+        Args:
+            query (str): SQL statement
+            params: statement parameters
+            seconds (float): wall time
+            rows (Optional[int]): rows returned or affected. Default None for unknown
+            nbytes (Optional[int]): approximate bytes returned. Default None for unknown
+            explain (boolean): False if EXPLAIN can't be executed on the connection now (rows are still being
+                streamed). Default True
+        """
+        if QueryStats.record(query, seconds, rows=rows, nbytes=nbytes):
+            QueryStats.log_slow(query, params, seconds, rows,
+                                self._explain(query, params) if explain else "Not run while rows are streamed")
+
+    def _explain(self, query, params):
+        """ EXPLAIN a select, insert, replace, update or delete statement
+
+        Args:
+            query (str): SQL statement
+            params: statement parameters
+
+        Returns:
+            Union[list[dict], str]: EXPLAIN rows, or the reason there are none
+        """
+        if not query.lstrip()[:7].upper().startswith(PREPARABLE_STATEMENTS):
+            return "Not explainable"
 
         try:
-            if self._fetch_cursor == FetchCursor.PD_DF:
-                df_or_list = pd.read_sql(query, self._DB, params=params)
-            else:  # FetchCursor.LIST_DICT or FetchCursor.LIST_LIST
+            explain_cursor = self._DB.cursor(dictionary=True)
+            try:
+                explain_cursor.execute("EXPLAIN " + query, params)
+                return explain_cursor.fetchall()
+            finally:
+                explain_cursor.close()
+        except mysql.connector.Error as err:
+            return "EXPLAIN failed: " + str(err)
+
+    def _execute_fetch(self, query, params, cursor, chunk_size):
+        """ Execute read query on current connection. see self.execute_fetch()
+
+        Raises:
+            mysql.connector.Error: if execute or fetch fails
+        """
+        if self._fetch_cursor in (FetchCursor.ITER, FetchCursor.PD_DF_ITER):
+            as_df = self._fetch_cursor == FetchCursor.PD_DF_ITER
+            # a separate unbuffered cursor so rows are read from the server as the generator is consumed
+            iter_cursor = self._DB.cursor(dictionary=(cursor is None and not as_df), buffered=False)
+            iter_cursor.execute(query, params)
+            df_or_list = self._iter_fetch(iter_cursor, self.fetch_chunk_size if chunk_size is None else chunk_size,
+                                          as_df)
+        elif self._fetch_cursor in (FetchCursor.COLUMNAR, FetchCursor.PD_DF_COLUMNAR):
+            col_cursor = self._DB.cursor(buffered=False)
+            col_cursor.execute(query, params)
+            df_or_list = self._columnar_fetch(col_cursor, self.fetch_chunk_size if chunk_size is None else chunk_size)
+            if self._fetch_cursor == FetchCursor.PD_DF_COLUMNAR:
+                df_or_list = pd.DataFrame(df_or_list, copy=False)
+        elif self._fetch_cursor == FetchCursor.PD_DF:
+            df_or_list = pd.read_sql(query, self._DB, params=params)
+        else:  # FetchCursor.LIST_DICT or FetchCursor.LIST_LIST
+            prepared = self._prepared_cursor(query, params)
+            if prepared is None:
                 cursor = self.dict_cursor if cursor is None else self.cursor
                 cursor.execute(query, params)
                 df_or_list = cursor.fetchall()
+            else:
+                prep_cursor = self._execute_prepared(prepared, params)
+                df_or_list = prep_cursor.fetchall()
+                if cursor is None:
+                    df_or_list = [dict(zip(prep_cursor.column_names, row)) for row in df_or_list]
+
+        return df_or_list
+
+    def _prepared_cursor(self, query, params):
+        """ Get the cached prepared statement cursor of query if query should be executed as a prepared statement
+
+        Statements in PREPARABLE_STATEMENTS with a non-empty tuple or list of parameters are prepared if all parameters
+        are None or PREPARED_PARAM_TYPES and self.pool caches prepared statements. Statements with dict parameters or
+        %% (an escaped % only substituted client side) are not. See ConnectionPool.prepared_cursor()
+
+        Args:
+            query (str): SQL statement
+            params: statement parameters
+
+        Returns:
+            Optional[tuple[mysql.connector.cursor.MySQLCursorPrepared, str]]: (cursor, SQL text) from
+                self.pool.prepared_cursor(). None to execute query on a regular cursor
+        """
+        if self.pool.stmt_cache_size <= 0 or not isinstance(params, (tuple, list)) or len(params) == 0 or \
+                "%%" in query or not query.lstrip()[:7].upper().startswith(PREPARABLE_STATEMENTS):
+            return None
+        for param in params:
+            if param is not None and not isinstance(param, PREPARED_PARAM_TYPES):
+                return None
+
+        return self.pool.prepared_cursor(self._DB, query)
+
+    def _execute_prepared(self, prepared, params):
+        """ Execute a cached prepared statement. It is removed from the cache if execute fails
+
+        Args:
+            prepared (tuple[mysql.connector.cursor.MySQLCursorPrepared, str]): from self._prepared_cursor()
+            params (Union[tuple, list]): statement parameters
+
+        Returns:
+            mysql.connector.cursor.MySQLCursorPrepared: the executed cursor
+
+        Raises:
+            mysql.connector.Error: if execute fails
+        """
+        prep_cursor, query = prepared
+        try:
+            prep_cursor.execute(query, params)
+        except mysql.connector.Error:
+            self.pool.forget_prepared(self._DB, query)
+            raise
+
+        return prep_cursor
+
+    def _iter_fetch(self, iter_cursor, chunk_size, as_df):
+        """ Generator of rows or dataframe chunks from an executed unbuffered cursor
+
+        iter_cursor is closed when the generator is exhausted or closed. Unread rows are consumed first so the
+        connection can be used again.
+
+        Args:
+            iter_cursor (mysql.connector.cursor): unbuffered cursor that has executed a read query
+            chunk_size (int): rows read from the server at a time
+            as_df (boolean): True to yield a pd.DataFrame per chunk. False to yield each row
+
+        Yields:
+            Union[dict, tuple, pd.DataFrame]: row or dataframe chunk with iter_cursor column names as columns
+
+        Raises:
+            MySQLException: fetch mysql.connector.Error is logged then raised as MySQLException with is_logged=True
+        """
+        exhausted = False
+        try:
+            columns = iter_cursor.column_names
+            while True:
+                rows = iter_cursor.fetchmany(size=chunk_size)
+                if len(rows) == 0:
+                    exhausted = True
+                    break
+                if as_df:
+                    yield pd.DataFrame.from_records(rows, columns=columns)
+                else:
+                    yield from rows
         except mysql.connector.Error as err:
-            self.logger.exception("Execute fetch exception")
+            self.logger.exception("Execute fetch iterator exception")
             raise MySQLException(str(err) + " See log for full trace.") from err
+        finally:
+            try:
+                if not exhausted and self._DB is not None:
+                    self._DB.consume_results()
+                iter_cursor.close()
+            except mysql.connector.Error:
+                self.logger.exception("Execute fetch iterator close exception")
 
-        return df_or_list
+    # result set column types converted to float64, int64 and datetime64[us] by self._columnar_fetch()
+    _COLUMNAR_FLOAT_TYPES = {FieldType.DECIMAL, FieldType.NEWDECIMAL, FieldType.FLOAT, FieldType.DOUBLE}
+    _COLUMNAR_INT_TYPES = {FieldType.TINY, FieldType.SHORT, FieldType.LONG, FieldType.LONGLONG, FieldType.INT24,
+                           FieldType.YEAR}
+    _COLUMNAR_DATETIME_TYPES = {FieldType.DATE, FieldType.NEWDATE, FieldType.DATETIME, FieldType.TIMESTAMP}
+
+    def _columnar_fetch(self, col_cursor, chunk_size):
+        """ Read all rows from an executed unbuffered cursor into typed np.ndarray columns
+
+        Rows are read chunk_size at a time and each chunk is converted to one array per column, so only one chunk of
+        Python row tuples is held in memory at a time. See FetchCursor.COLUMNAR for the column types. col_cursor is
+        closed when done.
 
-    def execute_commit(self, query_list, params_list, execute_many: bool = False):
+        Args:
+            col_cursor (mysql.connector.cursor): unbuffered tuple cursor that has executed a read query
+            chunk_size (int): rows read from the server at a time
+
+        Returns:
+            dict[str, Union[np.ndarray, pd.Categorical]]: column name: column values, in result set column order
+
+        Raises:
+            mysql.connector.Error: if fetch fails
+        """
+        exhausted = False
+        try:
+            names = col_cursor.column_names
+            kinds = []
+            for desc in col_cursor.description:
+                if desc[1] in self._COLUMNAR_FLOAT_TYPES:
+                    kinds.append("float")
+                elif desc[1] in self._COLUMNAR_INT_TYPES:
+                    kinds.append("int")
+                elif desc[1] in self._COLUMNAR_DATETIME_TYPES:
+                    kinds.append("datetime")
+                elif desc[7] & FieldFlag.ENUM:
+                    kinds.append("enum")
+                else:
+                    kinds.append("object")
+
+            chunks = [[] for _ in kinds]
+            while True:
+                rows = col_cursor.fetchmany(size=chunk_size)
+                if len(rows) == 0:
+                    exhausted = True
+                    break
+                for i, values in enumerate(zip(*rows)):
+                    if kinds[i] == "int":
+                        # NaN needs float64
+                        chunks[i].append(np.array(values, dtype=np.float64 if None in values else np.int64))
+                    elif kinds[i] == "float":
+                        chunks[i].append(np.array(values, dtype=np.float64))
+                    elif kinds[i] == "datetime":
+                        chunks[i].append(np.array(values, dtype="datetime64[us]"))
+                    else:
+                        chunks[i].append(np.array(values, dtype=object))
+        finally:
+            try:
+                if not exhausted and self._DB is not None:
+                    self._DB.consume_results()
+                col_cursor.close()
+            except mysql.connector.Error:
+                self.logger.exception("Execute fetch columnar close exception")
+
+        empty_dtypes = {"float": np.float64, "int": np.int64, "datetime": "datetime64[us]"}
+        columns = {}
+        for name, kind, col_chunks in zip(names, kinds, chunks):
+            col = np.concatenate(col_chunks) if len(col_chunks) > 0 else \
+                np.array([], dtype=empty_dtypes.get(kind, object))
+            columns[name] = pd.Categorical(col) if kind == "enum" else col
+
+        return columns
+
+    def execute_commit(self, query_list, params_list, execute_many: bool = False, pipeline: Optional[bool] = None):
         """Execute one or more insert, update and/or delete then commit.
 
         Multi-purpose execute and commit function. Can be used to execute and commit the following cases:
@@ -250,11 +1130,18 @@ class MySQLBase(ABC):
             params_list (Union[tuple, dict, list[tuple], list[dict]]): query parameters.
             execute_many (boolean): True to execute the first query in query_list on every element of params_list.
                 False to execute the ith query in query_list on the ith element of params_list.
+            pipeline (Optional[boolean]): True to send the queries of case 3 to the server as one multi statement batch
+                and read their results in order, instead of one round trip per query. See self._execute_pipelined().
+                Default None for self.pipeline_statements
+
+        If a UnitOfWork is active, the statements are queued in it instead. See UnitOfWork.
 
         Raises:
             ValueError: execute_many is not True but lengths of query_list and params_list are not equal.
             MySQLException: execute or commit error is logged, a rollback is attempted and the mysql.connector.Error is
-                wrapped and returned.
+                wrapped and returned. If the connection was lost, no rollback is attempted (the server discards the
+                uncommitted transaction) and the connection is replaced on the next call. Statements are not retried
+                since they may not be safe to execute twice.
         """
         # check db connection and cursor creation and recreate if not connected or created
         self._db_initialize()
@@ -264,20 +1151,380 @@ class MySQLBase(ABC):
         if isinstance(params_list, (tuple, dict)):
             params_list = [params_list]
 
+        if self._unit is not None:
+            if execute_many:
+                self._unit.queue(query_list[:1] * len(params_list), params_list)
+            elif len(query_list) != len(params_list):
+                raise ValueError("Query List and Value List of Dictionaries have different lengths")
+            else:
+                self._unit.queue(query_list, params_list)
+            return
+
+        # (query, params, seconds, rows affected) of each statement for QueryStats
+        timings = []
         try:
             if execute_many:
+                start = time.perf_counter()
                 self.cursor.executemany(query_list[0], params_list)
+                timings.append((query_list[0], params_list[0] if len(params_list) > 0 else None,
+                                time.perf_counter() - start, self.cursor.rowcount))
             else:
                 if len(query_list) != len(params_list):
                     raise ValueError("Query List and Value List of Dictionaries have different lengths")
 
-                for i in range(len(query_list)):
-                    self.cursor.execute(query_list[i], params_list[i])
-
+                if pipeline is None:
+                    pipeline = self.pipeline_statements
+                if pipeline and len(query_list) > 1 and self._can_pipeline(query_list, params_list):
+                    timings += self._execute_pipelined(query_list, params_list)
+                else:
+                    for i in range(len(query_list)):
+                        start = time.perf_counter()
+                        prepared = self._prepared_cursor(query_list[i], params_list[i])
+                        if prepared is None:
+                            exec_cursor = self.cursor
+                            exec_cursor.execute(query_list[i], params_list[i])
+                        else:
+                            exec_cursor = self._execute_prepared(prepared, params_list[i])
+                        timings.append((query_list[i], params_list[i], time.perf_counter() - start,
+                                        exec_cursor.rowcount))
+
+            start = time.perf_counter()
             self._DB.commit()
+            timings.append(("COMMIT", None, time.perf_counter() - start, None))
+            self._last_used = time.monotonic()
         except mysql.connector.Error as err1:
             self.logger.exception("Execute commit exception: ")
-            self.db_rollback(err1)
+            self._handle_commit_error(err1)
+
+        if QueryStats.is_enabled():
+            for query, params, seconds, rows in timings:
+                self._record_query(query, params, seconds, rows=rows)
+
+    def _can_pipeline(self, query_list, params_list):
+        """ Check if queries can be sent as one multi statement batch. see self._execute_pipelined()
+
+        Args:
+            query_list (list[str]): queries
+            params_list (list[Union[tuple, list, dict]]): parameters of each query
+
+        Returns:
+            boolean: True if self.pool connections execute multi statement batches and all params are tuples or lists.
+                dict params can't be combined, and a % in a query without params would be taken for a placeholder
+                once the batch has params
+        """
+        if not self.pool.multi_statements:
+            return False
+        has_params = False
+        for params in params_list:
+            if not isinstance(params, (tuple, list)):
+                return False
+            has_params = has_params or len(params) > 0
+
+        return not has_params or all([len(params) > 0 or "%" not in query
+                                      for query, params in zip(query_list, params_list)])
+
+    def _execute_pipelined(self, query_list, params_list):
+        """ Execute queries as one multi statement batch and read the result of each statement in order
+
+        The batch is one round trip, sent with cursor.execute(multi=True), which yields the result of each statement in
+        order. The server executes statements in order and stops at the first error, which is raised when its result is
+        read. The failed statement is logged with its position in the batch. Nothing is committed, so the caller's
+        rollback undoes the statements before it, as it does without pipelining.
+
+        Args:
+            query_list (list[str]): queries. see self._can_pipeline()
+            params_list (list[Union[tuple, list]]): parameters of each query
+
+        Returns:
+            list[tuple[str, Union[tuple, list], float, int]]: (query, params, seconds, rows affected) of each statement.
+                seconds is the time from the previous result to this result
+
+        Raises:
+            mysql.connector.Error: if execute fails or a statement in the batch fails
+        """
+        batch = ";\n".join([query.strip().rstrip(";") for query in query_list]) + ";"
+        batch_params = tuple([p for params in params_list for p in params])
+
+        timings = []
+        start = time.perf_counter()
+        try:
+            # every result must be read before the connection can execute another statement
+            for result in self.cursor.execute(batch, batch_params if len(batch_params) > 0 else None, multi=True):
+                now = time.perf_counter()
+                i = len(timings)
+                if i < len(query_list):
+                    timings.append((query_list[i], params_list[i], now - start, result.rowcount))
+                start = now
+        except mysql.connector.Error:
+            i = min(len(timings), len(query_list) - 1)
+            self.logger.error("Pipelined statement " + str(i + 1) + "/" + str(len(query_list)) + " failed: " +
+                              query_list[i])
+            raise
+
+        return timings
+
+    def _handle_commit_error(self, err1):
+        """ Roll back after an execute or commit error, or replace the connection if it was lost
+
+        Args:
+            err1 (mysql.connector.Error): the execute or commit error
+
+        Raises:
+            MySQLException: always. see execute_commit()
+        """
+        if self._is_disconnect_error(err1):
+            self._db_reset()
+            raise MySQLException("Connection lost. Changes may not have been committed: " + format(err1)) from err1
+        self.db_rollback(err1)
+
+    def execute_bulk_commit(self, query_params_list):
+        """ Execute each query with its parameters in order then commit once
+
+        Intended for the multi-row insert queries from QueryWriter.write_bulk_insert_queries(). All queries are executed
+        in one transaction, so either all rows are committed or none are. The wall time of each execute is logged and
+        returned. If a UnitOfWork is active, its queued statements are executed first and nothing is committed until
+        the unit is.
+
+        Args:
+            query_params_list (list[tuple[str, Union[tuple, list, dict]]]): (query, params) for each query
+
+        Returns:
+            list[dict]: for each query, in order, a dict with keys "rows" (rows affected as reported by the cursor) and
+                "seconds" (execute wall time)
+
+        Raises:
+            MySQLException: see execute_commit()
+        """
+        # check db connection and cursor creation and recreate if not connected or created
+        self._db_initialize()
+        if self._unit is not None:
+            self._unit.flush()
+
+        timings = []
+        commit_seconds = None
+        try:
+            for query, params in query_params_list:
+                start = time.perf_counter()
+                self.cursor.execute(query, params)
+                timings.append({"rows": self.cursor.rowcount, "seconds": time.perf_counter() - start})
+
+            if self._unit is None:
+                start = time.perf_counter()
+                self._DB.commit()
+                commit_seconds = time.perf_counter() - start
+            self._last_used = time.monotonic()
+        except mysql.connector.Error as err1:
+            self.logger.exception("Execute bulk commit exception: ")
+            self._handle_commit_error(err1)
+
+        if QueryStats.is_enabled():
+            for (query, params), timing in zip(query_params_list, timings):
+                self._record_query(query, params, timing["seconds"], rows=timing["rows"])
+            if commit_seconds is not None:
+                self._record_query("COMMIT", None, commit_seconds)
+
+        for i, timing in enumerate(timings):
+            self.logger.info("Bulk chunk " + str(i + 1) + "/" + str(len(timings)) + ": " + str(timing["rows"]) +
+                             " rows affected in " + format(timing["seconds"], ".4f") + " seconds")
+
+        return timings
+
+    def bulk_insert(self, table, insert_list, fields=None, ignore=None, update_fields=None, chunk_size=None):
+        """ Insert rows with multi-row insert statements of up to chunk_size rows each, in one transaction
+
+        See QueryWriter.write_bulk_insert_queries() and self.execute_bulk_commit()
+
+        Args:
+            table (str): table to insert into
+            insert_list (Union[list[list], list[dict]]): rows to insert. lists must be in fields order. dicts must all
+                have the same keys
+            fields (Optional[list[str]]): table columns. Default None to use the keys of the first dict in insert_list
+            ignore (Optional[boolean]): True to use insert ignore statement. Default None for False to use insert
+            update_fields (Optional[list[str]]): fields updated by "ON DUPLICATE KEY UPDATE" statement. Default None
+                for no "ON DUPLICATE KEY UPDATE" statement
+            chunk_size (Optional[int]): max rows per statement. Default None to use self.bulk_chunk_size. Reduced if
+                needed to fit self.pool.max_params
+
+        Returns:
+            list[dict]: per chunk timing. see self.execute_bulk_commit(). empty list if insert_list is empty
+
+        Raises:
+            ValueError: if insert_list rows don't match fields, or ignore is True and update_fields is not None
+            MySQLException: if any required columns are missing or other database issue occurs
+        """
+        if len(insert_list) == 0:
+            return []
+
+        fields = list(insert_list[0].keys()) if fields is None else fields
+        chunk_size = self.bulk_chunk_size if chunk_size is None else chunk_size
+        if self.pool.max_params is not None:
+            chunk_size = max(1, min(chunk_size, self.pool.max_params // len(fields)))
+
+        qw = QueryWriter(table, fields=fields, fields_extra=update_fields)
+        query_params_list = qw.write_bulk_insert_queries(insert_list, chunk_size=chunk_size, ignore=ignore,
+                                                         on_duplicate_update=update_fields is not None)
+
+        return self.execute_bulk_commit(query_params_list)
+
+    def bulk_update(self, table, fields, set_params=(), keys=(), objects=(), key_field="id", chunk_size=None):
+        """ Update many rows, each with its own values, by key with one statement per up to chunk_size rows
+
+        All statements are executed in one transaction. See QueryWriter.write_bulk_update_queries() and
+        self.execute_bulk_commit()
+
+        Args:
+            table (str): table to update
+            fields (list[str]): fields to set
+            set_params (list[list]): set values of each row in fields order. Ignored if objects is not empty. Default ()
+            keys (list): key of each row, in set_params order. Ignored if objects is not empty. Default ()
+            objects (list[object]): Default (). If not empty, set_params and keys come from each object's instance
+                variables named in fields and key_field
+            key_field (str): field that identifies rows, usually the primary key. Default "id"
+            chunk_size (Optional[int]): max rows per statement. Default None to use self.bulk_chunk_size. Reduced if
+                needed to fit self.pool.max_params
+
+        Returns:
+            list[dict]: per chunk timing. see self.execute_bulk_commit(). empty list if there are no rows
+
+        Raises:
+            Union[AttributeError, ValueError]: if sql query and parameters can't be properly compiled
+            MySQLException: if update issue occurs
+        """
+        chunk_size = self.bulk_chunk_size if chunk_size is None else chunk_size
+        if self.pool.max_params is not None:
+            chunk_size = max(1, min(chunk_size, self.pool.max_params // (2 * len(fields) + 1)))
+
+        qw = QueryWriter(table, fields=fields)
+        query_params_list = qw.write_bulk_update_queries(set_params=set_params, keys=keys, objects=objects,
+                                                         key_field=key_field, chunk_size=chunk_size)
+        if len(query_params_list) == 0:
+            return []
+
+        return self.execute_bulk_commit(query_params_list)
+
+    @staticmethod
+    def _infile_value(value):
+        """ Format value as a field of a LOAD DATA tab separated file
+
+        Args:
+            value: None, float NaN, Enum, bool or anything with a suitable str()
+
+        Returns:
+            str: \\N for None and NaN. Enum .value and bool as int. Backslash, tab and newline escaped
+        """
+        if value is None or (isinstance(value, float) and math.isnan(value)):
+            return "\\N"
+        if isinstance(value, Enum):
+            value = value.value
+        if isinstance(value, bool):
+            value = int(value)
+
+        return str(value).replace("\\", "\\\\").replace("\t", "\\t").replace("\n", "\\n")
+
+    def load_data_local_infile(self, table, insert_list, fields=None, ignore=None, update_fields=None):
+        """ Insert rows with LOAD DATA LOCAL INFILE from a temporary file, in one transaction
+
+        Fastest path for very large inserts (e.g. hourly or price data). The MySQL server must have local_infile
+        enabled. Rows are written to a tab separated file in the system temp directory, which is the only directory the
+        connection allows local infile from. If update_fields is not None, rows are loaded into a temporary copy of
+        table and then inserted with "INSERT ... SELECT ... ON DUPLICATE KEY UPDATE", since LOAD DATA can't update.
+
+        Args:
+            table (str): table to insert into
+            insert_list (Union[list[list], list[dict]]): rows to insert. lists must be in fields order. dicts must all
+                have the same keys
+            fields (Optional[list[str]]): table columns. Default None to use the keys of the first dict in insert_list
+            ignore (Optional[boolean]): True to skip rows that duplicate an existing unique key. Default None for False
+            update_fields (Optional[list[str]]): fields updated for rows that duplicate an existing unique key. Default
+                None for no update
+
+        Returns:
+            list[dict]: per statement timing. see self.execute_bulk_commit(). empty list if insert_list is empty
+
+        Raises:
+            ValueError: if ignore is True and update_fields is not None
+            MySQLException: if local infile is not enabled or other database issue occurs
+        """
+        if len(insert_list) == 0:
+            return []
+        if ignore and update_fields is not None:
+            raise ValueError("ignore and update_fields can't both be set")
+
+        fields = list(insert_list[0].keys()) if fields is None else fields
+        field_str = "(" + ", ".join(fields) + ")"
+        load_table = table if update_fields is None else "tmp_load_" + table
+
+        query_params_list = []
+        if update_fields is not None:
+            query_params_list.append(("CREATE TEMPORARY TABLE " + load_table + " LIKE " + table + ";", ()))
+
+        with tempfile.NamedTemporaryFile(mode="w", suffix=".tsv", delete=False, newline="", encoding="utf-8") as f:
+            for row in insert_list:
+                values = [row[fld] for fld in fields] if isinstance(row, dict) else row
+                f.write("\t".join([self._infile_value(v) for v in values]) + "\n")
+        try:
+            query_params_list.append(
+                ("LOAD DATA LOCAL INFILE %s " + ("IGNORE " if ignore else "") + "INTO TABLE " + load_table +
+                 " CHARACTER SET utf8mb4 FIELDS TERMINATED BY '\\t' LINES TERMINATED BY '\\n' " + field_str + ";",
+                 (f.name,)))
+            if update_fields is not None:
+                query_params_list.append(
+                    ("INSERT INTO " + table + " " + field_str + " SELECT " + ", ".join(fields) + " FROM " + load_table +
+                     " ON DUPLICATE KEY UPDATE " + ", ".join([u + "=VALUES(" + u + ")" for u in update_fields]) + ";",
+                     ()))
+            timings = self.execute_bulk_commit(query_params_list)
+        finally:
+            os.remove(f.name)
+            if update_fields is not None and self._DB is not None:
+                try:
+                    self.cursor.execute("DROP TEMPORARY TABLE IF EXISTS " + load_table + ";")
+                except mysql.connector.Error:
+                    self.logger.exception("Drop temporary load table exception")
+
+        return timings
+
+    def write_read_query(self, qw):
+        """ qw.write_read_query() with the long "in" lists of qw loaded into temporary tables on this connection
+
+        See QueryWriter.where_clause() and self.load_in_list_tables()
+
+        Args:
+            qw (QueryWriter): read query writer
+
+        Returns:
+            tuple[str, tuple]: (query, params)
+
+        Raises:
+            MySQLException: if a temporary table can't be loaded
+        """
+        query, params = qw.write_read_query()
+        self.load_in_list_tables(qw)
+        # remembered so execute_fetch() can load the tables again if it reconnects
+        self._in_list_read = (query, qw) if len(qw.in_list_tables) > 0 else None
+
+        return query, params
+
+    def load_in_list_tables(self, qw):
+        """ Load qw.in_list_tables into session temporary tables, in one transaction
+
+        Call after the where clause of qw is written (e.g. qw.where_clause()) and before the query is executed. The
+        tables exist only on this connection, so the query must be executed by this instance.
+
+        Args:
+            qw (QueryWriter): query writer whose where clause was written
+
+        Raises:
+            MySQLException: if a temporary table can't be loaded
+        """
+        if len(qw.in_list_tables) == 0:
+            return
+
+        chunk_size = self.bulk_chunk_size
+        if self.pool.max_params is not None:
+            chunk_size = max(1, min(chunk_size, self.pool.max_params))
+
+        # MySQLBase.execute_bulk_commit, since only temporary tables are written
+        MySQLBase.execute_bulk_commit(self, qw.write_in_list_table_queries(chunk_size=chunk_size))
 
     def db_commit(self):
         """ Convenience function for self._DB.commit() """
@@ -317,10 +1564,7 @@ class MySQLBase(ABC):
 
         di_list = [b.to_insert_dict() for b in di_list]
 
-        qw = QueryWriter(table, fields=list(di_list[0].keys()))
-        query, di_list = qw.write_insert_query(di_list, ignore=ignore)
-
-        self.execute_commit(query, params_list=di_list, execute_many=True)
+        self.bulk_insert(table, di_list, ignore=ignore)
 
     @property
     def fetch_cursor(self):
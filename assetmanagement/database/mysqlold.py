@@ -2,9 +2,17 @@
 Temporary module for these classes
 """
 from enum import Enum
+from typing import Optional
+import copy
+import itertools
+import re
+import threading
+
+import pandas as pd
 
 from .dbdict import DBDict
 from .mysqlam import MySQLAM
+from .mysqlbase import FetchCursor
 
 
 class ETFDataTypes(Enum):
@@ -28,6 +36,115 @@ class ETFDataTypes(Enum):
 # Use id for Update where clause wherever possible. The front end will be programmed with this assumption for simplicity
 ########################################################################################################################
 class MySQLOld(MySQLAM):
+    """ Legacy securities database functions
+
+    data_types, data_subtypes, data_freq, price_freq and data_subtype_freq rarely change, so they are read once into a
+    process wide catalog (see catalog()) that read_data_types(), read_data_subtypes(), read_data_freq(),
+    read_data_subtype_freq(), read_price_frequency() and the dynamic table name resolution of get_sei_table_volume()
+    filter in memory instead of querying. The catalog is reloaded on the next use after any execute_commit() or
+    execute_bulk_commit() that writes to one of these tables, or after catalog_invalidate()
+
+    Inherits:
+        MySQLAM
+    """
+    # table: list of row dicts. None until loaded
+    _catalog = None
+    _catalog_lock = threading.Lock()
+    _catalog_write_re = re.compile(
+        r"\b(?:INTO|UPDATE|FROM|TABLE)\s+`?(data_types|data_subtypes|data_freq|price_freq|data_subtype_freq)\b",
+        re.IGNORECASE)
+    _catalog_queries = {
+        "data_types": "SELECT name, db_table_meta, db_data_table_midfix, id FROM data_types ORDER BY name",
+        "data_subtypes": "SELECT name, type_id, db_table_meta, db_data_table_prefix, id FROM data_subtypes "
+                         "ORDER BY name",
+        "data_freq": "SELECT freq, format_str, id FROM data_freq ORDER BY freq",
+        "price_freq": "SELECT freq FROM price_freq",
+        "data_subtype_freq": "SELECT ds.id as subtype_id, ds.name, df.id as freq_id, df.freq, df.format_str "
+                             "FROM data_subtype_freq AS dsf "
+                             "INNER JOIN data_subtypes AS ds ON ds.id = dsf.subtype_id "
+                             "INNER JOIN data_freq AS df ON df.id = dsf.freq_id"}
+
+    def catalog(self, refresh=False):
+        """ Process wide catalog of the data_types, data_subtypes, data_freq, price_freq and data_subtype_freq tables
+
+        Loaded with one query per table the first time it is used (or after catalog_invalidate())
+
+        Args:
+            refresh (boolean): True to reload the catalog from the database. Default False
+
+        Returns:
+            dict[str, list[dict]]: table: rows, as read by the table's read function without where clause.
+                data_subtype_freq rows are joined with data_subtypes and data_freq. Treat as read only
+        """
+        with self._catalog_lock:
+            if MySQLOld._catalog is not None and not refresh:
+                return MySQLOld._catalog
+
+        fetch_cursor = self.fetch_cursor
+        self.fetch_cursor = FetchCursor.LIST_DICT
+        try:
+            catalog = {table: self.execute_fetch(query) for table, query in self._catalog_queries.items()}
+        finally:
+            self.fetch_cursor = fetch_cursor
+
+        with self._catalog_lock:
+            MySQLOld._catalog = catalog
+
+        return catalog
+
+    @classmethod
+    def catalog_invalidate(cls):
+        """ Have the catalog reloaded from the database on its next use. see catalog() """
+        with cls._catalog_lock:
+            cls._catalog = None
+
+    def _catalog_rows(self, table, order_by=None, **filters):
+        """ Copies of the catalog rows of table that match filters
+
+        Matches and order follow the case insensitive collation of the tables
+
+        Args:
+            table (str): catalog table. see catalog()
+            order_by (Optional[str]): column to sort by. Default None for catalog order
+            **filters: column=value. None values are ignored
+
+        Returns:
+            list[dict]: row dict copies
+        """
+        def fold(value):
+            return value.casefold() if isinstance(value, str) else value
+
+        rows = [row for row in self.catalog()[table]
+                if all([fold(row[col]) == fold(val) for col, val in filters.items() if val is not None])]
+        if order_by is not None:
+            rows = sorted(rows, key=lambda row: fold(row[order_by]))
+
+        return copy.deepcopy(rows)
+
+    def execute_commit(self, query_list, params_list, execute_many: bool = False, pipeline: Optional[bool] = None):
+        """ See MySQLAM.execute_commit(). Also invalidates the catalog if a catalog table is written """
+        try:
+            return super().execute_commit(query_list, params_list, execute_many=execute_many, pipeline=pipeline)
+        finally:
+            self._catalog_invalidate_written(query_list)
+
+    def execute_bulk_commit(self, query_params_list):
+        """ See MySQLAM.execute_bulk_commit(). Also invalidates the catalog if a catalog table is written """
+        try:
+            return super().execute_bulk_commit(query_params_list)
+        finally:
+            self._catalog_invalidate_written([query for query, _ in query_params_list])
+
+    def _catalog_invalidate_written(self, query_list):
+        """ Invalidate the catalog if a query in query_list writes to a catalog table
+
+        Args:
+            query_list (Union[str, list[str]]): insert, update and/or delete queries
+        """
+        for query in ([query_list] if isinstance(query_list, str) else query_list):
+            if self._catalog_write_re.search(query):
+                self.catalog_invalidate()
+                return
 
     @staticmethod
     def set_where_stmt(key, value, op):
@@ -100,66 +217,41 @@ class MySQLOld(MySQLAM):
         return self.execute_commit("UPDATE data_source SET name = %(name)s, notes = %(notes)s WHERE id = %(id)s",
                                    data_source_db_dict.value_dict)
 
+    # data_types, data_subtypes, data_freq and data_subtype_freq reads are filtered from the catalog
     def read_data_types(self, data_types_db_dict=None):
         if data_types_db_dict is None:
-            data_types_db_dict = MySQLAM.data_types_db_dict()
-
-        query = "SELECT name, db_table_meta, db_data_table_midfix, id FROM data_types"
-
-        if data_types_db_dict.value_dict["name"] is not None:
-            query += " WHERE name = %(name)s"
-
-        query += " ORDER BY name"
+            data_types_db_dict = self.data_types_db_dict()
 
-        return self.execute_fetch(query, data_types_db_dict.value_dict)
+        return self._catalog_rows("data_types", order_by="name", name=data_types_db_dict.value_dict["name"])
 
     def read_data_subtype_id(self, subtype_name):
-        return self.execute_fetch("SELECT id FROM data_subtypes WHERE name = '" + subtype_name + "'")[0]['id']
+        return self._catalog_rows("data_subtypes", name=subtype_name)[0]["id"]
 
     def read_data_subtypes(self, data_subtypes_db_dict=None):
         if data_subtypes_db_dict is None:
-            data_subtypes_db_dict = MySQLAM.data_subtypes_db_dict()
-
-        query = "SELECT name, type_id, db_table_meta, db_data_table_prefix, id FROM data_subtypes WHERE 1=1"
-
-        if data_subtypes_db_dict.value_dict["type_id"] is not None:
-            query += " AND type_id = %(type_id)s"
-        if data_subtypes_db_dict.value_dict["id"] is not None:
-            query += " AND id = %(id)s"
-        if data_subtypes_db_dict.value_dict["name"] is not None:
-            query += " AND name = %(name)s"
-
-        query += " ORDER BY name"
+            data_subtypes_db_dict = self.data_subtypes_db_dict()
 
-        return self.execute_fetch(query, data_subtypes_db_dict.value_dict)
+        return self._catalog_rows("data_subtypes", order_by="name", type_id=data_subtypes_db_dict.value_dict["type_id"],
+                                  id=data_subtypes_db_dict.value_dict["id"],
+                                  name=data_subtypes_db_dict.value_dict["name"])
 
     def read_data_freq(self, data_freq_db_dict=None):
         if data_freq_db_dict is None:
-            data_freq_db_dict = MySQLAM.data_freq_db_dict()
+            data_freq_db_dict = self.data_freq_db_dict()
 
-        query = "SELECT freq, format_str, id FROM data_freq"
-
-        if data_freq_db_dict.value_dict["id"] is not None:
-            query += " WHERE id = %(id)s"
-
-        query += " ORDER BY freq"
-
-        return self.execute_fetch(query, data_freq_db_dict.value_dict)
+        return self._catalog_rows("data_freq", order_by="freq", id=data_freq_db_dict.value_dict["id"])
 
     def read_data_subtype_freq(self, data_subtype_freq_db_dict=None):
-        query = "SELECT ds.id as subtype_id, ds.name, df.id as freq_id, df.freq, df.format_str " \
-                "FROM data_subtype_freq AS dsf " \
-                "INNER JOIN data_subtypes AS ds ON ds.id = dsf.subtype_id " \
-                "INNER JOIN data_freq AS df ON df.id = dsf.freq_id"
-
         if data_subtype_freq_db_dict is None:
-            data_subtype_freq_db_dict = MySQLAM.data_subtype_freq_db_dict()
+            return self._catalog_rows("data_subtype_freq")
         elif data_subtype_freq_db_dict.value_dict["subtype_id"] is not None:
-            query += " WHERE dsf.subtype_id = %(subtype_id)s ORDER BY df.freq"
+            return self._catalog_rows("data_subtype_freq", order_by="freq",
+                                      subtype_id=data_subtype_freq_db_dict.value_dict["subtype_id"])
         elif data_subtype_freq_db_dict.value_dict["freq_id"] is not None:
-            query += " WHERE dsf.freq_id = %(freq_id)s ORDER BY ds.name"
+            return self._catalog_rows("data_subtype_freq", order_by="name",
+                                      freq_id=data_subtype_freq_db_dict.value_dict["freq_id"])
 
-        return self.execute_fetch(query, data_subtype_freq_db_dict.value_dict)
+        return self._catalog_rows("data_subtype_freq")
 
     def read_data_subtype_meta_table(self, data_meta_table_db_dict):
         meta_table = None if data_meta_table_db_dict is None else data_meta_table_db_dict.value_dict["meta_table"]
@@ -220,14 +312,22 @@ class MySQLOld(MySQLAM):
 
         return next(iter(res_dict_list[0].values()))
 
-    def read_data_data_table(self, data_data_table_db_dict):
+    # as_series True to read with FetchCursor.COLUMNAR and return a typed pd.Series of column indexed by date_time
+    def read_data_data_table(self, data_data_table_db_dict, as_series=None):
         id_column, table, column = self.data_data_table_db_dict_query_data(data_data_table_db_dict)
+        query = "SELECT date_time, " + column + " FROM " + table + " WHERE " + id_column + " = %(data_id)s " \
+                "AND date_time >= %(begin_date)s AND date_time <= %(end_date)s"
 
-        res_dict_list = self.execute_fetch("SELECT date_time, " + column + " FROM " + table +
-                                           " WHERE " + id_column + " = %(data_id)s"
-                                                                   " AND date_time >= %(begin_date)s AND date_time <= %(end_date)s",
-                                           data_data_table_db_dict.value_dict)
-        return res_dict_list
+        if not as_series:
+            return self.execute_fetch(query, data_data_table_db_dict.value_dict)
+
+        fetch_cursor = self.fetch_cursor
+        self.fetch_cursor = FetchCursor.COLUMNAR
+        try:
+            col_dict = self.execute_fetch(query, data_data_table_db_dict.value_dict)
+        finally:
+            self.fetch_cursor = fetch_cursor
+        return pd.Series(col_dict[column], index=pd.DatetimeIndex(col_dict["date_time"]))
 
     ####################################################################################################################
     # Security
@@ -242,9 +342,9 @@ class MySQLOld(MySQLAM):
         return DBDict(key_list=["securities_type", "securities_id"], data_list=data_list, reject_lol=reject_lol)
 
     def read_security_subtypes(self):
-        query = "SELECT ds.name, ds.db_table_meta, ds.db_data_table_prefix, ds.id FROM data_subtypes as ds " \
-                "INNER JOIN data_types as dt on dt.id = ds.type_id WHERE dt.name = 'Security' ORDER BY ds.name"
-        return self.execute_fetch(query)
+        type_ids = [row["id"] for row in self._catalog_rows("data_types", name="Security")]
+        return [{k: row[k] for k in ["name", "db_table_meta", "db_data_table_prefix", "id"]}
+                for row in self._catalog_rows("data_subtypes", order_by="name") if row["type_id"] in type_ids]
 
     def read_security_components(self, db_dict):
         return self.execute_fetch("SELECT sec_sec.sec_under_id AS securities_id, securities.ticker FROM securities "
@@ -644,8 +744,8 @@ class MySQLOld(MySQLAM):
         return True
 
     def get_sei_table_volume(self, sec_type, freq, isUpdate=False):
-        midfix = self.read_data_types(MySQLAM.data_types_db_dict([None, "Security"]))[0]["db_data_table_midfix"]
-        prefix = self.read_data_subtypes(self.data_subtypes_db_dict([None, sec_type]))[0]["db_data_table_prefix"]
+        midfix = self._catalog_rows("data_types", name="Security")[0]["db_data_table_midfix"]
+        prefix = self._catalog_rows("data_subtypes", name=sec_type)[0]["db_data_table_prefix"]
 
         if sec_type == "Stocks":
             volume = ", volume = %(volume)s" if isUpdate else ", volume "
@@ -659,7 +759,7 @@ class MySQLOld(MySQLAM):
         return prefix + "_" + midfix + "_" + freq, volume
 
     def read_price_frequency(self):
-        return self.execute_fetch("SELECT freq FROM price_freq")
+        return self._catalog_rows("price_freq")
 
     def read_sei_price(self, price_db_dict):
         begin_time = price_db_dict.value_dict["begin_time"]
@@ -682,6 +782,9 @@ class MySQLOld(MySQLAM):
         data_keys = ["date_time", "open", "high", "low", "close", "adj_close"]
         if security_type not in ["Indices"]:
             data_keys.append("volume")
+        if self.fetch_cursor == FetchCursor.ITER:
+            # rows are streamed. data_keys is still the first element
+            return itertools.chain([data_keys], dict_list)
         dict_list.insert(0, data_keys)
         return dict_list
 
@@ -722,13 +825,11 @@ class MySQLOld(MySQLAM):
     # TODO check time intervals are appropriate. 1D and higher have database date types. Under 1D have datetime types
     def insert_or_update_sei_price(self, dict_list, freq, securities_type, securities_id):
         table, volume = self.get_sei_table_volume(securities_type, freq)
-        vol_key = ")" if volume == " " else ", %(volume)s)"
+        fields = ["date_time", "open", "high", "low", "close", "adj_close"] + ([] if volume == " " else ["volume"])
 
-        return self.execute_commit(
-            "INSERT INTO " + table + " (securities_id, date_time, open, high, low, close, adj_close" + volume +
-            ") VALUES (" + str(securities_id) + ", %(date_time)s, %(open)s, %(high)s, %(low)s, %(close)s, %(adj_close)s"
-            + vol_key + " ON DUPLICATE KEY UPDATE open = %(open)s, high = %(high)s, low = %(low)s, close = %(close)s, "
-                        "adj_close = %(adj_close)s", dict_list, execute_many=True)
+        return self.bulk_insert(
+            table, [[securities_id] + [d[f] for f in fields] for d in dict_list], fields=["securities_id"] + fields,
+            update_fields=["open", "high", "low", "close", "adj_close"])
 
     def insert_sei_price(self, db_dict):
         freq = db_dict.value_dict["freq"]
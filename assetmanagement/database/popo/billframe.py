@@ -0,0 +1,115 @@
+from operator import attrgetter
+import threading
+
+import pandas as pd
+
+
+class BillFrame:
+    """ Columnar builder that converts a list of bills to a dataframe in one pass
+
+    The result has the same columns, in the same order, as concatenating bill.to_pd_df() for each bill. Instead of
+    building one dataframe per bill (and one per foreign key object of each bill), the columns of each bill class are
+    computed once and cached, foreign key objects (real estate, service provider, ...) are converted once per distinct
+    object into a small lookup table and every bill becomes a single row that is joined with its lookup rows.
+
+    Bill classes describe how to_pd_df() joins their foreign key objects with
+    SimpleServiceBillDataBase.frame_fk_columns() and how it renames their own columns with
+    SimpleServiceBillDataBase.frame_renames()
+    """
+    _layouts = {}
+    _layouts_lock = threading.Lock()
+
+    @classmethod
+    def from_bills(cls, bill_list, deprivatize=True, **kwargs):
+        """ Convert bill_list to a dataframe
+
+        Args:
+            bill_list (list[SimpleServiceBillDataBase]): subclass instances. Must not be empty
+            deprivatize (Optional[boolean]): see SimpleServiceBillDataBase.to_pd_df(). Default True
+            **kwargs: see SimpleServiceBillDataBase.to_pd_df(kwargs) (and subclasses)
+
+        Returns:
+            pd.DataFrame: bill_list data in the order of bill_list, with a default index
+        """
+        lookups = {}
+        rows = []
+        columns = None
+        for bill in bill_list:
+            layout = cls._layout(bill, deprivatize, **kwargs)
+            if columns is not None and layout["columns"] is not columns:
+                # bills of mixed classes. fall back to to_pd_df(), which aligns differing columns by name
+                return pd.concat([bill.to_pd_df(deprivatize=deprivatize, **kwargs) for bill in bill_list],
+                                 ignore_index=True)
+            columns = layout["columns"]
+
+            row = []
+            for attr, _ in layout["fks_before"]:
+                row.extend(cls._lookup_row(lookups, getattr(bill, attr)))
+            row.extend(layout["getter"](bill))
+            for attr, _ in layout["fks_after"]:
+                row.extend(cls._lookup_row(lookups, getattr(bill, attr)))
+            if len(row) != len(columns):
+                return pd.concat([bill.to_pd_df(deprivatize=deprivatize, **kwargs) for bill in bill_list],
+                                 ignore_index=True)
+            rows.append(row)
+
+        # columns holding None keep object dtype like the concatenated one row dataframes do, others are inferred
+        data = {}
+        for i, values in enumerate(zip(*rows)):
+            data[i] = pd.Series(values, dtype=object) if None in values else pd.Series(values)
+        df = pd.DataFrame(data)
+        df.columns = columns
+        return df
+
+    @classmethod
+    def _layout(cls, bill, deprivatize, **kwargs):
+        """ Get the cached column layout of bill's class, computing it from bill if it has not been computed yet
+
+        Args:
+            bill (SimpleServiceBillDataBase): subclass instance
+            deprivatize (boolean): see from_bills()
+            **kwargs: see from_bills()
+
+        Returns:
+            dict: with keys:
+                fks_before (list[tuple[str, dict]]): see SimpleServiceBillDataBase.frame_fk_columns()
+                fks_after (list[tuple[str, dict]]): see SimpleServiceBillDataBase.frame_fk_columns()
+                getter (operator.attrgetter): returns the tuple of bill instance attributes that are columns, in column
+                    order
+                columns (list[str]): all column names
+        """
+        key = (type(bill), bool(deprivatize), tuple(sorted(kwargs.items())))
+        layout = cls._layouts.get(key)
+        if layout is None:
+            fks_before, fks_after = bill.frame_fk_columns(**kwargs)
+            fk_attrs = {attr for attr, _ in fks_before + fks_after}
+            keys = tuple(k for k in bill.attr_names() if k not in fk_attrs)
+            renames = bill.frame_renames() if deprivatize else {}
+            columns = []
+            for attr, fk_renames in fks_before:
+                columns.extend(fk_renames.get(col, col) for col in getattr(bill, attr).to_pd_df().columns)
+            columns.extend(renames.get(k, k) for k in keys)
+            for attr, fk_renames in fks_after:
+                columns.extend(fk_renames.get(col, col) for col in getattr(bill, attr).to_pd_df().columns)
+            layout = {"fks_before": fks_before, "fks_after": fks_after, "getter": attrgetter(*keys), "columns": columns}
+            with cls._layouts_lock:
+                layout = cls._layouts.setdefault(key, layout)
+
+        return layout
+
+    @staticmethod
+    def _lookup_row(lookups, obj):
+        """ Get the column values of a foreign key object from lookups, converting it with to_pd_df() if not present
+
+        Args:
+            lookups (dict): of id(obj) to list of column values. updated by this function
+            obj (DataFrameable): foreign key object of a bill
+
+        Returns:
+            list: obj column values
+        """
+        row = lookups.get(id(obj))
+        if row is None:
+            row = obj.to_pd_df().iloc[0].tolist()
+            lookups[id(obj)] = row
+        return row
@@ -1,9 +1,17 @@
 from abc import ABC, abstractmethod
 from decimal import Decimal
+import itertools
+import keyword
+import threading
 
 
 class ClassConstructors(ABC):
     """ Classes that implement this class will provide class methods for instance construction """
+    __slots__ = ()
+    # (class, db dict keys) to compiled constructor. see _db_constructor()
+    _db_constructors = {}
+    _db_constructors_lock = threading.Lock()
+
     @abstractmethod
     def __init__(self):
         pass
@@ -45,7 +53,8 @@ class ClassConstructors(ABC):
     def db_dict_constructor(cls, db_dict):
         """ Create an instance of ClassConstructors subclass with instance attributes set to db_dict values
 
-        Create instance using default_constructor() then update instance attributes with values in db_dict
+        Same as creating an instance using default_constructor() then updating instance attributes with
+        db_dict_update(db_dict), but uses the compiled constructor of cls (see db_dict_list_constructor())
 
         Args:
             db_dict (dict): see db_dict_update() db_dict arg
@@ -53,9 +62,110 @@ class ClassConstructors(ABC):
         Returns:
             ClassConstructors: subclass instance with all instance attributes set with db_dict
         """
+        return cls.db_dict_list_constructor([db_dict])[0]
+
+    @classmethod
+    def db_dict_list_constructor(cls, db_dict_list):
+        """ Create an instance of ClassConstructors subclass for each dict in db_dict_list (e.g. a fetchall() result)
+
+        Each instance is the same as one created with db_dict_constructor(), but the key handling of db_dict_update()
+        is done once per class and set of dict keys instead of once per dict. See _db_constructor(). db_converters()
+        are called once per distinct value of a key in db_dict_list.
+
+        Args:
+            db_dict_list (list[dict]): see db_dict_update() db_dict arg
+
+        Returns:
+            list[ClassConstructors]: subclass instances in the order of db_dict_list
+        """
+        memos = {}
+        obj_list = []
+        for keys, db_dict_iter in itertools.groupby(db_dict_list, key=tuple):
+            obj_list.extend(cls._db_constructor(keys)(db_dict_iter, memos))
+
+        return obj_list
+
+    @classmethod
+    def _db_constructor(cls, keys):
+        """ Get the compiled constructor of cls for db dicts with keys, compiling it if it has not been compiled yet
+
+        The constructor creates each instance with default_constructor() and sets each key that is an instance
+        attribute of a default instance (others are skipped, like hasattr() in db_dict_update()) with a plain
+        attribute assignment, so property setters still validate values. Values of keys with a db_converters()
+        converter are converted before they are set.
+
+        Args:
+            keys (tuple[str]): db dict keys in order
+
+        Returns:
+            Callable[[Iterable[dict], dict], list[ClassConstructors]]: called with db dicts that have keys and a memos
+                dict (see _db_convert()) shared by all calls of one db_dict_list_constructor()
+        """
+        constructor = ClassConstructors._db_constructors.get((cls, keys))
+        if constructor is not None:
+            return constructor
+
         obj = cls.default_constructor()
-        obj.db_dict_update(db_dict)
-        return obj
+        converters = cls.db_converters()
+        namespace = {"default_constructor": cls.default_constructor, "convert": ClassConstructors._db_convert}
+        lines = ["def construct(db_dict_iter, memos):",
+                 "    obj_list = []",
+                 "    for db_dict in db_dict_iter:",
+                 "        obj = default_constructor()"]
+        for i, key in enumerate(keys):
+            if not hasattr(obj, key):
+                continue
+            value = "db_dict[%r]" % key
+            if key in converters:
+                namespace["converter_%d" % i] = converters[key]
+                value = "convert(memos, %r, converter_%d, %s)" % (key, i, value)
+            if key.isidentifier() and not keyword.iskeyword(key):
+                lines.append("        obj.%s = %s" % (key, value))
+            else:
+                lines.append("        setattr(obj, %r, %s)" % (key, value))
+        lines += ["        obj_list.append(obj)",
+                  "    return obj_list"]
+        exec(compile("\n".join(lines), "<%s db dict constructor>" % cls.__qualname__, "exec"), namespace)
+
+        constructor = namespace["construct"]
+        with ClassConstructors._db_constructors_lock:
+            ClassConstructors._db_constructors[(cls, keys)] = constructor
+        return constructor
+
+    @staticmethod
+    def _db_convert(memos, key, converter, value):
+        """ Convert value with converter, once per distinct value (and type) of key
+
+        Args:
+            memos (dict): of key to dict of (type(value), value) to converted value. updated by this function
+            key (str): db dict key of value
+            converter (Callable[[object], object]): see db_converters()
+            value (object): db value
+
+        Returns:
+            object: converted value
+        """
+        memo = memos.setdefault(key, {})
+        memo_key = (type(value), value)
+        try:
+            if memo_key not in memo:
+                memo[memo_key] = converter(value)
+            return memo[memo_key]
+        except TypeError:
+            # unhashable value
+            return converter(value)
+
+    @classmethod
+    def db_converters(cls):
+        """ Conversions of db values to instance attribute values (e.g. str to Enum) applied by db_dict_update()
+
+        Subclasses add their conversions to those of their superclass. Converters must return the same value for equal
+        values of the same type (they are called once per distinct value)
+
+        Returns:
+            dict: of db dict key to Callable[[object], object] that converts the db value of that key
+        """
+        return {}
 
     def db_dict_update(self, db_dict):
         """ Update instance variables using db_dict
@@ -66,6 +176,7 @@ class ClassConstructors(ABC):
             db_dict (dict): dict with instance variables (string keys) and values (datatype values)
         """
         # use this method of setting attributes instead of __dict__.update to property set private attributes
+        converters = self.db_converters()
         for key, value in db_dict.items():
             if hasattr(self, key):
-                setattr(self, key, value)
\ No newline at end of file
+                setattr(self, key, converters[key](value) if key in converters else value)
@@ -13,6 +13,7 @@ class ComplexServiceBillDataBase(SimpleServiceBillDataBase):
     Attributes:
         see init docstring for attributes
     """
+    __slots__ = ("is_actual",)
     @abstractmethod
     def __init__(self, real_estate, service_provider, start_date, end_date, total_cost, tax_rel_cost, is_actual,
                  paid_date=None, notes=None):
@@ -38,6 +39,8 @@ class ComplexServiceBillDataBase(SimpleServiceBillDataBase):
         """
         return "Actual Bill: " + str(self.is_actual) + ", " + super().__str__()
 
-    def db_dict_update(self, db_dict):
-        super().db_dict_update(db_dict)
-        self.is_actual = bool(self.is_actual)
\ No newline at end of file
+    @classmethod
+    def db_converters(cls):
+        converters = super().db_converters()
+        converters["is_actual"] = lambda is_actual: None if is_actual is None else bool(is_actual)
+        return converters
\ No newline at end of file
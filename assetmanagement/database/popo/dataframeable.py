@@ -7,6 +7,8 @@ class DataFrameable(ABC):
     """ Classes that implement this class can create a 1-row pandas dataframe from the instance attributes
     Implementing classes can specify how attributes are handled
     """
+    __slots__ = ()
+
     @abstractmethod
     def __init__(self):
         pass
@@ -14,6 +14,7 @@ class DepreciationBillData(SimpleServiceBillDataBase):
     Attributes:
         see init docstring for attributes
     """
+    __slots__ = ("real_property_values", "_period_usage_pct")
     def __init__(self, real_estate, service_provider, real_property_values, start_date, end_date, period_usage_pct,
                  total_cost, tax_rel_cost, paid_date=None, notes=None):
         """ init function
@@ -150,7 +151,7 @@ class DepreciationBillData(SimpleServiceBillDataBase):
         private (single leading underscore) variables will have the leading underscore removed in this function
 
         Returns:
-            dict: copy of self.__dict__ with changes described above
+            dict: self.attr_dict() with changes described above
         """
         d = super().to_insert_dict()
         d.pop("real_property_values", None)
@@ -172,19 +173,34 @@ class DepreciationBillData(SimpleServiceBillDataBase):
                 self.real_property_values.to_pd_df() with 'id' renamed to 'real_property_value_id' and
                     real_property_values column dropped
         """
-        do_rpv_prepend = kwargs.get("rpv_prepend", False)
-
         df = super().to_pd_df(deprivatize=deprivatize, **kwargs)
-        rpv_df = self.real_property_values.to_pd_df()
-
-        rpv_df = rpv_df.rename(columns={"id": "real_property_value_id"})
-        if do_rpv_prepend:
-            rpv_df = rpv_df.rename(columns={col: "rpv_" + col for col in
-                ["real_estate_id", "address", "street_num", "street_name", "city", "state", "zip_code", "apt","notes"]})
+        _, fks_after = self.frame_fk_columns(**kwargs)
+        rpv_df = self.real_property_values.to_pd_df().rename(columns=fks_after[0][1])
 
         df = pd.concat([df, rpv_df], axis=1)
         df = df.drop(columns=["real_property_values"])
         if deprivatize:
             df = df.rename(columns={"_period_usage_pct": "period_usage_pct"})
 
-        return df
\ No newline at end of file
+        return df
+
+    @classmethod
+    def frame_fk_columns(cls, **kwargs):
+        """ see superclass docstring
+
+        real_property_values columns come after the bill's own columns. see to_pd_df() for kwargs rpv_prepend
+        """
+        fks_before, _ = super().frame_fk_columns(**kwargs)
+        rpv_renames = {"id": "real_property_value_id"}
+        if kwargs.get("rpv_prepend", False):
+            rpv_renames.update({col: "rpv_" + col for col in ["real_estate_id", "address", "street_num", "street_name",
+                                                               "city", "state", "zip_code", "apt", "notes"]})
+
+        return fks_before, [("real_property_values", rpv_renames)]
+
+    @classmethod
+    def frame_renames(cls):
+        """ see superclass docstring """
+        renames = super().frame_renames()
+        renames["_period_usage_pct"] = "period_usage_pct"
+        return renames
\ No newline at end of file
@@ -11,6 +11,11 @@ class ElectricBillData(ComplexServiceBillDataBase):
         see super class docstring
         see init docstring for attributes
     """
+    __slots__ = ("total_kwh", "eh_kwh", "bank_kwh", "bs_rate", "bs_cost", "first_kwh", "first_rate", "first_cost",
+                 "next_kwh", "next_rate", "next_cost", "cbc_rate", "cbc_cost", "mfc_rate", "mfc_cost",
+                 "dsc_total_cost", "psc_rate", "psc_cost", "psc_total_cost", "der_rate", "der_cost", "dsa_rate",
+                 "dsa_cost", "rda_rate", "rda_cost", "nysa_rate", "nysa_cost", "rbp_rate", "rbp_cost", "spta_rate",
+                 "spta_cost", "st_rate", "st_cost", "toc_total_cost")
 
     def __init__(self, real_estate, service_provider, start_date, end_date, total_kwh, eh_kwh, bank_kwh, total_cost,
                  tax_rel_cost, bs_rate, bs_cost, dsc_total_cost, toc_total_cost, is_actual, first_kwh=None,
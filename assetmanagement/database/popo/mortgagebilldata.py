@@ -9,6 +9,7 @@ class MortgageBillData(SimpleServiceBillDataBase):
     Attributes:
         see init docstring for attributes
     """
+    __slots__ = ("outs_prin", "esc_bal", "prin_pmt", "int_pmt", "esc_pmt", "other_pmt")
     def __init__(self, real_estate, service_provider, start_date, end_date, total_cost, tax_rel_cost, outs_prin,
                  esc_bal, prin_pmt, int_pmt, esc_pmt, other_pmt, paid_date=None, notes=None):
         """ init function
@@ -11,6 +11,11 @@ class NatGasBillData(ComplexServiceBillDataBase):
         see super class docstring
         see init docstring for attributes
     """
+    __slots__ = ("total_therms", "saved_therms", "bsc_therms", "bsc_cost", "next_therms", "next_rate", "next_cost",
+                 "over_therms", "over_rate", "over_cost", "dra_rate", "dra_cost", "sbc_rate", "sbc_cost", "tac_rate",
+                 "tac_cost", "bc_cost", "ds_nysls_rate", "ds_nysls_cost", "ds_nysst_rate", "ds_nysst_cost",
+                 "ds_total_cost", "gs_rate", "gs_cost", "ss_nysls_rate", "ss_nysls_cost", "ss_nysst_rate",
+                 "ss_nysst_cost", "ss_total_cost", "pbc_cost", "oca_total_cost")
     def __init__(self, real_estate, service_provider, start_date, end_date, total_therms, saved_therms, total_cost,
                  tax_rel_cost, bsc_therms, bsc_cost, next_therms, next_rate, next_cost, ds_total_cost, gs_rate, gs_cost,
                  ss_total_cost, oca_total_cost, is_actual, over_therms=None, over_rate=None, over_cost=None,
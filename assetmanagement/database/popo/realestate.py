@@ -94,11 +94,12 @@ class RealEstate(DataFrameable, ClassConstructors):
     def str_dict_constructor(cls, str_dict):
         raise NotImplementedError("RealEstate does not implement str_dict_constructor()")
 
-    def db_dict_update(self, db_dict):
-        super().db_dict_update(db_dict)
-        if isinstance(self.address, str):
-            self.address = Address(self.address)
-        self.bill_tax_related = bool(self.bill_tax_related)
+    @classmethod
+    def db_converters(cls):
+        converters = super().db_converters()
+        converters.update({"address": lambda address: Address(address) if isinstance(address, str) else address,
+                           "bill_tax_related": bool})
+        return converters
 
     def to_pd_df(self, deprivatize=True, **kwargs):
         """ see superclass docstring
@@ -62,10 +62,11 @@ class RealPropertyValues(DataFrameable, ClassConstructors):
     def str_dict_constructor(cls, str_dict):
         raise NotImplementedError("RealPropertyValues does not implement str_dict_constructor()")
 
-    def db_dict_update(self, db_dict):
-        super().db_dict_update(db_dict)
-        if isinstance(self.dep_class, str):
-            self.dep_class = DepClass(self.dep_class)
+    @classmethod
+    def db_converters(cls):
+        converters = super().db_converters()
+        converters["dep_class"] = lambda dep_class: DepClass(dep_class) if isinstance(dep_class, str) else dep_class
+        return converters
 
     def to_pd_df(self, deprivatize=True, **kwargs):
         """ see superclass docstring
@@ -79,12 +79,13 @@ class ServiceProvider(DataFrameable, ClassConstructors):
     def str_dict_constructor(cls, str_dict):
         raise NotImplementedError("ServiceProvider does not implement str_dict_constructor()")
 
-    def db_dict_update(self, db_dict):
-        super().db_dict_update(db_dict)
-        if isinstance(self.provider, str):
-            self.provider = ServiceProviderEnum(self.provider)
-        if isinstance(self.tax_category, str):
-            self.tax_category = TaxCategory(self.tax_category)
+    @classmethod
+    def db_converters(cls):
+        converters = super().db_converters()
+        converters.update({
+            "provider": lambda provider: ServiceProviderEnum(provider) if isinstance(provider, str) else provider,
+            "tax_category": lambda category: TaxCategory(category) if isinstance(category, str) else category})
+        return converters
 
     def to_pd_df(self, deprivative=True, **kwargs):
         """ see superclass docstring
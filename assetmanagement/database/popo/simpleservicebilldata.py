@@ -7,6 +7,7 @@ class SimpleServiceBillData(SimpleServiceBillDataBase):
     Attributes:
         see init docstring for attributes
     """
+    __slots__ = ()
     def __init__(self, real_estate, service_provider, start_date, end_date, total_cost, tax_rel_cost, paid_date=None,
                  notes=None):
         """ init function
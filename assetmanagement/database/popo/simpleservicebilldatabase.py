@@ -21,10 +21,17 @@ class SimpleServiceBillDataBase(DictInsertable, DataFrameable, ClassConstructors
     Note that a "service" is loosely defined and may include actual services, goods purchased or any other item that
     can loosely be considered a "service".
 
+    Instance attributes are stored in __slots__ (subclasses add their own) instead of a per instance __dict__ to keep
+    memory per bill low when many bills are loaded. Use attr_dict() where self.__dict__ would be used.
+
     Attributes:
         id (int): database primary key id
         see init docstring for attributes
     """
+    __slots__ = ("id", "real_estate", "service_provider", "_start_date", "_end_date", "total_cost", "tax_rel_cost",
+                 "_paid_date", "notes")
+    # subclass to tuple of all instance attribute names. see attr_names()
+    _attr_names = {}
     @abstractmethod
     def __init__(self, real_estate, service_provider, start_date, end_date, total_cost, tax_rel_cost, paid_date=None,
                  notes=None):
@@ -104,6 +111,27 @@ class SimpleServiceBillDataBase(DictInsertable, DataFrameable, ClassConstructors
             bill_copy.notes += " Real estate changed from original."
         return bill_copy
 
+    @classmethod
+    def attr_names(cls):
+        """ All instance attribute names of cls, superclass attributes first, i.e. in the order __init__ sets them
+
+        Returns:
+            tuple[str]: names from __slots__ of cls and its superclasses
+        """
+        names = SimpleServiceBillDataBase._attr_names.get(cls)
+        if names is None:
+            names = tuple(name for klass in reversed(cls.__mro__) for name in klass.__dict__.get("__slots__", ()))
+            SimpleServiceBillDataBase._attr_names[cls] = names
+        return names
+
+    def attr_dict(self):
+        """ Instance attributes as a dict, the __slots__ equivalent of self.__dict__
+
+        Returns:
+            dict: new dict of instance attribute names (in attr_names() order) to values
+        """
+        return {name: getattr(self, name) for name in self.attr_names()}
+
     @property
     def start_date(self):
         return self._start_date
@@ -152,9 +180,9 @@ class SimpleServiceBillDataBase(DictInsertable, DataFrameable, ClassConstructors
         private (single leading underscore) variables will have the leading underscore removed in this function
 
         Returns:
-            dict: copy of self.__dict__ with changes described above
+            dict: self.attr_dict() with changes described above
         """
-        d = self.__dict__.copy()
+        d = self.attr_dict()
         d.pop("id", None)
         d.pop("real_estate", None)
         d.pop("service_provider", None)
@@ -176,14 +204,37 @@ class SimpleServiceBillDataBase(DictInsertable, DataFrameable, ClassConstructors
         """
         re_df = self.real_estate.to_pd_df().rename(columns={"id": "real_estate_id"})
         sp_df = self.service_provider.to_pd_df().rename(columns={"id": "service_provider_id"})
-        other_df = pd.DataFrame(self.__dict__, index=[0]).drop(columns=["real_estate", "service_provider"])
+        other_df = pd.DataFrame(self.attr_dict(), index=[0]).drop(columns=["real_estate", "service_provider"])
         if deprivatize:
-            other_df = other_df.rename(columns={"_start_date": "start_date", "_end_date": "end_date",
-                                                "_paid_date": "paid_date"})
+            other_df = other_df.rename(columns=SimpleServiceBillDataBase.frame_renames())
         df = pd.concat([re_df, sp_df, other_df], axis=1)
 
         return df
 
+    @classmethod
+    def frame_fk_columns(cls, **kwargs):
+        """ Foreign key attributes that to_pd_df() replaces with the foreign key object's to_pd_df() columns
+
+        Used by BillFrame to build a dataframe of many bills with the same columns as to_pd_df()
+
+        Args:
+            **kwargs: see to_pd_df(kwargs)
+
+        Returns:
+            tuple[list[tuple[str, dict]], list[tuple[str, dict]]]: (attribute name, column renames) of foreign key
+                objects whose columns come before the bill's own columns and of those whose columns come after
+        """
+        return [("real_estate", {"id": "real_estate_id"}), ("service_provider", {"id": "service_provider_id"})], []
+
+    @classmethod
+    def frame_renames(cls):
+        """ Column renames to_pd_df() applies to the bill's own columns when deprivatize is True
+
+        Returns:
+            dict: of "private" attribute name to column name
+        """
+        return {"_start_date": "start_date", "_end_date": "end_date", "_paid_date": "paid_date"}
+
     @staticmethod
     def calc_bill_month_year(start_date, end_date, threshold: int = 25):
         """ Calculate bill month depending on start_date and end_date
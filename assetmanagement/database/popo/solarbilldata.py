@@ -15,6 +15,7 @@ class SolarBillData(SimpleServiceBillDataBase):
     Attributes:
         see init docstring for attributes
     """
+    __slots__ = ("solar_kwh", "home_kwh", "actual_costs", "oc_bom_basis", "oc_pnl_pct", "oc_pnl", "oc_eom_basis")
     def __init__(self, real_estate, service_provider, start_date, end_date, solar_kwh, home_kwh, total_cost,
                  tax_rel_cost, actual_costs, oc_bom_basis, oc_pnl_pct, oc_pnl, oc_eom_basis, paid_date=None,
                  notes=None):
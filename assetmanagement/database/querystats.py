@@ -0,0 +1,226 @@
+"""
+Per statement query statistics and slow query log
+
+QueryStats is the only class of this module.
+"""
+from functools import lru_cache
+import atexit
+import bisect
+import json
+import os
+import pathlib
+import re
+import threading
+
+import numpy as np
+import pandas as pd
+
+from assetmanagement.loggingam.logger import Logger
+
+_MARKER_RE = re.compile(r"%\(\w+\)s|%s")
+_STRING_RE = re.compile(r"'(?:[^'\\]|\\.)*'|\"(?:[^\"\\]|\\.)*\"")
+_NUMBER_RE = re.compile(r"(?<![\w.`])-?\d+(?:\.\d+)?(?![\w.`])")
+_LIST_RE = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+_ROWS_RE = re.compile(r"\(\?\+\)(?:\s*,\s*\(\?\+\))+")
+_SPACE_RE = re.compile(r"\s+")
+
+
+class QueryStats:
+    """ Process wide per statement timing statistics and slow query log
+
+    MySQLBase records every statement it executes here when is_enabled(): MYSQL_QUERY_STATS is 1 in .env (or
+    QueryStats.enabled is set to True). Statements are keyed by fingerprint(), so all statements QueryWriter writes for
+    the same table, fields and where clause shape share one entry, whatever their parameters, IN list lengths or number
+    of inserted rows.
+
+    Each entry has the count, total and max wall time, rows returned or affected, approximate bytes returned and a
+    histogram of wall times with bucket upper bounds HISTOGRAM_BOUNDS seconds (plus one bucket for anything slower).
+    dump() writes all entries as JSON, and is called at exit to write Query_Stats.json in DO_LOGGING_DIR if enabled.
+
+    Statements that take at least slow_threshold() seconds (MYSQL_SLOW_QUERY_SECONDS in .env, default 1.0) are also
+    written to Slow_Query_Log.log in DO_LOGGING_DIR with their parameters and EXPLAIN output.
+
+    The .env values are read when used, not when this module is imported, so they are seen if .env is loaded after
+    import (as main.py does).
+
+    Attributes:
+        enabled (Optional[boolean]): True to record statements. None to use MYSQL_QUERY_STATS
+        slow_seconds (Optional[float]): wall time at or above which a statement is written to the slow query log. None
+            to use MYSQL_SLOW_QUERY_SECONDS
+    """
+    HISTOGRAM_BOUNDS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+    enabled = None
+    slow_seconds = None
+
+    _stats = {}
+    _lock = threading.Lock()
+    _slow_logger = None
+
+    @classmethod
+    def is_enabled(cls):
+        """ Whether statements are recorded
+
+        Returns:
+            boolean: cls.enabled if set, otherwise True if MYSQL_QUERY_STATS is "1"
+        """
+        return os.getenv("MYSQL_QUERY_STATS", "0") == "1" if cls.enabled is None else cls.enabled
+
+    @classmethod
+    def slow_threshold(cls):
+        """ Wall time at or above which a statement is written to the slow query log
+
+        Returns:
+            float: cls.slow_seconds if set, otherwise MYSQL_SLOW_QUERY_SECONDS (default 1.0)
+        """
+        return float(os.getenv("MYSQL_SLOW_QUERY_SECONDS", "1.0")) if cls.slow_seconds is None else cls.slow_seconds
+
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def fingerprint(query):
+        """ Normalize query so statements that differ only in values have the same fingerprint
+
+        Parameter markers, string and number literals become ?. Lists of ? (IN lists, VALUES rows) become (?+) and
+        multi-row VALUES lists become (?+), ... Whitespace is collapsed and any trailing ; removed.
+
+        Args:
+            query (str): SQL statement
+
+        Returns:
+            str: fingerprint
+
+        Example:
+            "SELECT * FROM t WHERE id in (%s,%s) AND x = 'a' LIMIT 5;" ->
+                "SELECT * FROM t WHERE id in (?+) AND x = ? LIMIT ?"
+        """
+        fp = _MARKER_RE.sub("?", query)
+        fp = _STRING_RE.sub("?", fp)
+        fp = _NUMBER_RE.sub("?", fp)
+        fp = _LIST_RE.sub("(?+)", fp)
+        fp = _ROWS_RE.sub("(?+), ...", fp)
+        fp = _SPACE_RE.sub(" ", fp).strip()
+
+        return fp[:-1].rstrip() if fp.endswith(";") else fp
+
+    @staticmethod
+    def result_size(result):
+        """ Rows and approximate bytes of a fetch result
+
+        Bytes are the length of str and bytes values and 8 for any other value for list results, and the array or
+        dataframe memory for columnar and dataframe results. Iterators are not consumed so their size is unknown.
+
+        Args:
+            result: result of MySQLBase.execute_fetch()
+
+        Returns:
+            tuple[Optional[int], Optional[int]]: (rows, bytes). None for unknown
+        """
+        if isinstance(result, pd.DataFrame):
+            return len(result), int(result.memory_usage(index=False).sum())
+        if isinstance(result, dict):
+            cols = list(result.values())
+            return (len(cols[0]) if len(cols) > 0 else 0,
+                    sum([c.nbytes if isinstance(c, np.ndarray) else c.codes.nbytes for c in cols]))
+        if isinstance(result, list):
+            nbytes = 0
+            for row in result:
+                for v in (row.values() if isinstance(row, dict) else row):
+                    nbytes += len(v) if isinstance(v, (str, bytes)) else 8
+            return len(result), nbytes
+        return None, None
+
+    @classmethod
+    def record(cls, query, seconds, rows=None, nbytes=None):
+        """ Add a statement execution to the statistics of its fingerprint
+
+        Args:
+            query (str): SQL statement
+            seconds (float): wall time
+            rows (Optional[int]): rows returned or affected. Default None for unknown
+            nbytes (Optional[int]): approximate bytes returned. Default None for unknown
+
+        Returns:
+            boolean: True if seconds >= cls.slow_threshold(), i.e. the statement should go in the slow query log
+        """
+        fp = cls.fingerprint(query)
+        with cls._lock:
+            entry = cls._stats.get(fp, None)
+            if entry is None:
+                entry = {"count": 0, "total_seconds": 0.0, "max_seconds": 0.0, "rows": 0, "bytes": 0,
+                         "histogram": [0] * (len(cls.HISTOGRAM_BOUNDS) + 1)}
+                cls._stats[fp] = entry
+            entry["count"] += 1
+            entry["total_seconds"] += seconds
+            entry["max_seconds"] = max(entry["max_seconds"], seconds)
+            entry["rows"] += 0 if rows is None or rows < 0 else rows
+            entry["bytes"] += 0 if nbytes is None else nbytes
+            entry["histogram"][bisect.bisect_left(cls.HISTOGRAM_BOUNDS, seconds)] += 1
+
+        return seconds >= cls.slow_threshold()
+
+    @classmethod
+    def log_slow(cls, query, params, seconds, rows, explain):
+        """ Write a statement to the slow query log
+
+        Args:
+            query (str): SQL statement
+            params: statement parameters
+            seconds (float): wall time
+            rows (Optional[int]): rows returned or affected
+            explain (Union[list[dict], str]): EXPLAIN rows or the reason there are none
+        """
+        if cls._slow_logger is None:
+            cls._slow_logger = Logger("SlowQuery", log_file_name="Slow_Query_Log.log").logger
+
+        params_str = str(params)
+        cls._slow_logger.warning(format(seconds, ".4f") + " seconds, " + str(rows) + " rows: " + query +
+                                 "\nParams: " + (params_str[:500] + "..." if len(params_str) > 500 else params_str) +
+                                 "\nExplain: " + str(explain))
+
+    @classmethod
+    def stats(cls):
+        """ Copy of the statistics
+
+        Returns:
+            dict: fingerprint: dict with keys "count", "total_seconds", "max_seconds", "rows", "bytes" and "histogram"
+                (list of counts for each bucket in HISTOGRAM_BOUNDS then one for slower), sorted by total_seconds
+                descending
+        """
+        with cls._lock:
+            items = [(fp, {**entry, "histogram": list(entry["histogram"])}) for fp, entry in cls._stats.items()]
+
+        return dict(sorted(items, key=lambda item: item[1]["total_seconds"], reverse=True))
+
+    @classmethod
+    def reset(cls):
+        """ Clear the statistics """
+        with cls._lock:
+            cls._stats.clear()
+
+    @classmethod
+    def dump(cls, path=None):
+        """ Write the statistics as JSON
+
+        Args:
+            path (Optional[Union[str, pathlib.Path]]): output file. Default None for Query_Stats.json in DO_LOGGING_DIR
+
+        Returns:
+            pathlib.Path: output file
+        """
+        if path is None:
+            path = pathlib.Path(__file__).parent.parent.parent / (os.getenv("DO_LOGGING_DIR") + "Query_Stats.json")
+        path = pathlib.Path(path)
+
+        with open(path, "w") as f:
+            json.dump({"histogram_bounds": list(cls.HISTOGRAM_BOUNDS), "statements": cls.stats()}, f, indent=2)
+
+        return path
+
+    @classmethod
+    def _dump_at_exit(cls):
+        """ atexit function. dump() if enabled and anything was recorded """
+        if cls.is_enabled() and len(cls._stats) > 0:
+            cls.dump()
+
+
+atexit.register(QueryStats._dump_at_exit)
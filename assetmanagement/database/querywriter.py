@@ -1,17 +1,48 @@
 from enum import Enum
+from functools import lru_cache
 from typing import Optional, Union
 
 import datetime
+import os
+
+
+def _freeze(value):
+    """ Hashable copy of fields or order_bys for the statement template caches. lists become tuples
+
+    Args:
+        value: str, list or tuple (possibly nested) or any other value
+
+    Returns:
+        value with lists and tuples converted to tuples recursively
+    """
+    return tuple([_freeze(v) for v in value]) if isinstance(value, (list, tuple)) else value
 
 
 class QueryWriter:
     """ Formatter for simple single table queries
 
+    The SQL text of each statement is compiled once per statement shape (table, fields, where clause structure,
+    order_bys, etc.) and cached in process wide LRU caches. Later calls with the same shape only convert and collect
+    parameters. Where clause shapes include the number of elements of each "in" list. See template_stats()
+
+    "in" and "not in" lists of read queries longer than in_list_max are not expanded to one placeholder per element.
+    They are read from a session temporary table instead (see where_clause() and write_in_list_table_queries()). Update
+    and delete queries always expand lists, since only reads load the temporary tables
+
     Attributes:
         see __init__ docstring
+        in_list_tables (list[tuple[str, str, tuple]]): (temporary table, column, distinct vals) of each "in" or "not
+            in" list longer than in_list_max in the last where clause written
     """
+    TEMPLATE_CACHE_SIZE = 1024
+    # default in_list_max. 0 to always expand "in" lists. None to use MYSQL_IN_LIST_MAX (default 1000), read when a
+    # QueryWriter is created so a value loaded from .env after import is used
+    IN_LIST_MAX = None
+    # prefix of the session temporary tables of long "in" lists. numbered by order in the where clause
+    IN_LIST_TABLE_PREFIX = "tmp_in_"
+
     def __init__(self, table, fields=None, distinct=None, wheres=None, order_bys=None, limit=None,
-                 date_to_int_date=None, fields_extra=None):
+                 date_to_int_date=None, fields_extra=None, in_list_max=None):
         """ init QueryWriter
 
         Args:
@@ -28,6 +59,8 @@ class QueryWriter:
                 update parameters (both set and where params) and insert parameters. Default None for no conversions
             fields_extra (Optional[str, list[str]]): Default None. Certain queries allow for two sets of fields to be
                 applied (e.g. INSERT INTO ... ON DUPLICATE UPDATE ..., possibly others)
+            in_list_max (Optional[int]): "in" and "not in" lists longer than this are read from a temporary table. 0
+                to always expand lists. Default None for IN_LIST_MAX (env MYSQL_IN_LIST_MAX, default 1000)
         """
         if fields in (None, (), []):
             fields = "*"
@@ -41,6 +74,8 @@ class QueryWriter:
             limit = 0
         if date_to_int_date is None:
             date_to_int_date = False
+        if in_list_max is None:
+            in_list_max = int(os.getenv("MYSQL_IN_LIST_MAX", "1000")) if self.IN_LIST_MAX is None else self.IN_LIST_MAX
 
         self.table = table
         self.fields = fields
@@ -50,6 +85,8 @@ class QueryWriter:
         self.limit = limit
         self.date_to_int_date = date_to_int_date
         self.fields_extra = fields_extra
+        self.in_list_max = in_list_max
+        self.in_list_tables = []
 
     def select_stmt(self):
         """ Compile SELECT statement and return as str
@@ -66,11 +103,17 @@ class QueryWriter:
         Raises:
             TypeError: fields is not in a valid format
         """
-        if isinstance(self.fields, str):
-            select_str = self.fields
-        elif isinstance(self.fields, (list, tuple)):
+        return self._compile_select(_freeze(self.fields), self.distinct)
+
+    @staticmethod
+    @lru_cache(maxsize=TEMPLATE_CACHE_SIZE)
+    def _compile_select(fields, distinct):
+        """ see select_stmt(). fields is frozen with _freeze() """
+        if isinstance(fields, str):
+            select_str = fields
+        elif isinstance(fields, (list, tuple)):
             select_str = ""
-            for field in self.fields:
+            for field in fields:
                 if isinstance(field, str):
                     select_str += (field + ", ")
                 elif isinstance(field, (list, tuple)):
@@ -83,14 +126,14 @@ class QueryWriter:
 
             select_str = select_str[:-2]
         else:
-            raise TypeError(str(type(self.fields)) + " is not a valid fields type")
+            raise TypeError(str(type(fields)) + " is not a valid fields type")
 
-        if self.distinct:
+        if distinct:
             select_str = "DISTINCT " + select_str
 
         return "SELECT " + select_str
 
-    def where_clause(self):
+    def where_clause(self, expand_in_lists=None):
         """ Compile WHERE clause and parameters
 
         self.wheres can have the following formats:
@@ -112,6 +155,12 @@ class QueryWriter:
 
         If comp is "is" or "is not", vals must be None
 
+        If comp is "in" or "not in", vals has more than self.in_list_max elements and expand_in_lists is not True, the
+        condition is written as
+        "col in (SELECT v FROM tmp_in_N)" with no params, and (tmp_in_N, col, distinct vals) is added to
+        self.in_list_tables. The temporary tables must be loaded on the connection that executes the query first. See
+        write_in_list_table_queries() and MySQLBase.write_read_query()
+
         Examples: self.wheres -> query str, params tuple
             [["col1", "<", 1], "or", ["col2", "=", "asdf"]] -> "WHERE col1 < %s or col2 = %s", (1, "asdf")
             [["col1", ">=", datetime.date(year=2000, month=1, day=1)]] (self.date_to_int_date == True)
@@ -120,93 +169,160 @@ class QueryWriter:
                 "WHERE col1 not in (%s, %s, %s) and 1=2", (5, 6, 7)
             [["col1", "=", "^col2^"]] -> "WHERE col1 = col2", ()
                 in contrast to: [["col1", "=", "col2"]] -> "WHERE col1 = %s", ("col2")
+            [["col1", "in", list(range(5000))]] (self.in_list_max == 1000)
+                -> "WHERE col1 IN (SELECT v FROM tmp_in_0)", ()
+
+        Args:
+            expand_in_lists (Optional[boolean]): True to expand every "in" and "not in" list, whatever its length, for
+                statements that don't load self.in_list_tables. Default None for False
+
         Returns:
             tuple[str, tuple]: (query, params)
 
         Raises:
             TypeError: wheres is not in a valid format
         """
-        where_str = ""
+        shape, params = self._where_shape(expand_in_lists=expand_in_lists)
+
+        return self._compile_where(shape), params
+
+    def _where_shape(self, expand_in_lists=None):
+        """ Structure of self.wheres (without values) and where clause parameters. see where_clause()
+
+        Elements of vals are converted as described in where_clause() (in place, as before templates were cached)
+
+        Args:
+            expand_in_lists (Optional[boolean]): see where_clause()
+
+        Returns:
+            tuple[Union[str, tuple], tuple]: (shape, params). shape is self.wheres if it is a str, otherwise a tuple
+                with a keyword str for each keyword and a (column, comp, marker) tuple for each condition. marker is
+                the number of vals for "in" and "not in" (or a ("table", temporary table) tuple if vals is longer
+                than self.in_list_max), None for "is" and "is not", the column reference str for ^column^ vals and
+                "%s" otherwise. self.in_list_tables is rebuilt
+
+        Raises:
+            TypeError: wheres is not in a valid format
+        """
+        self.in_list_tables = []
+        if isinstance(self.wheres, str):
+            return self.wheres, ()
+        if not isinstance(self.wheres, (list, tuple)):
+            raise TypeError(str(type(self.wheres)) + " is not a valid wheres type")
+
+        shape = []
         params = ()
+        for cond in self.wheres:
+            if isinstance(cond, str):
+                shape.append(cond)
+            elif isinstance(cond, (list, tuple)):
+                comp = cond[1].lower()
+                if comp in ("in", "not in") and len(cond[2]) == 0:
+                    shape.append((cond[0], cond[1], 0))
+                    continue
+                if comp in ("is", "is not"):
+                    if cond[2] is not None:
+                        raise TypeError("'is' and 'is not' must have val None")
+                    shape.append((cond[0], cond[1], None))
+                    continue
+
+                is_col = False
+                in_table = None
+                if comp in ("in", "not in") and not expand_in_lists and 0 < self.in_list_max < len(cond[2]):
+                    in_table = self.IN_LIST_TABLE_PREFIX + str(len(self.in_list_tables))
+                    shape.append((cond[0], cond[1], ("table", in_table)))
+                elif comp in ("in", "not in"):
+                    shape.append((cond[0], cond[1], len(cond[2])))
+                elif isinstance(cond[2], str) and len(cond[2]) > 2 and cond[2][0] == "^" and cond[2][-1] == "^":
+                    is_col = True
+                    shape.append((cond[0], cond[1], cond[2]))
+                else:
+                    shape.append((cond[0], cond[1], "%s"))
+
+                if isinstance(cond[2], (list, tuple)):
+                    cond_temp = []
+                    for el in cond[2]:
+                        if isinstance(el, bool):
+                            # True and False must be changed to 1 and 0 since mysql does not have bool type
+                            cond_temp.append(int(el))
+                        elif self.date_to_int_date and isinstance(el, datetime.date):
+                            cond_temp.append(el.strftime("%Y%m%d"))
+                        elif isinstance(el, Enum):
+                            cond_temp.append(el.value)
+                        else:
+                            cond_temp.append(el)
+
+                    cond[2] = tuple(cond_temp) if isinstance(cond[2], tuple) else cond_temp
+                    if in_table is not None:
+                        self.in_list_tables.append((in_table, cond[0], tuple(dict.fromkeys(cond[2]))))
+                    else:
+                        params += tuple(cond[2])
+                elif not is_col:
+                    if isinstance(cond[2], bool):
+                        # True and False must be changed to 1 and 0 since mysql does not have bool type
+                        cond[2] = int(cond[2])
+                    elif self.date_to_int_date and isinstance(cond[2], datetime.date):
+                        cond[2] = cond[2].strftime("%Y%m%d")
+                    elif isinstance(cond[2], Enum):
+                        cond[2] = cond[2].value
+
+                    params += (str(cond[2]),)
+            else:
+                raise TypeError(str(type(cond)) + " is not a valid wheres condition type")
+
+        return tuple(shape), params
+
+    @staticmethod
+    @lru_cache(maxsize=TEMPLATE_CACHE_SIZE)
+    def _compile_where(shape):
+        """ WHERE clause of a shape from _where_shape(). see where_clause() """
+        where_str = ""
         keyword_is_next = False
 
-        if isinstance(self.wheres, str):
-            where_str = self.wheres
-        elif isinstance(self.wheres, (list, tuple)):
-            for cond in self.wheres:
+        if isinstance(shape, str):
+            where_str = shape
+        else:
+            for cond in shape:
                 if isinstance(cond, str):
                     if cond.lower() in ("or", "(", ")"):
                         where_str += (" " + cond.upper())
                     else:
                         where_str += " AND"
                     keyword_is_next = cond == ")"
-                elif isinstance(cond, (list, tuple)):
+                else:
                     if keyword_is_next:
                         where_str += " AND"
 
+                    col, comp, marker = cond
                     # avoid 'in' keyword followed by empty list. e.g. 'field in ()'.
                     # mysql syntax does not allow this. logically this always evaluates to false
-                    if cond[1].lower() == "in" and len(cond[2]) == 0:
+                    if comp.lower() == "in" and marker == 0:
                         where_str += " 1=2 "
                     # avoid 'not in' keyword followed by empty list. e.g. 'field not in ()'.
                     # mysql syntax does not allow this. logically this always evaluates to true
-                    elif cond[1].lower() == "not in" and len(cond[2]) == 0:
+                    elif comp.lower() == "not in" and marker == 0:
                         where_str += " 1=1 "
-                    elif cond[1].lower() in ("is", "is not"):
-                        if cond[2] is not None:
-                            raise TypeError("'is' and 'is not' must have val None")
-                        if cond[1].lower() == "is":
-                            where_str += (" " + cond[0] + " is null ")
-                        else:  # cond[1].lower() == "is not"
-                            where_str += (" " + cond[0] + " is not null ")
+                    elif comp.lower() == "is":
+                        where_str += (" " + col + " is null ")
+                    elif comp.lower() == "is not":
+                        where_str += (" " + col + " is not null ")
                     else:
-                        is_col = False
-                        where_str += (" " + cond[0] + " " + cond[1].upper() + " ")
-                        if cond[1].lower() in ("in", "not in"):
-                            where_str += "(" + ",".join(["%s"] * len(cond[2])) + ")"
-                        elif isinstance(cond[2], str) and len(cond[2]) > 2 and cond[2][0] == "^" and \
-                                cond[2][-1] == "^":
-                            is_col = True
-                            where_str += cond[2][1:-1]
-                        else:
+                        where_str += (" " + col + " " + comp.upper() + " ")
+                        if comp.lower() in ("in", "not in") and isinstance(marker, tuple):
+                            where_str += "(SELECT v FROM " + marker[1] + ")"
+                        elif comp.lower() in ("in", "not in"):
+                            where_str += "(" + ",".join(["%s"] * marker) + ")"
+                        elif marker == "%s":
                             where_str += "%s"
-
-                        if isinstance(cond[2], (list, tuple)):
-                            cond_temp = []
-                            for el in cond[2]:
-                                if isinstance(el, bool):
-                                    # True and False must be changed to 1 and 0 since mysql does not have bool type
-                                    cond_temp.append(int(el))
-                                elif self.date_to_int_date and isinstance(el, datetime.date):
-                                    cond_temp.append(el.strftime("%Y%m%d"))
-                                elif isinstance(el, Enum):
-                                    cond_temp.append(el.value)
-                                else:
-                                    cond_temp.append(el)
-
-                            cond[2] = tuple(cond_temp) if isinstance(cond[2], tuple) else cond_temp
-                            params += tuple(cond[2])
-                        elif not is_col:
-                            if isinstance(cond[2], bool):
-                                # True and False must be changed to 1 and 0 since mysql does not have bool type
-                                cond[2] = int(cond[2])
-                            elif self.date_to_int_date and isinstance(cond[2], datetime.date):
-                                cond[2] = cond[2].strftime("%Y%m%d")
-                            elif isinstance(cond[2], Enum):
-                                cond[2] = cond[2].value
-
-                            params += (str(cond[2]),)
+                        else:
+                            where_str += marker[1:-1]
 
                     keyword_is_next = True
-                else:
-                    raise TypeError(str(type(cond)) + " is not a valid wheres condition type")
-        else:
-            raise TypeError(str(type(self.wheres)) + " is not a valid wheres type")
 
         if where_str != "":
             where_str = "WHERE " + where_str
 
-        return where_str, params
+        return where_str
 
     def order_by_stmt(self):
         """ Compile 'ORDER BY' statement and return as str
@@ -222,18 +338,24 @@ class QueryWriter:
         Raises:
             TypeError: order_bys is not in a valid format
         """
-        if isinstance(self.order_bys, str):
-            ob_str = self.order_bys
-        elif isinstance(self.order_bys, (list, tuple)):
+        return self._compile_order_by(_freeze(self.order_bys))
+
+    @staticmethod
+    @lru_cache(maxsize=TEMPLATE_CACHE_SIZE)
+    def _compile_order_by(order_bys):
+        """ see order_by_stmt(). order_bys is frozen with _freeze() """
+        if isinstance(order_bys, str):
+            ob_str = order_bys
+        elif isinstance(order_bys, (list, tuple)):
             ob_str = ""
-            for ob in self.order_bys:
+            for ob in order_bys:
                 if ob.lower() == "desc":
                     ob_str += " DESC"
                 else:
                     ob_str += (", " + ob)
             ob_str = ob_str[2:]
         else:
-            raise TypeError(str(type(self.fields)) + " is not a valid fields type")
+            raise TypeError(str(type(order_bys)) + " is not a valid order_bys type")
 
         if ob_str != "":
             ob_str = "ORDER BY " + ob_str
@@ -248,14 +370,21 @@ class QueryWriter:
         Returns:
             tuple[str, tuple]: (query, params)
         """
-        where_str, params = self.where_clause()
-        query = self.select_stmt() + " FROM " + self.table + " " + where_str + " " + self.order_by_stmt()
+        shape, params = self._where_shape()
+        query = self._compile_read(self.table, _freeze(self.fields), self.distinct, shape, _freeze(self.order_bys))
         if int(self.limit) > 0:
             query += " LIMIT " + str(self.limit)
         query += ";"
 
         return query, params
 
+    @staticmethod
+    @lru_cache(maxsize=TEMPLATE_CACHE_SIZE)
+    def _compile_read(table, fields, distinct, where_shape, order_bys):
+        """ Read query without LIMIT statement and ; see write_read_query() """
+        return QueryWriter._compile_select(fields, distinct) + " FROM " + table + " " + \
+            QueryWriter._compile_where(where_shape) + " " + QueryWriter._compile_order_by(order_bys)
+
     def write_insert_query(self, insert_list, ignore=None):
         """ Compile insert query
 
@@ -289,19 +418,39 @@ class QueryWriter:
             # noinspection PyTypeChecker
             if any([len(lst) != len(self.fields) for lst in insert_list]):
                 raise ValueError("Each list in insert_list must have the same number of elements as self.fields")
-            # noinspection PyTypeChecker
-            insert_values_str = ("%s, " * len(self.fields))[0:-2]
         else:  # isinstance dict
             f_set = set(self.fields)
             # noinspection PyTypeChecker
             if any([set(d) != f_set for d in insert_list]):
                 raise ValueError("Each dict in insert_list must have dict.keys() equal to self.fields")
-            # noinspection PyTypeChecker
-            insert_values_str = ", ".join(["%(" + f + ")s" for f in self.fields])
 
-        query = "INSERT " + ("IGNORE" if ignore else "") + " INTO " + self.table + " (" + ", ".join(self.fields) + \
-                ") VALUES (" + insert_values_str + ")"
+        query = self._compile_insert(self.table, _freeze(self.fields), ignore, not isinstance(insert_list[0], list))
+
+        return query, self._convert_insert_list(insert_list)
+
+    @staticmethod
+    @lru_cache(maxsize=TEMPLATE_CACHE_SIZE)
+    def _compile_insert(table, fields, ignore, named):
+        """ Insert query with %s (or %(field)s if named) parameter markers. see write_insert_query() """
+        if named:
+            insert_values_str = ", ".join(["%(" + f + ")s" for f in fields])
+        else:
+            insert_values_str = ("%s, " * len(fields))[0:-2]
+
+        return "INSERT " + ("IGNORE" if ignore else "") + " INTO " + table + " (" + ", ".join(fields) + \
+            ") VALUES (" + insert_values_str + ")"
+
+    def _convert_insert_list(self, insert_list):
+        """ Apply .value to enum values and convert datetime.date values to int if self.date_to_int_date == True
+
+        Columns to convert are determined from the first element of insert_list. Changes are made in place.
+
+        Args:
+            insert_list (Union[list[list], list[dict]]): see write_insert_query()
 
+        Returns:
+            Union[list[list], list[dict]]: insert_list with changes applied
+        """
         date_cols = []
         enum_cols = []
         for k, value in enumerate(insert_list[0]) if isinstance(insert_list[0], list) else insert_list[0].items():
@@ -323,7 +472,66 @@ class QueryWriter:
                     except AttributeError:
                         pass
 
-        return query, insert_list
+        return insert_list
+
+    def write_bulk_insert_queries(self, insert_list, chunk_size=1000, ignore=None, on_duplicate_update=None):
+        """ Compile multi-row insert queries, each inserting up to chunk_size rows
+
+        Each query has the form "INSERT [IGNORE] INTO table (fields) VALUES (%s, ...), (%s, ...), ..." with optional
+        "ON DUPLICATE KEY UPDATE" statement. This sends many rows per statement instead of one statement per row.
+        enum values and datetime.date values are converted as in write_insert_query()
+
+        Args:
+            insert_list (Union[list[list], list[dict]]): see write_insert_query()
+            chunk_size (int): max number of rows inserted by each query. Default 1000
+            ignore (Optional[boolean]): True to use insert ignore statement. Default None for False to use insert
+            on_duplicate_update (Optional[boolean]): True to add "ON DUPLICATE KEY UPDATE" statement. Fields updated are
+                self.fields_extra or self.fields if self.fields_extra is None. See write_insert_or_update_query().
+                Default None for False to not add the statement
+
+        Returns:
+            list[tuple[str, list]]: (query, params) for each chunk of insert_list. params is a flat list of the values
+                of each row in the chunk in self.fields order. empty list if insert_list is empty
+
+        Raises:
+            ValueError: if any dict or list in insert_list does not match self.fields, or ignore and
+                on_duplicate_update are both True
+            NotImplementedError: if self.fields is a str
+        """
+        if ignore and on_duplicate_update:
+            raise ValueError("ignore and on_duplicate_update can't both be True")
+
+        # validates insert_list and applies conversions
+        _, insert_list = self.write_insert_query(insert_list, ignore=ignore)
+        if len(insert_list) == 0:
+            return []
+
+        if isinstance(insert_list[0], dict):
+            insert_list = [[d[f] for f in self.fields] for d in insert_list]
+
+        update_fields = None
+        if on_duplicate_update:
+            update_fields = _freeze(self.fields if self.fields_extra is None else self.fields_extra)
+
+        query_params_list = []
+        for i in range(0, len(insert_list), chunk_size):
+            chunk = insert_list[i:i + chunk_size]
+            query = self._compile_bulk_insert(self.table, _freeze(self.fields), bool(ignore), update_fields, len(chunk))
+            query_params_list.append((query, [v for row in chunk for v in row]))
+
+        return query_params_list
+
+    @staticmethod
+    @lru_cache(maxsize=TEMPLATE_CACHE_SIZE)
+    def _compile_bulk_insert(table, fields, ignore, update_fields, rows):
+        """ Multi-row insert query of rows rows. see write_bulk_insert_queries() """
+        row_str = "(" + ("%s, " * len(fields))[0:-2] + ")"
+        query = "INSERT " + ("IGNORE " if ignore else "") + "INTO " + table + " (" + ", ".join(fields) + ") VALUES " + \
+            ", ".join([row_str] * rows)
+        if update_fields is not None:
+            query += " ON DUPLICATE KEY UPDATE " + ", ".join([f + "=VALUES(" + f + ")" for f in update_fields])
+
+        return query + ";"
 
     def write_update_query(self, set_params, where_params=None, objects=()):
         # TODO allow "in" and "not in" in where clause
@@ -390,7 +598,7 @@ class QueryWriter:
             if f_len != len(lst):
                 raise ValueError("Number of parameters in all set_params sub lists must be " + str(f_len))
 
-        where_str, params = self.where_clause()
+        where_str, params = self.where_clause(expand_in_lists=True)
         if where_str != "":
             where_str = where_str + " "
         if " in " in where_str:
@@ -399,14 +607,7 @@ class QueryWriter:
         if where_params is not None and w_len != len(where_params[0]):
             raise ValueError("Number of parameters in all where_params sub lists must be " + str(w_len))
 
-        query = "UPDATE " + self.table + " SET "
-        if isinstance(self.fields, str):
-            query += (self.fields + " ")
-        else:
-            for f in self.fields:
-                query += (f + " = %s, ")
-            query = query[:-2]
-        query += (" " + where_str + ";")
+        query = self._compile_update(self.table, _freeze(self.fields), where_str)
 
         final_params = []
         if where_params is not None:
@@ -428,6 +629,88 @@ class QueryWriter:
 
         return query, final_params
 
+    @staticmethod
+    @lru_cache(maxsize=TEMPLATE_CACHE_SIZE)
+    def _compile_update(table, fields, where_str):
+        """ Update query. see write_update_query() """
+        return "UPDATE " + table + " SET " + ", ".join([f + " = %s" for f in fields]) + " " + where_str + ";"
+
+    def write_bulk_update_queries(self, set_params=(), keys=(), objects=(), key_field="id", chunk_size=1000):
+        """ Compile update queries that each update up to chunk_size rows, with different values per row, by key
+
+        Each query has the form "UPDATE table SET f1 = CASE key WHEN %s THEN %s ... END, f2 = CASE key ... END WHERE
+        key IN (%s, ...)", so many (key, values) pairs are applied in one statement instead of one statement per row.
+        self.wheres is not used. Enum values have .value applied and datetime.date values are converted as in
+        write_update_query()
+
+        Args:
+            set_params (list[list]): set values of each row in self.fields order. Ignored if objects is not empty.
+                Default ()
+            keys (list): key of each row, in set_params order. Ignored if objects is not empty. Default ()
+            objects (list[object]): Default (). If not empty, set_params and keys come from each object's instance
+                variables named in self.fields and key_field
+            key_field (str): field that identifies rows, usually the primary key. Default "id"
+            chunk_size (int): max number of rows updated by each query. Default 1000
+
+        Returns:
+            list[tuple[str, list]]: (query, params) for each chunk. empty list if there are no rows
+
+        Raises:
+            AttributeError: if length of objects > 0 and key_field or a field in self.fields is not found as an
+                instance variable in any object in objects
+            ValueError: if self.fields is not a list, or set_params and keys are not valid
+
+        Example:
+            self.table = "securities", self.fields = ["field1"], key_field = "id"
+            set_params = [["val11"], ["val21"]], keys = [1, 2]
+
+            query = "UPDATE securities SET field1 = CASE id WHEN %s THEN %s WHEN %s THEN %s ELSE field1 END
+                WHERE id IN (%s, %s);"
+            params = [1, "val11", 2, "val21", 1, 2]
+        """
+        if self.fields in [None, [], ()] or isinstance(self.fields, str):
+            raise ValueError("fields must be a list of str field names in table " + self.table)
+
+        if len(objects) > 0:
+            set_params = [[getattr(obj, f) for f in self.fields] for obj in objects]
+            keys = [getattr(obj, key_field) for obj in objects]
+
+        if len(set_params) != len(keys):
+            raise ValueError("Number of sub lists in set_params must equal number of keys")
+        if any([len(lst) != len(self.fields) for lst in set_params]):
+            raise ValueError("Number of parameters in all set_params sub lists must be " + str(len(self.fields)))
+
+        def convert(x):
+            if isinstance(x, Enum):
+                return x.value
+            if self.date_to_int_date and isinstance(x, datetime.date):
+                return int(x.strftime("%Y%m%d"))
+            return x
+
+        query_params_list = []
+        for i in range(0, len(keys), chunk_size):
+            chunk_keys = [convert(k) for k in keys[i:i + chunk_size]]
+            chunk_params = set_params[i:i + chunk_size]
+            query = self._compile_bulk_update(self.table, _freeze(self.fields), key_field, len(chunk_keys))
+
+            params = []
+            for j in range(len(self.fields)):
+                for k, lst in zip(chunk_keys, chunk_params):
+                    params += [k, convert(lst[j])]
+            query_params_list.append((query, params + chunk_keys))
+
+        return query_params_list
+
+    @staticmethod
+    @lru_cache(maxsize=TEMPLATE_CACHE_SIZE)
+    def _compile_bulk_update(table, fields, key_field, rows):
+        """ CASE update query of rows rows. see write_bulk_update_queries() """
+        when_str = "WHEN %s THEN %s " * rows
+        set_str = ", ".join([f + " = CASE " + key_field + " " + when_str + "ELSE " + f + " END" for f in fields])
+
+        return "UPDATE " + table + " SET " + set_str + " WHERE " + key_field + " IN (" + ", ".join(["%s"] * rows) + \
+            ");"
+
     def write_insert_or_update_query(self):
         """ Compile 'insert into ... on duplicate key update ...' query
 
@@ -463,10 +746,63 @@ class QueryWriter:
         if allow_delete_all is None:
             allow_delete_all = False
 
-        where_str, params = self.where_clause()
+        where_str, params = self.where_clause(expand_in_lists=True)
         if where_str == "" and not allow_delete_all:
             return "", None
 
         query = "DELETE FROM " + self.table + " " + where_str + ";"
 
-        return query, params
\ No newline at end of file
+        return query, params
+
+    def write_in_list_table_queries(self, chunk_size=1000):
+        """ Compile the queries that load self.in_list_tables into session temporary tables
+
+        Call after the query that uses the tables is written (e.g. write_read_query()). Each table is dropped if it
+        exists, created with the type of its column in self.table (column v) and filled with multi-row inserts. Tables
+        are not dropped after use, since rows may still be streamed from the query that reads them. They last until
+        the next load or the end of the session.
+
+        Args:
+            chunk_size (int): max number of vals inserted by each insert query. Default 1000
+
+        Returns:
+            list[tuple[str, Union[tuple, list]]]: (query, params) for each query, in order. empty list if
+                self.in_list_tables is empty
+        """
+        query_params_list = []
+        for in_table, col, vals in self.in_list_tables:
+            query_params_list.append(("DROP TEMPORARY TABLE IF EXISTS " + in_table + ";", ()))
+            query_params_list.append(("CREATE TEMPORARY TABLE " + in_table + " AS SELECT " + col + " AS v FROM " +
+                                      self.table + " LIMIT 0;", ()))
+            query_params_list += QueryWriter(in_table, fields=["v"]).write_bulk_insert_queries(
+                [[v] for v in vals], chunk_size=chunk_size)
+
+        return query_params_list
+
+    @classmethod
+    def template_stats(cls):
+        """ Statement template cache counters
+
+        Returns:
+            dict[str, dict[str, int]]: template ("select", "where", "order_by", "read", "insert", "bulk_insert",
+                "update", "bulk_update"): dict with keys "hits", "misses" and "size" (templates cached)
+        """
+        stats = {}
+        for name, func in cls._template_funcs().items():
+            info = func.cache_info()
+            stats[name] = {"hits": info.hits, "misses": info.misses, "size": info.currsize}
+
+        return stats
+
+    @classmethod
+    def template_cache_clear(cls):
+        """ Clear all statement template caches and their counters """
+        for func in cls._template_funcs().values():
+            func.cache_clear()
+
+    @classmethod
+    def _template_funcs(cls):
+        """ Template name: lru_cache function. see template_stats() """
+        return {"select": cls._compile_select, "where": cls._compile_where, "order_by": cls._compile_order_by,
+                "read": cls._compile_read, "insert": cls._compile_insert, "bulk_insert": cls._compile_bulk_insert,
+                "update": cls._compile_update, "bulk_update": cls._compile_bulk_update}
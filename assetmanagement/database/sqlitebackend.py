@@ -0,0 +1,516 @@
+"""
+SQLite stand-in for the MySQL database
+
+Set DB_BACKEND=sqlite in .env to have MySQLBase (and so MySQLAM and every service model) use a local SQLite database
+instead of connecting to MySQL. SQLITE_PATH is the database file, or ":memory:" (default) for a database that only
+lives as long as the process (a temporary file removed at exit). An empty database gets the schema in
+resource/sql_am_create.sql, translated to SQLite.
+
+The connection and cursor classes here mimic the parts of mysql.connector that MySQLBase uses, translate the MySQL
+statements written by QueryWriter (parameter markers, INSERT IGNORE, ON DUPLICATE KEY UPDATE, EXPLAIN, DROP TEMPORARY
+TABLE) and raise sqlite3 errors as mysql.connector errors, so MySQLBase error handling works unchanged.
+"""
+from decimal import Decimal
+import atexit
+import datetime
+import os
+import pathlib
+import re
+import sqlite3
+import tempfile
+import threading
+
+from mysql.connector.constants import FieldType
+import mysql.connector
+import numpy as np
+
+SCHEMA_PATH = pathlib.Path(__file__).parent.parent.parent / "resource" / "sql_am_create.sql"
+
+# DECIMAL, DATE and DATETIME columns are read back as the same Python types mysql.connector returns. decimal(p,s) is
+# declared as DECIMAL_s (see translate_schema()) so values come back with s decimal places as they do from MySQL
+sqlite3.register_converter("DECIMAL", lambda b: Decimal(b.decode()))
+for _scale in range(31):
+    sqlite3.register_converter("DECIMAL_" + str(_scale),
+                               lambda b, q=Decimal(1).scaleb(-_scale): Decimal(b.decode()).quantize(q))
+sqlite3.register_converter("DATE", lambda b: datetime.date.fromisoformat(b.decode()))
+sqlite3.register_converter("DATETIME", lambda b: datetime.datetime.fromisoformat(b.decode()))
+sqlite3.register_converter("TIMESTAMP", lambda b: datetime.datetime.fromisoformat(b.decode()))
+
+_NAMED_PARAM_RE = re.compile(r"%\((\w+)\)s")
+_INSERT_IGNORE_RE = re.compile(r"^\s*INSERT\s+IGNORE\b", re.IGNORECASE)
+_ON_DUPLICATE_RE = re.compile(r"\bON\s+DUPLICATE\s+KEY\s+UPDATE\b", re.IGNORECASE)
+_VALUES_FUNC_RE = re.compile(r"\bVALUES\s*\(\s*`?(\w+)`?\s*\)", re.IGNORECASE)
+_EXPLAIN_RE = re.compile(r"^\s*EXPLAIN\s+(?!QUERY\s+PLAN\b)", re.IGNORECASE)
+_DROP_TEMPORARY_RE = re.compile(r"^\s*DROP\s+TEMPORARY\s+TABLE\b", re.IGNORECASE)
+_UNSUPPORTED_RE = re.compile(r"^\s*(?:LOAD\s+DATA|SHOW|CREATE\s+TEMPORARY\s+TABLE\s+\w+\s+LIKE)\b", re.IGNORECASE)
+
+
+def translate_schema(script):
+    """ Translate the create table statements of a MySQL schema script to SQLite
+
+    Comments and all statements other than create table are dropped. Integer auto_increment primary keys become
+    INTEGER PRIMARY KEY AUTOINCREMENT, named unique keys become unnamed UNIQUE constraints, enums become TEXT,
+    decimal(p,s) becomes DECIMAL_s, unsigned is dropped and double quoted strings become single quoted. Other MySQL
+    types are kept as declared types, which SQLite maps to its own type affinities.
+
+    Args:
+        script (str): MySQL schema script (e.g. resource/sql_am_create.sql)
+
+    Returns:
+        str: SQLite script of create table statements
+    """
+    script = re.sub(r"#[^\n]*", "", script)
+
+    stmt_list = []
+    for stmt in script.split(";"):
+        stmt = stmt.strip()
+        if not re.match(r"create\s+table\b", stmt, re.IGNORECASE):
+            continue
+        stmt = re.sub(r"\b(?:tiny|small|medium|big)?int\s+not\s+null\s+auto_increment\s+primary\s+key\b",
+                      "INTEGER PRIMARY KEY AUTOINCREMENT", stmt, flags=re.IGNORECASE)
+        stmt = re.sub(r"\bunique\s+key\s+\w+\s*\(", "UNIQUE (", stmt, flags=re.IGNORECASE)
+        stmt = re.sub(r"\benum\s*\([^)]*\)", "TEXT", stmt, flags=re.IGNORECASE)
+        stmt = re.sub(r"\bdecimal\s*\(\s*\d+\s*,\s*(\d+)\s*\)", r"DECIMAL_\1", stmt, flags=re.IGNORECASE)
+        stmt = re.sub(r"\s+unsigned\b", "", stmt, flags=re.IGNORECASE)
+        stmt = re.sub(r"\"([^\"]*)\"", r"'\1'", stmt)
+        stmt_list.append(stmt + ";")
+
+    return "\n\n".join(stmt_list)
+
+
+def translate_query(query, has_params):
+    """ Translate a MySQL statement written by QueryWriter (or by hand in the same style) to SQLite
+
+    Args:
+        query (str): MySQL statement
+        has_params (boolean): True if the statement is executed with parameters. mysql.connector only substitutes
+            %s, %(name)s and %% when there are parameters
+
+    Returns:
+        str: SQLite statement
+
+    Raises:
+        mysql.connector.NotSupportedError: for MySQL only statements (LOAD DATA, SHOW, CREATE TEMPORARY TABLE ... LIKE)
+    """
+    if _UNSUPPORTED_RE.match(query):
+        raise mysql.connector.NotSupportedError(msg="Statement not supported by SQLite backend: " + query[:50])
+
+    if has_params:
+        query = _NAMED_PARAM_RE.sub(r":\1", query).replace("%s", "?").replace("%%", "%")
+    query = _INSERT_IGNORE_RE.sub("INSERT OR IGNORE", query)
+    query = _EXPLAIN_RE.sub("EXPLAIN QUERY PLAN ", query)
+    query = _DROP_TEMPORARY_RE.sub("DROP TABLE", query)
+
+    match = _ON_DUPLICATE_RE.search(query)
+    if match is not None:
+        query = query[:match.start()] + "ON CONFLICT DO UPDATE SET" + \
+            _VALUES_FUNC_RE.sub(r"excluded.\1", query[match.end():])
+
+    return query
+
+
+def _sqlite_value(value):
+    """ Convert a query parameter to a type sqlite3 stores the way MySQL would compare and return it
+
+    Args:
+        value: query parameter
+
+    Returns:
+        value as int, float, str, bytes or None
+    """
+    if isinstance(value, (bool, np.bool_)):
+        return int(value)
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, datetime.datetime):
+        return value.isoformat(" ")
+    if isinstance(value, datetime.date):
+        return value.isoformat()
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+def _sqlite_params(params):
+    """ Apply _sqlite_value() to each parameter in params
+
+    Args:
+        params (Optional[Union[tuple, list, dict]]): query parameters
+
+    Returns:
+        Union[tuple, dict]: converted parameters. empty tuple if params is None
+    """
+    if params is None:
+        return ()
+    if isinstance(params, dict):
+        return {k: _sqlite_value(v) for k, v in params.items()}
+    return tuple([_sqlite_value(v) for v in params])
+
+
+def _field_type(value):
+    """ mysql.connector FieldType for a value read from SQLite. Used for cursor descriptions
+
+    Args:
+        value: value read from SQLite
+
+    Returns:
+        int: FieldType constant. VAR_STRING for str, None and anything else
+    """
+    if isinstance(value, int):
+        return FieldType.LONGLONG
+    if isinstance(value, float):
+        return FieldType.DOUBLE
+    if isinstance(value, Decimal):
+        return FieldType.NEWDECIMAL
+    if isinstance(value, datetime.datetime):
+        return FieldType.DATETIME
+    if isinstance(value, datetime.date):
+        return FieldType.DATE
+    if isinstance(value, bytes):
+        return FieldType.BLOB
+    return FieldType.VAR_STRING
+
+
+def _mysql_error(err):
+    """ Wrap a sqlite3 error as the closest mysql.connector error
+
+    Args:
+        err (sqlite3.Error):
+
+    Returns:
+        mysql.connector.Error: with err message
+    """
+    if isinstance(err, sqlite3.IntegrityError):
+        return mysql.connector.IntegrityError(msg=str(err))
+    if isinstance(err, sqlite3.NotSupportedError):
+        return mysql.connector.NotSupportedError(msg=str(err))
+    if isinstance(err, (sqlite3.OperationalError, sqlite3.ProgrammingError)):
+        return mysql.connector.ProgrammingError(msg=str(err))
+    return mysql.connector.DatabaseError(msg=str(err))
+
+
+class SQLiteCursor:
+    """ mysql.connector like cursor over a sqlite3 cursor
+
+    description reports mysql.connector FieldType codes taken from the values of the first row, since SQLite has no
+    column types of its own. A column that is NULL in the first row is reported as VAR_STRING.
+
+    Attributes:
+        dictionary (boolean): True to return rows as dicts, False as tuples
+    """
+    def __init__(self, sqlite_cnx, dictionary=False):
+        """ init SQLiteCursor
+
+        Args:
+            sqlite_cnx (sqlite3.Connection):
+            dictionary (boolean): see class docstring
+        """
+        self.dictionary = dictionary
+        self._cursor = sqlite_cnx.cursor()
+        # rows fetched to build self.description that have not been returned yet. None if not fetched
+        self._peeked = None
+
+    def execute(self, query, params=None):
+        """ Translate and execute query. see translate_query()
+
+        Raises:
+            mysql.connector.Error: if translate or execute fails
+        """
+        self._peeked = None
+        try:
+            self._cursor.execute(translate_query(query, params is not None), _sqlite_params(params))
+        except sqlite3.Error as err:
+            raise _mysql_error(err) from err
+
+    def executemany(self, query, params_list):
+        """ Translate query once and execute it for each element of params_list
+
+        Raises:
+            mysql.connector.Error: if translate or execute fails
+        """
+        self._peeked = None
+        try:
+            self._cursor.executemany(translate_query(query, True), [_sqlite_params(p) for p in params_list])
+        except sqlite3.Error as err:
+            raise _mysql_error(err) from err
+
+    @property
+    def description(self):
+        if self._cursor.description is None:
+            return None
+        if self._peeked is None:
+            self._peeked = self._cursor.fetchmany(1)
+        first_row = self._peeked[0] if len(self._peeked) > 0 else [None] * len(self._cursor.description)
+
+        return [(d[0], _field_type(v), None, None, None, None, 1, 0, 0)
+                for d, v in zip(self._cursor.description, first_row)]
+
+    @property
+    def column_names(self):
+        return () if self._cursor.description is None else tuple([d[0] for d in self._cursor.description])
+
+    @property
+    def rowcount(self):
+        return self._cursor.rowcount
+
+    @property
+    def lastrowid(self):
+        return self._cursor.lastrowid
+
+    def _rows(self, rows):
+        """ Prepend peeked rows to rows and convert to dicts if self.dictionary """
+        if self._peeked:
+            rows = self._peeked + rows
+        self._peeked = []
+        if self.dictionary:
+            columns = self.column_names
+            return [dict(zip(columns, row)) for row in rows]
+        return rows
+
+    def fetchone(self):
+        rows = self.fetchmany(size=1)
+        return rows[0] if len(rows) > 0 else None
+
+    def fetchmany(self, size=1):
+        peeked = 0 if self._peeked is None else len(self._peeked)
+        return self._rows(self._cursor.fetchmany(size - peeked) if size > peeked else [])
+
+    def fetchall(self):
+        return self._rows(self._cursor.fetchall())
+
+    def close(self):
+        self._cursor.close()
+
+
+class SQLiteConnection:
+    """ mysql.connector like connection over a sqlite3 connection
+
+    Attributes:
+        sqlite (sqlite3.Connection): the wrapped connection
+    """
+    def __init__(self, path, timeout=30.0):
+        """ init SQLiteConnection. Foreign keys are enforced as they are in MySQL (InnoDB)
+
+        The connection may be used by any thread, but only by one at a time (see SQLitePool)
+
+        Args:
+            path (str): database file
+            timeout (float): seconds to wait for another connection's write transaction to finish. Default 30.0
+        """
+        self.sqlite = sqlite3.connect(path, timeout=timeout, detect_types=sqlite3.PARSE_DECLTYPES,
+                                      check_same_thread=False)
+        self.sqlite.execute("PRAGMA foreign_keys = ON;")
+        self._closed = False
+
+    def cursor(self, dictionary=False, buffered=None):
+        """ Create a cursor. buffered is accepted for compatibility. SQLite cursors always read rows as fetched
+
+        Returns:
+            SQLiteCursor:
+        """
+        return SQLiteCursor(self.sqlite, dictionary=dictionary)
+
+    def commit(self):
+        try:
+            self.sqlite.commit()
+        except sqlite3.Error as err:
+            raise _mysql_error(err) from err
+
+    def rollback(self):
+        try:
+            self.sqlite.rollback()
+        except sqlite3.Error as err:
+            raise _mysql_error(err) from err
+
+    @property
+    def in_transaction(self):
+        return self.sqlite.in_transaction
+
+    def is_connected(self):
+        return not self._closed
+
+    def ping(self, reconnect=False, attempts=1, delay=0):
+        if self._closed:
+            raise mysql.connector.InterfaceError(msg="SQLite connection is closed")
+
+    def consume_results(self):
+        """ Nothing to consume. Unread SQLite rows don't block the connection """
+        pass
+
+    def close(self):
+        self._closed = True
+        self.sqlite.close()
+
+
+class SQLitePool:
+    """ Process wide SQLite pool with the ConnectionPool interface used by MySQLBase
+
+    Each checkout gets its own connection (reused after checkin), so every MySQLBase instance (or UnitOfWork) has its
+    own transaction as it does with MySQL: one instance's commit() or rollback() never commits or discards another
+    instance's statements, whichever thread they run on. The database is in WAL mode, so reads are not blocked by
+    another connection's open write transaction and see only committed data. A write waits up to timeout seconds for
+    another connection's write transaction to finish.
+
+    A ":memory:" path uses a temporary database file, since separate connections can't share a private in-memory
+    database. The file is removed by close_all_pools() or at exit. The schema in SCHEMA_PATH is loaded if the database
+    has no tables.
+
+    Attributes:
+        path (str): database file or ":memory:"
+        file_path (str): database file connections are opened on. a temporary file if path is ":memory:"
+        timeout (float): seconds a write waits for another connection's write transaction
+        ping_interval (float): infinite. connections are never pinged
+        max_params (int): max number of parameters in one statement. MySQLBase.bulk_insert() sizes chunks to fit
+        stmt_cache_size (int): 0. MySQLBase does not prepare statements itself. sqlite3 caches compiled statements per
+            connection
+        multi_statements (boolean): False. sqlite3 executes one statement at a time, so MySQLBase does not pipeline
+            statements. there are no round trips to save
+    """
+    _pools = {}
+    _pools_lock = threading.Lock()
+
+    ping_interval = float("inf")
+    max_params = 32766
+    stmt_cache_size = 0
+    multi_statements = False
+
+    def __init__(self, path, timeout=30.0):
+        """ init SQLitePool. Use SQLitePool.get_pool() instead of calling this directly
+
+        Args:
+            path (str): see class docstring
+            timeout (float): see class docstring. Default 30.0
+        """
+        self.path = path
+        self.timeout = timeout
+        self._temporary = path == ":memory:"
+        if self._temporary:
+            fd, self.file_path = tempfile.mkstemp(prefix="am_sqlite_", suffix=".db")
+            os.close(fd)
+        else:
+            self.file_path = path
+        self._lock = threading.Lock()
+        self._idle = []
+        self._open = set()
+        self._stats = {"checkouts": 0, "checkins": 0, "discards": 0, "creates": 0}
+
+        cnx = self._connect()
+        cnx.sqlite.execute("PRAGMA journal_mode = WAL;")
+        if cnx.sqlite.execute("SELECT count(*) FROM sqlite_master WHERE type = 'table';").fetchone()[0] == 0:
+            cnx.sqlite.executescript(translate_schema(SCHEMA_PATH.read_text()))
+        self._idle.append(cnx)
+
+    @classmethod
+    def get_pool(cls, path):
+        """ Get the process wide pool for path. Create the pool (and load the schema if needed) if it doesn't exist
+
+        Args:
+            path (str): database file or ":memory:"
+
+        Returns:
+            SQLitePool: pool for path
+        """
+        with cls._pools_lock:
+            pool = cls._pools.get(path, None)
+            if pool is None:
+                pool = SQLitePool(path)
+                cls._pools[path] = pool
+
+        return pool
+
+    @classmethod
+    def close_all_pools(cls):
+        """ Close all connections of all pools and forget the pools. ":memory:" databases are lost """
+        with cls._pools_lock:
+            pools = list(cls._pools.values())
+            cls._pools.clear()
+
+        for pool in pools:
+            pool.close()
+
+    def _connect(self):
+        """ Open a new connection on self.file_path
+
+        Returns:
+            SQLiteConnection:
+        """
+        cnx = SQLiteConnection(self.file_path, timeout=self.timeout)
+        with self._lock:
+            self._open.add(cnx)
+            self._stats["creates"] += 1
+
+        return cnx
+
+    def checkout(self):
+        """ Get an idle connection or open a new one. The connection is only used by the caller until checkin()
+
+        Returns:
+            SQLiteConnection:
+        """
+        with self._lock:
+            self._stats["checkouts"] += 1
+            cnx = self._idle.pop() if len(self._idle) > 0 else None
+
+        return self._connect() if cnx is None else cnx
+
+    def checkin(self, cnx):
+        """ Return a connection to the pool. Any open transaction is rolled back """
+        with self._lock:
+            self._stats["checkins"] += 1
+        try:
+            if cnx.in_transaction:
+                cnx.rollback()
+        except mysql.connector.Error:
+            self.discard(cnx)
+            return
+        with self._lock:
+            self._idle.append(cnx)
+
+    def discard(self, cnx):
+        """ Close a connection instead of returning it to the pool """
+        with self._lock:
+            self._stats["discards"] += 1
+            self._open.discard(cnx)
+        try:
+            cnx.close()
+        except sqlite3.Error:
+            pass
+
+    def close_idle(self):
+        """ Close all idle connections """
+        with self._lock:
+            idle = self._idle
+            self._idle = []
+            self._open.difference_update(idle)
+
+        for cnx in idle:
+            cnx.close()
+
+    def close(self):
+        """ Close all connections, including checked out ones, and remove the temporary file of a ":memory:" path """
+        with self._lock:
+            open_cnx = list(self._open)
+            self._open.clear()
+            self._idle = []
+
+        for cnx in open_cnx:
+            try:
+                cnx.close()
+            except sqlite3.Error:
+                pass
+        if self._temporary:
+            for suffix in ["", "-wal", "-shm"]:
+                pathlib.Path(self.file_path + suffix).unlink(missing_ok=True)
+
+    def stats(self):
+        """ Pool counters
+
+        Returns:
+            dict: keys "checkouts", "checkins", "discards" and "creates" counted since the pool was created, "path" and
+                "open" with the number of open connections
+        """
+        with self._lock:
+            return {**self._stats, "path": self.path, "open": len(self._open)}
+
+
+atexit.register(SQLitePool.close_all_pools)
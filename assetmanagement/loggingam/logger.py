@@ -15,23 +15,28 @@ class Logger:
         logger (logging.logger): logging.logger instance
     """
 
-    def __init__(self, logger_name):
+    def __init__(self, logger_name, log_file_name="Python_Log.log"):
         """Init logging facility
 
         Create a logger with TimedRotatingFileHandler that creates a new log file at midnight and a detailed output
-        format. This logger logs info, warning, error and critical levels, Output file is Python_Log.log in the
-        directory specified by DO_LOGGING_DIR in .env
+        format. This logger logs info, warning, error and critical levels, Output file is log_file_name in the
+        directory specified by DO_LOGGING_DIR in .env. The handler is only added the first time a logger name is used,
+        so creating many instances with the same name does not open the log file again or duplicate log lines
 
         Args:
             logger_name (str): name of the logger. used by %(name)s in formatter
+            log_file_name (str): log file name. Default "Python_Log.log"
         """
+        self.logger = logging.getLogger(logger_name)
+        if len(self.logger.handlers) > 0:
+            return
+
         formatter = logging.Formatter("%(asctime)s : %(levelname)s : %(name)s : %(funcName)s : line %(lineno)s : "
                                       "%(message)s")
 
-        log_file = str(pathlib.Path(__file__).parent.parent.parent / (os.getenv("DO_LOGGING_DIR") + "Python_Log.log"))
+        log_file = str(pathlib.Path(__file__).parent.parent.parent / (os.getenv("DO_LOGGING_DIR") + log_file_name))
         file_handler = TimedRotatingFileHandler(log_file, when="midnight")
         file_handler.setFormatter(formatter)
 
-        self.logger = logging.getLogger(logger_name)
         self.logger.addHandler(file_handler)
         self.logger.setLevel(logging.INFO)
\ No newline at end of file
@@ -61,6 +61,7 @@ class SEIDataTabMV:
                               self.ui.seiDataWeightUpdateButton)
 
     def sei_data_refresh_button_clicked(self):
+        self.db.catalog(refresh=True)
         guiutils.combobox_dict_refresh(self.ui.seiDataSTCombo, self.db.read_security_subtypes())
 
         self.sei_data_tab_clear()
@@ -73,6 +73,7 @@ class DataSelectionTabMV:
                               self.ui.statsDataSelIntAddButton, self.ui.statsDataSelCheckButton,
                               self.ui.statsDataSelApplyIntButton)
 
+        self.db.catalog(refresh=True)
         guiutils.combobox_dict_refresh(self.ui.statsDataSelTypeCombo, self.db.read_data_types())
         self.ui.statsDataSelBeginField.setDate(QtCore.QDate.currentDate())
         self.ui.statsDataSelEndField.setDate(QtCore.QDate.currentDate())
@@ -224,7 +225,7 @@ class DataSelectionTabMV:
              stats_data.column, stats_data.name_data_dict, None, stats_data.type_db_table_meta,
              stats_data.db_begin_date, stats_data.db_end_date])
         try:
-            stats_data.set_data_series(self.db.read_data_data_table(db_dict),
+            stats_data.set_data_series(self.db.read_data_data_table(db_dict, as_series=True),
                                        db_type=self.ui.statsDataSelColumnCombo.currentData().get("Type", None))
         except Exception as e:
             guiutils.show_error_msg("Add Data Error", str(e))
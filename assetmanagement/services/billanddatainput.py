@@ -1,6 +1,7 @@
 from typing import Union
 import datetime
 
+from .billbatchinput import BillBatchInput
 from .depreciation.model.depreciationmodel import DepreciationModel
 from .depreciation.view.depreciationviewbase import DepreciationViewBase
 from .electric.model.pseg import PSEG
@@ -16,6 +17,8 @@ from .simple.model.simpleservicemodel import SimpleServiceModel
 from .simple.view.simpleviewbase import SimpleViewBase
 from .view.complexserviceviewbase import ComplexServiceViewBase
 from .view.simpleserviceviewbase import SimpleServiceViewBase
+from assetmanagement.database.mysqlam import MySQLAM
+from assetmanagement.database.mysqlbase import UnitOfWork
 from assetmanagement.database.popo.complexservicebilldatabase import ComplexServiceBillDataBase
 from assetmanagement.database.popo.depreciationbilldata import DepreciationBillData
 from assetmanagement.database.popo.electricbilldata import ElectricBillData
@@ -32,6 +35,9 @@ from assetmanagement.util.consoleutil import print, input
 class BillAndDataInput:
     """ Input and Display bill data and other relevant data
 
+    Each bill input or create process runs in one UnitOfWork, so its inserts and updates are committed together once
+    the process completes, or all rolled back if it fails.
+
     Attributes:
         see init function docstring
     """
@@ -97,9 +103,10 @@ class BillAndDataInput:
             start_date, end_date, df = model.process_service_bill_dates(filename)
             opt = view.input_read_new_hourly_data_file_or_skip(start_date, end_date)
             if opt == "1":
-                hourly_filename = view.input_read_new_hourly_data_file(start_date, end_date)
-                df = model.process_sunpower_hourly_file(hourly_filename)
-                model.insert_sunpower_hourly_data_to_db(df)
+                hourly_filenames = view.input_read_new_hourly_data_files(start_date, end_date)
+                df = model.process_sunpower_hourly_files(hourly_filenames)
+                # files may overlap hours already in the table (e.g. a boundary day of the previous export)
+                model.insert_sunpower_hourly_data_to_db(df, ignore=True)
         elif isinstance(model, MS) and isinstance(view, MortgageViewBase):
             filename = view.input_read_new_bill()
         else:
@@ -233,6 +240,8 @@ class BillAndDataInput:
         """
         amb = self.process_or_load_actual_complex_bill(model, view)
 
+        # read the start month and end month utility data with one query
+        model.prefetch_monthly_data(amb.start_date, amb.end_date)
         ed_sm = self.input_or_load_utility_data(amb.real_estate, amb.service_provider, amb.start_date, model, view)
         ed_em = self.input_or_load_utility_data(amb.real_estate, amb.service_provider, amb.end_date, model, view)
 
@@ -248,6 +257,53 @@ class BillAndDataInput:
 
         model.clear_model()
 
+    def do_complex_history_process(self, model, view):
+        """ Run process to estimate every actual bill of a real estate that does not have an estimate bill yet
+
+        The utility data of every month from the first bill start to the last bill end is read with one query (see
+        ComplexServiceModelBase.prefetch_monthly_data()), missing utility data and estimation data are input, then all
+        estimates are calculated in one pass (see ComplexServiceModelBase.do_estimate_monthly_bills()) and inserted
+        with one insert
+
+        Args:
+            model (ComplexServiceModelBase):
+            view (ComplexServiceViewBase):
+        """
+        re_dict = model.read_all_real_estate()
+        re_id = view.input_select_real_estate(re_dict)
+        real_estate = re_dict[re_id]
+
+        bill_list = model.read_service_bills_from_db_by_resppdr(real_estate_list=[real_estate])
+        estimated = {(bill.service_provider.provider, bill.start_date, bill.end_date)
+                     for bill in bill_list if not bill.is_actual}
+        amb_list = sorted([bill for bill in bill_list if bill.is_actual
+                           and (bill.service_provider.provider, bill.start_date, bill.end_date) not in estimated],
+                          key=lambda bill: bill.start_date)
+        if len(amb_list) == 0:
+            print("\nEvery " + type(model).__name__ + " bill of " + str(real_estate.address.value)
+                  + " is already estimated")
+            model.clear_model()
+            return
+
+        model.prefetch_monthly_data(amb_list[0].start_date, max([amb.end_date for amb in amb_list]))
+        bill_pairs = []
+        for amb in amb_list:
+            self.input_or_load_utility_data(amb.real_estate, amb.service_provider, amb.start_date, model, view)
+            self.input_or_load_utility_data(amb.real_estate, amb.service_provider, amb.end_date, model, view)
+            if isinstance(model, PSEG):
+                emb = self.input_and_load_electric_estimation_data(amb.real_estate.address, amb.start_date,
+                                                                   amb.end_date)
+            else:
+                emb = self.input_and_load_natgas_estimation_data(amb.real_estate.address, amb.start_date, amb.end_date)
+            bill_pairs.append((amb, emb))
+
+        emb_list = model.do_estimate_monthly_bills(bill_pairs)
+        model.insert_service_bills_to_db(emb_list)
+        print("\n" + str(len(emb_list)) + " " + type(model).__name__ + " bill(s) of " + str(real_estate.address.value)
+              + " estimated")
+
+        model.clear_model()
+
     def do_paid_date_process(self):
         """ Run process to input paid date for any bills missing a paid date """
 
@@ -280,12 +336,13 @@ class BillAndDataInput:
                     else:  # opt == "6":
                         (model, view) = (self.dep_model, self.dep_view)
 
-                    unpaid_bill_list = model.read_all_service_bills_from_db_unpaid()
-                    if len(unpaid_bill_list) > 0:
-                        unpaid_bill_list = view.input_paid_dates(unpaid_bill_list)
-                        model.update_service_bills_in_db_paid_date_by_id(unpaid_bill_list)
-                    else:
-                        print("No unpaid bills")
+                    with UnitOfWork(MySQLAM()):
+                        unpaid_bill_list = model.read_all_service_bills_from_db_unpaid()
+                        if len(unpaid_bill_list) > 0:
+                            unpaid_bill_list = view.input_paid_dates(unpaid_bill_list)
+                            model.update_service_bills_in_db_paid_date_by_id(unpaid_bill_list)
+                        else:
+                            print("No unpaid bills")
                     model.clear_model()
                 elif opt == "0":
                     break
@@ -397,7 +454,8 @@ class BillAndDataInput:
                     bill_tax_related_cost_list = view.input_tax_related_cost(new_bill_list)
                     new_bill_list = model.set_default_tax_related_cost(bill_tax_related_cost_list)
 
-                    model.insert_service_bills_to_db(new_bill_list, ignore=True)
+                    with UnitOfWork(MySQLAM()):
+                        model.insert_service_bills_to_db(new_bill_list, ignore=True)
 
                     model.clear_model()
                 elif opt == "0":
@@ -407,6 +465,22 @@ class BillAndDataInput:
             except Exception as ex:
                 print(str(ex), fcolor="red")
 
+    def do_batch_bill_process(self):
+        """ Run process to input every electric, natural gas and mortgage pdf bill in the bill directories
+
+        Bills of each directory are processed concurrently and inserted in one transaction (see BillBatchInput). Tables
+        already extracted from the pdfs are used unless the pdfs are chosen to be read again (see PdfCache)
+        """
+        refresh = input("\nEnter '1' to read every pdf again or no value to use tables already read: ",
+                        fcolor="blue") == "1"
+        batch_input = BillBatchInput()
+        for model in [self.pseg_model, self.ng_model, self.mortgage_model]:
+            bill_list, errors = batch_input.input_bill_directory(model, refresh=refresh)
+            print("\n" + type(model).__name__ + ": " + str(len(bill_list)) + " bill(s) inserted or already in "
+                  + "database, " + str(len(errors)) + " file(s) failed")
+            for filename, ex in errors.items():
+                print(filename + ": " + str(ex), fcolor="red")
+
     def do_input_or_create_bill_process(self):
         """ Select and run bill or data input or create process through console """
 
@@ -420,6 +494,9 @@ class BillAndDataInput:
                     "\n6: Input Missing Paid Dates" \
                     "\n7: Create Depreciation Bill(s)" \
                     "\n8: Create Partial Bill(s)" \
+                    "\n9: Input All Electric, Natural Gas and Mortgage Bills in Bill Directories" \
+                    "\n10: Estimate All Unestimated Electric Bills of a Real Estate" \
+                    "\n11: Estimate All Unestimated Natural Gas Bills of a Real Estate" \
                     "\n0: Return to Previous Menu"
 
         while True:
@@ -428,21 +505,35 @@ class BillAndDataInput:
                 opt = input("\nSelection: ", fcolor="blue")
 
                 if opt == "1":
-                    self.do_simple_process(self.simple_model, self.simple_view)
+                    with UnitOfWork(MySQLAM()):
+                        self.do_simple_process(self.simple_model, self.simple_view)
                 elif opt == "2":
-                    self.do_simple_process(self.solar_model, self.solar_view)
+                    with UnitOfWork(MySQLAM()):
+                        self.do_simple_process(self.solar_model, self.solar_view)
                 elif opt == "3":
-                    self.do_complex_process(self.pseg_model, self.pseg_view)
+                    with UnitOfWork(MySQLAM()):
+                        self.do_complex_process(self.pseg_model, self.pseg_view)
                 elif opt == "4":
-                    self.do_complex_process(self.ng_model, self.ng_view)
+                    with UnitOfWork(MySQLAM()):
+                        self.do_complex_process(self.ng_model, self.ng_view)
                 elif opt == "5":
-                    self.do_simple_process(self.mortgage_model, self.mortgage_view)
+                    with UnitOfWork(MySQLAM()):
+                        self.do_simple_process(self.mortgage_model, self.mortgage_view)
                 elif opt == "6":
                     self.do_paid_date_process()
                 elif opt == "7":
-                    self.do_depreciation_bill_process()
+                    with UnitOfWork(MySQLAM()):
+                        self.do_depreciation_bill_process()
                 elif opt == "8":
                     self.do_partial_bill_process()
+                elif opt == "9":
+                    self.do_batch_bill_process()
+                elif opt == "10":
+                    with UnitOfWork(MySQLAM()):
+                        self.do_complex_history_process(self.pseg_model, self.pseg_view)
+                elif opt == "11":
+                    with UnitOfWork(MySQLAM()):
+                        self.do_complex_history_process(self.ng_model, self.ng_view)
                 elif opt == "0":
                     break
                 else:
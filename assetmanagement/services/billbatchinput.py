@@ -0,0 +1,148 @@
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+import os
+import pathlib
+import threading
+
+from .electric.model.pseg import PSEG
+from .mortgage.model.ms import MS
+from .natgas.model.ng import NG
+from assetmanagement.database.mysqlam import MySQLAM
+from assetmanagement.database.mysqlbase import UnitOfWork
+from assetmanagement.util.pdfcache import PdfCache
+
+
+class BillBatchInput:
+    """ Process every pdf bill of a bill directory and insert the bills in one transaction
+
+    process_service_bill() of PSEG, NG and MS reads a pdf with tabula. With tabula-py in subprocess mode, every read
+    starts a new JVM, which costs seconds per bill. With JPype installed, tabula-py runs one JVM in this process and
+    keeps it for the life of the process. The first bill of a directory is processed on its own so the JVM is started
+    exactly once, then the remaining bills are processed concurrently by BILL_BATCH_WORKERS (.env, default 4) threads
+    that share the running JVM. Each worker thread processes its bills with its own model instance, so the bill dicts
+    of the model are only changed by the calling thread.
+
+    Tables extracted from the pdfs are cached by PdfCache (if PDF_CACHE_DIR is set in .env), so re-processing a
+    directory only extracts new or changed pdfs.
+
+    Bills are processed outside of any unit of work and all bills processed without error are inserted with one
+    insert_service_bills_to_db() call in one UnitOfWork, so the directory is committed together or rolled back together.
+
+    Attributes:
+        workers (int): max number of threads that process bills concurrently
+    """
+    # model class to .env directory of its bill files
+    BILL_DIRS = {PSEG: "DI_PSEG_DIR", NG: "DI_NATIONALGRID_DIR", MS: "DI_MORGANSTANLEY_DIR"}
+
+    def __init__(self, workers=None):
+        """ init function
+
+        Args:
+            workers (Optional[int]): max number of threads. Default None for BILL_BATCH_WORKERS in .env, or 4
+        """
+        self.workers = int(os.getenv("BILL_BATCH_WORKERS", "4")) if workers is None else workers
+
+    @classmethod
+    def bill_dir(cls, model):
+        """ Bill directory of model
+
+        Args:
+            model (Union[PSEG, NG, MS]): model whose bill directory is returned
+
+        Returns:
+            pathlib.Path: directory
+
+        Raises:
+            KeyError: if model is not an instance of a class in BILL_DIRS
+        """
+        return pathlib.Path(__file__).parent.parent.parent / os.getenv(cls.BILL_DIRS[type(model)])
+
+    @classmethod
+    def bill_filenames(cls, model):
+        """ Names of the pdf files in the bill directory of model
+
+        Args:
+            model (Union[PSEG, NG, MS]): model whose bill directory is listed
+
+        Returns:
+            list[str]: file names sorted by name
+
+        Raises:
+            KeyError: if model is not an instance of a class in BILL_DIRS
+        """
+        return sorted(path.name for path in cls.bill_dir(model).iterdir()
+                      if path.is_file() and path.suffix.lower() == ".pdf")
+
+    def process_service_bills(self, model, filenames):
+        """ Process bill files concurrently with model.process_service_bill()
+
+        The first file is processed by model. The others are processed by one new instance of type(model) per worker
+        thread, and their bills are added to model.asb_dict once all files are processed
+
+        Args:
+            model (Union[PSEG, NG, MS]): model that processes the files. processed bills are added to model.asb_dict
+            filenames (list[str]): names of files in the bill directory of model
+
+        Returns:
+            tuple[list[Union[ElectricBillData, NatGasBillData, MortgageBillData]], dict]: bills processed without error
+                in the order of filenames and dict of file name to the exception raised processing that file
+        """
+        results = {}
+        worker_local = threading.local()
+
+        def process(filename, worker_model):
+            try:
+                results[filename] = worker_model.process_service_bill(filename)
+            except Exception as ex:
+                results[filename] = ex
+
+        def worker_process(filename):
+            if not hasattr(worker_local, "model"):
+                worker_local.model = type(model)()
+            process(filename, worker_local.model)
+
+        if len(filenames) > 0:
+            # start the JVM on this thread before the workers share it
+            process(filenames[0], model)
+            with ThreadPoolExecutor(max_workers=max(self.workers, 1)) as executor:
+                list(executor.map(worker_process, filenames[1:]))
+            model.asb_dict.insert_bills([results[fn] for fn in filenames[1:] if not isinstance(results[fn], Exception)])
+
+        bill_list = [results[fn] for fn in filenames if not isinstance(results[fn], Exception)]
+        errors = {fn: results[fn] for fn in filenames if isinstance(results[fn], Exception)}
+
+        return bill_list, errors
+
+    def input_bill_directory(self, model, filenames=None, refresh=False):
+        """ Process the bill files of the bill directory of model and insert the bills in one transaction
+
+        Bills get the default tax related cost (see SimpleServiceModelBase.set_default_tax_related_cost()). Bills that
+        already exist in the database are ignored. model.clear_model() is called after the insert
+
+        Args:
+            model (Union[PSEG, NG, MS]): model that processes and inserts the bills
+            filenames (Optional[list[str]]): names of files in the bill directory of model. Default None for all pdf
+                files in the directory (see bill_filenames())
+            refresh (boolean): True to remove the PdfCache entries of the files so their pdfs are read again. Default
+                False
+
+        Returns:
+            tuple[list[Union[ElectricBillData, NatGasBillData, MortgageBillData]], dict]: inserted bills and dict of
+                file name to the exception raised processing that file. see process_service_bills()
+
+        Raises:
+            MySQLException: if issue with database insert. no bill of the directory is inserted
+        """
+        filenames = self.bill_filenames(model) if filenames is None else filenames
+        if refresh:
+            for filename in filenames:
+                PdfCache.invalidate(self.bill_dir(model) / filename)
+        bill_list, errors = self.process_service_bills(model, filenames)
+
+        if len(bill_list) > 0:
+            bill_list = model.set_default_tax_related_cost([(bill, Decimal("NaN")) for bill in bill_list])
+            with UnitOfWork(MySQLAM()):
+                model.insert_service_bills_to_db(bill_list, ignore=True)
+        model.clear_model()
+
+        return bill_list, errors
@@ -184,20 +184,18 @@ class BillReport:
         real_estate = re_dict[re_id]
         year = self.simple_view.input_paid_year(pre_str="Create report for this year. ")
 
-        flds = ["tax_category", "provider", "paid_date", "start_date", "end_date", "total_cost", "tax_rel_cost",
-                "notes"]
-        bill_df = pd.DataFrame()
-        for model in [self.simple_model, self.mortgage_model, self.solar_model, self.pseg_model, self.ng_model,
-                      self.dep_model]:
-            df = model.read_service_bills_from_db_by_resppdr(
-                real_estate_list=[real_estate], paid_date_min=datetime.date(year, 1, 1),
-                paid_date_max=datetime.date(year, 12, 31), to_pd_df=True)
-            bill_df = pd.concat([bill_df, df[flds]], ignore_index=True)
-
-        bill_df = bill_df.rename(columns={col: col.replace("_", " ").title() for col in df.columns})
+        # all bill tables in one query
+        bill_df = self.simple_model.read_bills_union_from_db_by_resppdr(
+            ["simple_bill_data", "mortgage_bill_data", "solar_bill_data", "electric_bill_data", "natgas_bill_data",
+             "depreciation_bill_data"], real_estate_list=[real_estate], paid_date_min=datetime.date(year, 1, 1),
+            paid_date_max=datetime.date(year, 12, 31)).drop(columns=["bill_table"])
+
+        bill_df = bill_df.rename(columns={col: col.replace("_", " ").title() for col in bill_df.columns})
         bill_df = bill_df.astype({"Total Cost": "float64", "Tax Rel Cost": "float64"})
         for col in ["Tax Category", "Provider"]:
-            bill_df[col] = bill_df[col].map(lambda x: x.value)
+            bill_df[col] = bill_df[col].astype(str)
+        for col in ["Paid Date", "Start Date", "End Date"]:
+            bill_df[col] = pd.to_datetime(bill_df[col]).dt.date
 
         tct_df, mt_df, pt_df = self.total_sheet(bill_df)
         tc_df = self.tax_category_sheet(bill_df)
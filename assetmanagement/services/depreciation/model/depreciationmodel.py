@@ -184,14 +184,14 @@ class DepreciationModel(SimpleServiceModelBase):
         return bill_list
 
     def read_service_bills_from_db_by_resppdr(self, real_estate_list=(), service_provider_list=(), paid_date_min=None,
-                                              paid_date_max=None, to_pd_df=False):
+                                              paid_date_max=None, to_pd_df=False, fields=None):
         wheres = self.resppdr_wheres_clause(real_estate_list=real_estate_list,
                 service_provider_list=service_provider_list, paid_date_min=paid_date_min, paid_date_max=paid_date_max)
 
         with MySQLAM() as mam:
-            bill_list = mam.depreciation_bill_data_read(wheres=wheres, order_bys=["paid_date"])
+            bill_list = mam.depreciation_bill_data_read(wheres=wheres, order_bys=["paid_date"], fields=fields)
 
-        return self.bills_post_read(bill_list, to_pd_df=to_pd_df, rpv_prepend=True)
+        return self.bills_post_read(bill_list, to_pd_df=to_pd_df, fields=fields, rpv_prepend=True)
 
     def read_one_bill(self):
         with MySQLAM() as mam:
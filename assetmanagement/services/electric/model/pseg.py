@@ -4,7 +4,7 @@ import datetime
 import os
 import pathlib
 
-import tabula
+import numpy as np
 
 from ...model.complexservicemodelbase import ComplexServiceModelBase
 from assetmanagement.database.mysqlam import MySQLAM
@@ -12,6 +12,7 @@ from assetmanagement.database.popo.electricbilldata import ElectricBillData
 from assetmanagement.database.popo.electricdata import ElectricData
 from assetmanagement.database.popo.realestate import RealEstate, Address
 from assetmanagement.database.popo.serviceprovider import ServiceProvider, ServiceProviderEnum
+from assetmanagement.util.pdfcache import PdfCache
 
 
 class PSEG(ComplexServiceModelBase):
@@ -39,8 +40,8 @@ class PSEG(ComplexServiceModelBase):
         Returns:
             ElectricBillData: with all required fields populated and as many non required fields as available populated
         """
-        df_list = tabula.read_pdf(pathlib.Path(__file__).parent.parent.parent.parent.parent /
-                                  (os.getenv("DI_PSEG_DIR") + filename), pages="all", password="11720", guess=False)
+        df_list = PdfCache.read_pdf(pathlib.Path(__file__).parent.parent.parent.parent.parent /
+                                    (os.getenv("DI_PSEG_DIR") + filename), pages="all", password="11720", guess=False)
         bill_data = ElectricBillData.default_constructor()
         bill_data.eh_kwh = 0
         bill_data.bank_kwh = 0
@@ -219,14 +220,14 @@ class PSEG(ComplexServiceModelBase):
         return bill_list
 
     def read_service_bills_from_db_by_resppdr(self, real_estate_list=(), service_provider_list=(), paid_date_min=None,
-                                              paid_date_max=None, to_pd_df=False):
+                                              paid_date_max=None, to_pd_df=False, fields=None):
         wheres = self.resppdr_wheres_clause(real_estate_list=real_estate_list,
                 service_provider_list=service_provider_list, paid_date_min=paid_date_min, paid_date_max=paid_date_max)
 
         with MySQLAM() as mam:
-            bill_list = mam.electric_bill_data_read(wheres=wheres, order_bys=["paid_date"])
+            bill_list = mam.electric_bill_data_read(wheres=wheres, order_bys=["paid_date"], fields=fields)
 
-        return self.bills_post_read(bill_list, to_pd_df=to_pd_df)
+        return self.bills_post_read(bill_list, to_pd_df=to_pd_df, fields=fields)
 
     def read_one_bill(self):
         with MySQLAM() as mam:
@@ -258,26 +259,23 @@ class PSEG(ComplexServiceModelBase):
         """
         with MySQLAM() as mam:
             mam.electric_data_insert([electric_data])
+        self.invalidate_monthly_data_cache()
 
-    def read_monthly_data_from_db_by_month_year(self, month_year):
-        """ read pseg data from electric_data table by month and year
-
-        self.data_dict[month_year] is set with returned instance of ElectricData or None
+    def read_monthly_data_from_db_by_month_date_range(self, start_date, end_date):
+        """ read pseg data from electric_data table by month date range inclusive with one query
 
         Args:
-            month_year (str): month and year of data ("MMYYYY" format)
+            start_date (datetime.date): ElectricData with month date greater than or equal to this date
+            end_date (datetime.date): ElectricData with month date less than or equal to this date
 
         Returns:
-            Optional[ElectricData]: ElectricData or None if no month_year found
+            list[ElectricData]: empty if no ElectricData found in date range
 
         Raises:
             MySQLException: if issue with database read
         """
         with MySQLAM() as mam:
-            data_list = mam.electric_data_read(wheres=[["month_year", "=", month_year]])
-        self.data_dict[month_year] = None if len(data_list) == 0 else data_list[0]
-
-        return self.data_dict[month_year]
+            return mam.electric_data_read(wheres=[["month_date", ">=", start_date], ["month_date", "<=", end_date]])
 
     def read_all_estimate_notes_by_reid_provider(self, real_estate, provider):
         """ read estimate notes from estimate_notes table by real estate and PSEG provider
@@ -333,12 +331,23 @@ class PSEG(ComplexServiceModelBase):
         amb = amb[0]
 
         bill_data = ElectricBillData(amb.real_estate, amb.service_provider, amb.start_date, amb.end_date, None, 0, 0,
-                                     None, amb.bs_rate, amb.bs_cost, None, None, None, False)
+                                     None, None, amb.bs_rate, amb.bs_cost, None, None, False)
 
         self.esb_dict.insert_bills(bill_data)
 
         return bill_data
 
+    # estimate bill attributes read by the estimate steps, utility data attributes used in the estimate steps and
+    # estimate bill attributes set by the estimate steps. see do_estimate_monthly_bills()
+    _ESTIMATE_INPUTS = ["total_kwh", "eh_kwh", "bs_cost"]
+    _ESTIMATE_DATA = ["first_kwh", "first_rate", "next_rate", "mfc_rate", "psc_rate", "der_rate", "dsa_rate",
+                      "rda_rate", "rbp_rate", "nysa_rate", "spta_rate"]
+    _ESTIMATE_OUTPUTS = ["total_kwh", "first_kwh", "first_rate", "first_cost", "next_kwh", "next_rate", "next_cost",
+                         "mfc_rate", "mfc_cost", "dsc_total_cost", "psc_rate", "psc_cost", "psc_total_cost", "der_rate",
+                         "der_cost", "dsa_rate", "dsa_cost", "rda_rate", "rda_cost", "rbp_rate", "rbp_cost",
+                         "nysa_rate", "nysa_cost", "spta_rate", "spta_cost", "st_rate", "st_cost", "toc_total_cost",
+                         "total_cost"]
+
     def _do_estimate_total_kwh(self, emb):
         """ Estimate what total kwh usage would have been without solar
 
@@ -346,17 +355,17 @@ class PSEG(ComplexServiceModelBase):
         solar bank was available.
 
         Args:
-            emb (ElectricBillData): estimate electric bill data
+            emb (dict): estimate electric bill data arrays. see ComplexServiceModelBase.bill_arrays()
 
         Returns:
-            ElectricBillData: emb with total_kwh set appropriately
+            dict: emb with total_kwh set appropriately
         """
-        emb.total_kwh -= emb.eh_kwh
+        emb["total_kwh"] = emb["total_kwh"] - emb["eh_kwh"]
 
         return emb
 
     # noinspection PyTypeChecker
-    def _do_estimate_dsc(self, emb, ed_start, ed_end):
+    def _do_estimate_dsc(self, emb, ed_start, ed_end, s_rat, e_rat):
         """ Estimate delivery and system charges
 
         The bill can span over two months, so have to determine the ratio of the bill for each month. This function
@@ -364,102 +373,101 @@ class PSEG(ComplexServiceModelBase):
 
 
         Args:
-            emb (ElectricBillData): estimate electric bill data
-            ed_start (ElectricData): for the earlier month
-            ed_end (ElectricData): for the later month
+            emb (dict): estimate electric bill data arrays. see ComplexServiceModelBase.bill_arrays()
+            ed_start (dict): electric data arrays for the earlier month
+            ed_end (dict): electric data arrays for the later month
+            s_rat (np.ndarray): ratio of each bill in the earlier month. see ComplexServiceModelBase.month_ratios()
+            e_rat (np.ndarray): ratio of each bill in the later month
 
         Returns:
-            ElectricBillData: emb with delivery and system charges estimated
+            dict: emb with delivery and system charges estimated
         """
-        e_rat = Decimal(emb.end_date.day / ((emb.end_date - emb.start_date).days + 1))
-        s_rat = 1 - e_rat
-
-        emb.first_kwh = min(emb.total_kwh, int(ed_start.first_kwh * s_rat + ed_end.first_kwh * e_rat))
-        emb.first_rate = ed_start.first_rate * s_rat + ed_end.first_rate * e_rat
-        emb.first_cost = emb.first_kwh * emb.first_rate
-        emb.next_kwh = emb.total_kwh - emb.first_kwh
-        emb.next_rate = ed_start.next_rate * s_rat + ed_end.next_rate * e_rat
-        emb.next_cost = emb.next_kwh * emb.next_rate
-        emb.mfc_rate = ed_start.mfc_rate * s_rat + ed_end.mfc_rate * e_rat
-        emb.mfc_cost = emb.total_kwh * emb.mfc_rate
-        emb.dsc_total_cost = emb.bs_cost + emb.first_cost + emb.next_cost + emb.mfc_cost
+        emb["first_kwh"] = np.frompyfunc(min, 2, 1)(
+            emb["total_kwh"], np.frompyfunc(int, 1, 1)(ed_start["first_kwh"] * s_rat + ed_end["first_kwh"] * e_rat))
+        emb["first_rate"] = ed_start["first_rate"] * s_rat + ed_end["first_rate"] * e_rat
+        emb["first_cost"] = emb["first_kwh"] * emb["first_rate"]
+        emb["next_kwh"] = emb["total_kwh"] - emb["first_kwh"]
+        emb["next_rate"] = ed_start["next_rate"] * s_rat + ed_end["next_rate"] * e_rat
+        emb["next_cost"] = emb["next_kwh"] * emb["next_rate"]
+        emb["mfc_rate"] = ed_start["mfc_rate"] * s_rat + ed_end["mfc_rate"] * e_rat
+        emb["mfc_cost"] = emb["total_kwh"] * emb["mfc_rate"]
+        emb["dsc_total_cost"] = emb["bs_cost"] + emb["first_cost"] + emb["next_cost"] + emb["mfc_cost"]
 
         return emb
 
     # noinspection PyTypeChecker
-    def _do_estimate_psc(self, emb, ed_start, ed_end):
+    def _do_estimate_psc(self, emb, ed_start, ed_end, s_rat, e_rat):
         """ Estimate power supply charges
 
         The bill can span over two months, so have to determine the ratio of the bill for each month. This function
         uses days to calculate the ratio, but this is only estimate since the kwh usage in each day varies.
 
         Args:
-            emb (ElectricBillData): estimate electric bill data
-            ed_start (ElectricData): for the earlier month
-            ed_end (ElectricData): for the later month
+            emb (dict): estimate electric bill data arrays. see ComplexServiceModelBase.bill_arrays()
+            ed_start (dict): electric data arrays for the earlier month
+            ed_end (dict): electric data arrays for the later month
+            s_rat (np.ndarray): ratio of each bill in the earlier month. see ComplexServiceModelBase.month_ratios()
+            e_rat (np.ndarray): ratio of each bill in the later month
 
         Returns:
-            ElectricBillData: emb with power supply charges estimated
+            dict: emb with power supply charges estimated
         """
-        e_rat = Decimal(emb.end_date.day / ((emb.end_date - emb.start_date).days + 1))
-        s_rat = 1 - e_rat
-
-        emb.psc_rate = ed_start.psc_rate * s_rat + ed_end.psc_rate * e_rat
-        emb.psc_cost = emb.total_kwh * emb.psc_rate
-        emb.psc_total_cost = emb.psc_cost
+        emb["psc_rate"] = ed_start["psc_rate"] * s_rat + ed_end["psc_rate"] * e_rat
+        emb["psc_cost"] = emb["total_kwh"] * emb["psc_rate"]
+        emb["psc_total_cost"] = emb["psc_cost"]
 
         return emb
 
     # noinspection PyTypeChecker
-    def _do_estimate_toc(self, emb, ed_start, ed_end, amb):
+    def _do_estimate_toc(self, emb, ed_start, ed_end, s_rat, e_rat, amb):
         """ Estimate taxes and other charges
 
         The bill can span over two months, so have to determine the ratio of the bill for each month. This function
         uses days to calculate the ratio, but this is only estimate since the kwh usage in each day varies.
 
         Args:
-            emb (ElectricBillData): estimate electric bill data
-            ed_start (ElectricData): for the earlier month
-            ed_end (ElectricData): for the later month
-            amb (ElectricBillData): actual electric bill data
+            emb (dict): estimate electric bill data arrays. see ComplexServiceModelBase.bill_arrays()
+            ed_start (dict): electric data arrays for the earlier month
+            ed_end (dict): electric data arrays for the later month
+            s_rat (np.ndarray): ratio of each bill in the earlier month. see ComplexServiceModelBase.month_ratios()
+            e_rat (np.ndarray): ratio of each bill in the later month
+            amb (dict): actual electric bill data arrays with st_rate
 
         Returns:
-            ElectricBillData: emb with taxes and other charges estimated
+            dict: emb with taxes and other charges estimated
         """
-        e_rat = Decimal(emb.end_date.day / ((emb.end_date - emb.start_date).days + 1))
-        s_rat = 1 - e_rat
-
         # cost dependent on total kwh
-        emb.der_rate = ed_start.der_rate * s_rat + ed_end.der_rate * e_rat
-        emb.der_cost = emb.total_kwh * emb.der_rate
+        emb["der_rate"] = ed_start["der_rate"] * s_rat + ed_end["der_rate"] * e_rat
+        emb["der_cost"] = emb["total_kwh"] * emb["der_rate"]
 
         # cost dependent on delivery and system charges
-        emb.dsa_rate = ed_start.dsa_rate * s_rat + ed_end.dsa_rate * e_rat
-        emb.dsa_cost = emb.dsc_total_cost * emb.dsa_rate
-        emb.rda_rate = ed_start.rda_rate * s_rat + ed_end.rda_rate * e_rat
-        emb.rda_cost = emb.dsc_total_cost * emb.rda_rate
-        emb.rbp_rate = ed_start.rbp_rate * s_rat + ed_end.rbp_rate * e_rat
-        emb.rbp_cost = emb.dsc_total_cost * emb.rbp_rate
+        emb["dsa_rate"] = ed_start["dsa_rate"] * s_rat + ed_end["dsa_rate"] * e_rat
+        emb["dsa_cost"] = emb["dsc_total_cost"] * emb["dsa_rate"]
+        emb["rda_rate"] = ed_start["rda_rate"] * s_rat + ed_end["rda_rate"] * e_rat
+        emb["rda_cost"] = emb["dsc_total_cost"] * emb["rda_rate"]
+        emb["rbp_rate"] = ed_start["rbp_rate"] * s_rat + ed_end["rbp_rate"] * e_rat
+        emb["rbp_cost"] = emb["dsc_total_cost"] * emb["rbp_rate"]
 
         # cost dependent on subtotal up to this point minus rbp_cost
-        subtotal = (emb.dsc_total_cost + emb.psc_total_cost + emb.der_cost + emb.dsa_cost + emb.rda_cost)
-        emb.nysa_rate = ed_start.nysa_rate * s_rat + ed_end.nysa_rate * e_rat
-        emb.nysa_cost = subtotal * emb.nysa_rate
+        subtotal = (emb["dsc_total_cost"] + emb["psc_total_cost"] + emb["der_cost"] + emb["dsa_cost"]
+                    + emb["rda_cost"])
+        emb["nysa_rate"] = ed_start["nysa_rate"] * s_rat + ed_end["nysa_rate"] * e_rat
+        emb["nysa_cost"] = subtotal * emb["nysa_rate"]
 
         # cost dependent on subtotal up to this point minus rbp_cost
-        subtotal = (emb.dsc_total_cost + emb.psc_total_cost + emb.der_cost + emb.dsa_cost + emb.rda_cost
-                    + emb.nysa_cost)
-        emb.spta_rate = ed_start.spta_rate * s_rat + ed_end.spta_rate * e_rat
-        emb.spta_cost = subtotal * emb.spta_rate
+        subtotal = (emb["dsc_total_cost"] + emb["psc_total_cost"] + emb["der_cost"] + emb["dsa_cost"]
+                    + emb["rda_cost"] + emb["nysa_cost"])
+        emb["spta_rate"] = ed_start["spta_rate"] * s_rat + ed_end["spta_rate"] * e_rat
+        emb["spta_cost"] = subtotal * emb["spta_rate"]
 
         # cost dependent on subtotal up to this point
-        subtotal = (emb.dsc_total_cost + emb.psc_total_cost + emb.der_cost + emb.dsa_cost + emb.rda_cost + emb.nysa_cost
-                    + emb.rbp_cost + emb.spta_cost)
-        emb.st_rate = amb.st_rate
-        emb.st_cost = emb.st_rate * subtotal
+        subtotal = (emb["dsc_total_cost"] + emb["psc_total_cost"] + emb["der_cost"] + emb["dsa_cost"]
+                    + emb["rda_cost"] + emb["nysa_cost"] + emb["rbp_cost"] + emb["spta_cost"])
+        emb["st_rate"] = amb["st_rate"]
+        emb["st_cost"] = emb["st_rate"] * subtotal
 
-        emb.toc_total_cost = (emb.der_cost + emb.dsa_cost + emb.rda_cost + emb.nysa_cost + emb.rbp_cost + emb.spta_cost
-                              + emb.st_cost)
+        emb["toc_total_cost"] = (emb["der_cost"] + emb["dsa_cost"] + emb["rda_cost"] + emb["nysa_cost"]
+                                 + emb["rbp_cost"] + emb["spta_cost"] + emb["st_cost"])
 
         return emb
 
@@ -468,13 +476,12 @@ class PSEG(ComplexServiceModelBase):
         """ Estimate bill total cost
 
         Args:
-            emb (ElectricBillData): estimate electric bill data
+            emb (dict): estimate electric bill data arrays. see ComplexServiceModelBase.bill_arrays()
 
         Returns:
-            ElectricBillData: emb with total cost estimated
+            dict: emb with total cost estimated
         """
-        emb.total_cost = emb.dsc_total_cost + emb.psc_total_cost + emb.toc_total_cost
-        emb = self.set_default_tax_related_cost([(emb, Decimal("NaN"))])
+        emb["total_cost"] = emb["dsc_total_cost"] + emb["psc_total_cost"] + emb["toc_total_cost"]
 
         return emb
 
@@ -506,13 +513,33 @@ class PSEG(ComplexServiceModelBase):
                              + str(start_date) + " - " + str(end_date) + " must be set before calling this function")
 
         # there should be only one actual bill and one estimated bill in each of the bill dicts
-        amb = amb[0]
-        emb = emb[0]
+        return self.do_estimate_monthly_bills([(amb[0], emb[0])])[0]
+
+    def do_estimate_monthly_bills(self, bill_pairs, data_dict=None):
+        """ Run the process of estimating the monthly bills if solar were not used. see superclass docstring
+
+        Args:
+            bill_pairs (list[tuple[ElectricBillData, ElectricBillData]]): (actual bill, estimate bill). estimate bills
+                have total_kwh and eh_kwh set (see BillAndDataInput.input_and_load_electric_estimation_data())
+            data_dict (Optional[dict]): of month year to ElectricData. Default None to use self.data_dict
+
+        Returns:
+            list[ElectricBillData]: estimated monthly bills with all applicable estimate fields set
+        """
+        data_dict = self.data_dict if data_dict is None else data_dict
+        amb_list = [amb for amb, _ in bill_pairs]
+        emb_list = [emb for _, emb in bill_pairs]
+
+        ed_start, ed_end = self.month_data_arrays(emb_list, data_dict, self._ESTIMATE_DATA)
+        s_rat, e_rat = self.month_ratios(emb_list)
+        amb = self.bill_arrays(amb_list, ["st_rate"])
+        emb = self.bill_arrays(emb_list, self._ESTIMATE_INPUTS)
 
         emb = self._do_estimate_total_kwh(emb)
-        emb = self._do_estimate_dsc(emb, ed_start, ed_end)
-        emb = self._do_estimate_psc(emb, ed_start, ed_end)
-        emb = self._do_estimate_toc(emb, ed_start, ed_end, amb)
+        emb = self._do_estimate_dsc(emb, ed_start, ed_end, s_rat, e_rat)
+        emb = self._do_estimate_psc(emb, ed_start, ed_end, s_rat, e_rat)
+        emb = self._do_estimate_toc(emb, ed_start, ed_end, s_rat, e_rat, amb)
         emb = self._do_estimate_total_cost(emb)
 
-        return emb
\ No newline at end of file
+        self.set_bill_arrays(emb_list, {name: emb[name] for name in self._ESTIMATE_OUTPUTS})
+        return self.set_default_tax_related_cost([(bill, Decimal("NaN")) for bill in emb_list])
@@ -3,6 +3,7 @@ import datetime
 import os
 import pathlib
 
+import numpy as np
 import pandas as pd
 
 from ...model.simpleservicemodelbase import SimpleServiceModelBase
@@ -14,6 +15,9 @@ from assetmanagement.database.popo.solarbilldata import SolarBillData
 
 class Solar(SimpleServiceModelBase):
     """ Perform data operations and calculations on Solar data """
+    # increment to invalidate the .npz caches of parsed mySunpower hourly files (see read_sunpower_hourly_file())
+    HOURLY_CACHE_VERSION = 1
+
     def __init__(self):
         """ init function """
         super().__init__()
@@ -51,7 +55,7 @@ class Solar(SimpleServiceModelBase):
     def process_service_bill(self, filename):
         """ Open, process and return solar service bill in same format as SolarBillTemplate.csv
 
-        Solar hourly data must be available before calling this function. See self.process_sunpower_hourly_file() and
+        Solar hourly data must be available before calling this function. See self.process_sunpower_hourly_files() and
             self.insert_sunpower_hourly_data_to_db(). This function calls self.calculate_total_kwh_between_dates() to
             get solar and home kwh usage the billing period.
         This function will not work for the first bill since the beginning of the month opportunity cost basis isn't
@@ -186,14 +190,14 @@ class Solar(SimpleServiceModelBase):
         return bill_list
 
     def read_service_bills_from_db_by_resppdr(self, real_estate_list=(), service_provider_list=(), paid_date_min=None,
-                                              paid_date_max=None, to_pd_df=False):
+                                              paid_date_max=None, to_pd_df=False, fields=None):
         wheres = self.resppdr_wheres_clause(real_estate_list=real_estate_list,
                 service_provider_list=service_provider_list, paid_date_min=paid_date_min, paid_date_max=paid_date_max)
 
         with MySQLAM() as mam:
-            bill_list = mam.solar_bill_data_read(wheres=wheres, order_bys=["paid_date"])
+            bill_list = mam.solar_bill_data_read(wheres=wheres, order_bys=["paid_date"], fields=fields)
 
-        return self.bills_post_read(bill_list, to_pd_df=to_pd_df)
+        return self.bills_post_read(bill_list, to_pd_df=to_pd_df, fields=fields)
 
     def read_one_bill(self):
         with MySQLAM() as mam:
@@ -225,36 +229,104 @@ class Solar(SimpleServiceModelBase):
         Raises:
             ValueError: if a date does not have 24 entries (1 per hour)
         """
-        df = pd.read_excel(pathlib.Path(__file__).parent.parent.parent.parent.parent /
-                           (os.getenv("DI_SUNPOWER_DIR") + filename))
-        df = df.rename(columns={"Period": "dt", "Solar Production (kWh)": "solar_kwh", "Home Usage (kWh)": "home_kwh"})
-        df["dt"] = df["dt"].str.split(" ").map(lambda x: x[1] + " " + x[3])
-        df["dt"] = pd.to_datetime(df["dt"], format="%m/%d/%Y %I:%M%p")
-        df["date"] = df["dt"].dt.date
+        return self.process_sunpower_hourly_files([filename])
+
+    def process_sunpower_hourly_files(self, filenames):
+        """ Open, process and return many mySunpower hourly files as one dataframe
+
+        Files may overlap (e.g. exports of consecutive months that share a boundary day). Hours found in more than one
+        file are taken from the last of those files in filenames only. Dates are validated after the
+        files are combined, so a date split across two files is valid if the files together have its 24 entries.
+
+        Args:
+            filenames (list[str]): names of files in SunpowerFiles directory
 
-        v_df = df.groupby(by=["date"], as_index=False).agg({"dt": "count"})
-        v_df = v_df[v_df["dt"] != 24]
-        if len(v_df) > 0:
+        Returns:
+            pd.DataFrame: with columns dt (datetime64), solar_kwh (float64) and home_kwh (float64). ordered by dt
+
+        Raises:
+            ValueError: if a date does not have 24 entries (1 per hour)
+        """
+        df_list = [self.read_sunpower_hourly_file(filename) for filename in filenames]
+        df = pd.concat(df_list, ignore_index=True)
+        if len(df_list) > 1:
+            # keep each hour only from the last file that has it
+            file_ind = np.repeat(np.arange(len(df_list)), [len(x) for x in df_list])
+            last_ind = pd.Series(file_ind).groupby(df["dt"].to_numpy()).transform("max").to_numpy()
+            df = df[file_ind == last_ind]
+        df = df.sort_values("dt", kind="stable", ignore_index=True)
+
+        dates, counts = np.unique(df["dt"].to_numpy().astype("datetime64[D]"), return_counts=True)
+        invalid = counts != 24
+        if invalid.any():
             msg = "mySunpower file has issues: "
-            for ind, row in v_df.iterrows():
-                msg += str(row["date"]) + " has " + str(row["dt"]) + " entries. "
+            for date, count in zip(dates[invalid], counts[invalid]):
+                msg += str(date) + " has " + str(count) + " entries. "
             raise ValueError(msg)
 
-        return df[["dt", "solar_kwh", "home_kwh"]]
+        return df
+
+    def read_sunpower_hourly_file(self, filename):
+        """ Read and parse one mySunpower hourly file without validating it
+
+        The parsed columns are cached in a numpy .npz file next to the file (filename + ".npz"), so reading the same
+        file again does not read the Excel file. The cache is read again if the file's size or modification time
+        changes.
+
+        Args:
+            filename (str): name of file in SunpowerFiles directory
+
+        Returns:
+            pd.DataFrame: with columns dt (datetime64), solar_kwh (float64) and home_kwh (float64) in file order
+        """
+        path = pathlib.Path(__file__).parent.parent.parent.parent.parent / (os.getenv("DI_SUNPOWER_DIR") + filename)
+        cache_path = path.with_name(path.name + ".npz")
+        stat = path.stat()
+        source = np.array([self.HOURLY_CACHE_VERSION, stat.st_size, stat.st_mtime_ns], dtype=np.int64)
+
+        if cache_path.is_file():
+            try:
+                with np.load(cache_path, allow_pickle=False) as npz:
+                    if np.array_equal(npz["source"], source):
+                        return pd.DataFrame({col: npz[col] for col in ["dt", "solar_kwh", "home_kwh"]})
+            except (OSError, KeyError, ValueError):
+                # unreadable cache is replaced below
+                pass
+
+        df = pd.read_excel(path)
+        df = df.rename(columns={"Period": "dt", "Solar Production (kWh)": "solar_kwh", "Home Usage (kWh)": "home_kwh"})
+        # "Mon 01/02/2023 - 1:00am" -> "01/02/2023 1:00am"
+        parts = df["dt"].str.split(" ", expand=True)
+        df["dt"] = pd.to_datetime(parts[1] + " " + parts[3], format="%m/%d/%Y %I:%M%p")
+        df = df[["dt", "solar_kwh", "home_kwh"]].astype({"solar_kwh": "float64", "home_kwh": "float64"})
+
+        try:
+            with open(cache_path, "wb") as f:
+                np.savez(f, source=source, **{col: df[col].to_numpy() for col in df.columns})
+        except OSError:
+            # cache is optional (e.g. read only directory)
+            cache_path.unlink(missing_ok=True)
+
+        return df
 
-    def insert_sunpower_hourly_data_to_db(self, data_df):
+    def insert_sunpower_hourly_data_to_db(self, data_df, ignore=None):
         """ write sunpower hourly data to table
 
-        Should be called with pd.DataFrame return from process_sunpower_hourly_file()
+        Should be called with pd.DataFrame return from process_sunpower_hourly_file() or
+        process_sunpower_hourly_files(). Rows are inserted with multi-row insert statements of up to
+        MySQLBase.bulk_chunk_size rows each, in one transaction
 
         Args:
             data_df (pd.DataFrame): must have columns dt, solar_kwh, home_kwh
+            ignore (Optional[boolean]): True to skip hours already in the table. Default None for False
 
         Raises:
             MySQLException: if issue with database insert (probably primary key violation)
         """
+        fields = ["dt", "solar_kwh", "home_kwh"]
+        rows = [list(row) for row in zip(*[data_df[field].tolist() for field in fields])]
         with MySQLAM() as mam:
-            mam.mysunpower_hourly_data_insert(data_df.to_dict(orient="records"))
+            mam.mysunpower_hourly_data_insert(rows, fields=fields, ignore=ignore)
 
     def read_sunpower_hourly_data_from_db_between_dates(self, start_date, end_date, must_have_all_data=False):
         """ Read sunpower hourly data from mysunpower_hourly_data table
@@ -268,13 +340,13 @@ class Solar(SimpleServiceModelBase):
                 dates. Default False for no checks
 
         Returns:
-            pd.DataFrame: of hourly data with keys matching table columns
+            pd.DataFrame: of hourly data with keys matching table columns. kwh columns are float64
 
         Raises:
             ValueError: if any hourly data is missing and must_have_all_data is True
         """
         end_date = datetime.datetime.combine(end_date, datetime.time(23, 59, 59))
-        with MySQLAM(FetchCursor.PD_DF) as mam:
+        with MySQLAM(FetchCursor.PD_DF_COLUMNAR) as mam:
             data_df = mam.mysunpower_hourly_data_read(wheres=[["dt", ">=", start_date], ["dt", "<=", end_date]])
 
         if must_have_all_data:
@@ -304,7 +376,8 @@ class Solar(SimpleServiceModelBase):
             ValueError: see self.read_sunpower_hourly_data_from_db_between_dates()
         """
         data_df = self.read_sunpower_hourly_data_from_db_between_dates(start_date, end_date, must_have_all_data=True)
-        kwh_dict = {"solar_kwh": Decimal(data_df["solar_kwh"].sum()),
-                    "home_kwh": Decimal(data_df["home_kwh"].sum())}
+        # kwh columns are float64 from decimal(5,2). round sum back to 2 decimal places for an exact Decimal
+        kwh_dict = {"solar_kwh": Decimal(str(round(data_df["solar_kwh"].sum(), 2))),
+                    "home_kwh": Decimal(str(round(data_df["home_kwh"].sum(), 2)))}
 
         return kwh_dict
\ No newline at end of file
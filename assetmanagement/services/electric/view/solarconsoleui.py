@@ -31,12 +31,19 @@ class SolarConsoleUI(SimpleConsoleUIBase, SolarViewBase):
             print("\n")
 
     def input_read_new_hourly_data_file_or_skip(self, start_date, end_date):
-        return input("\nEnter '1' to read sunpower hourly file with data from " + str(start_date) + " through " +
-                     str(end_date) + " (inclusive). Anything else to skip (data in file already inserted to table): ",
+        return input("\nEnter '1' to read sunpower hourly file(s) with data from " + str(start_date) + " through " +
+                     str(end_date) + " (inclusive). Anything else to skip (data in files already inserted to table): ",
                      fcolor="blue")
 
-    def input_read_new_hourly_data_file(self, start_date, end_date):
-        print("\nGet sunpower hourly data file with data from " + str(start_date) + " through "
-              + str(end_date) + "\nSave file to " + str(os.getenv("DI_SUNPOWER_DIR")) + " directory.\n")
+    def input_read_new_hourly_data_files(self, start_date, end_date):
+        print("\nGet sunpower hourly data file(s) with data from " + str(start_date) + " through "
+              + str(end_date) + "\nSave files to " + str(os.getenv("DI_SUNPOWER_DIR")) + " directory.\n")
 
-        return input("Enter filename: ", fcolor="blue")
\ No newline at end of file
+        filenames = [input("Enter filename: ", fcolor="blue")]
+        while True:
+            filename = input("Enter another filename. No value to read the file(s): ", fcolor="blue")
+            if filename == "":
+                break
+            filenames.append(filename)
+
+        return filenames
\ No newline at end of file
@@ -43,19 +43,19 @@ class SolarViewBase(SimpleServiceViewBase):
             end_date (datetime.date): read file with data ending on this date
 
         Returns:
-            str: "1" to read sunpower hourly file. anything else to skip reading file
+            str: "1" to read sunpower hourly file(s). anything else to skip reading files
         """
         raise NotImplementedError("input_read_new_or_skip() not implemented by subclass")
 
     @abstractmethod
-    def input_read_new_hourly_data_file(self, start_date, end_date):
-        """ ask for new file name
+    def input_read_new_hourly_data_files(self, start_date, end_date):
+        """ ask for new file names
 
         Args:
-            start_date (datetime.date): read file with data starting on this date
-            end_date (datetime.date): read file with data ending on this date
+            start_date (datetime.date): read files with data starting on this date
+            end_date (datetime.date): read files with data ending on this date
 
         Returns:
-            str: name of file to read
+            list[str]: names of files to read. at least one
         """
-        raise NotImplementedError("input_read_new_hourly_data_file() not implemented by subclass")
\ No newline at end of file
+        raise NotImplementedError("input_read_new_hourly_data_files() not implemented by subclass")
\ No newline at end of file
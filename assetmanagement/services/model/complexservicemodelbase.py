@@ -1,11 +1,17 @@
 from abc import abstractmethod
+from decimal import Decimal
 from typing import Optional, Union
+import calendar
 import datetime
+import threading
 
+import numpy as np
 import pandas as pd
 
 from .simpleservicemodelbase import SimpleServiceModelBase, BillDict
 from assetmanagement.database.mysqlam import MySQLAM
+from assetmanagement.database.mysqlbase import UnitOfWork
+from assetmanagement.database.popo.billframe import BillFrame
 from assetmanagement.database.popo.realestate import RealEstate, Address
 from assetmanagement.database.popo.serviceprovider import ServiceProviderEnum
 
@@ -17,10 +23,20 @@ class ComplexServiceModelBase(SimpleServiceModelBase):
     what the service would have cost under different circumstances. Complex services provide bills with detailed data
     and subclasses
 
+    Utility data read from the database is kept in a month data cache shared by all instances of a subclass (see
+    prefetch_monthly_data()). The cache survives clear_model(), so consecutive bills of a session that share months do
+    not read the same utility data again, and is invalidated by insert_monthly_data_to_db(). Utility data inserted
+    and read in a UnitOfWork is not committed until the unit commits, so the caches of all subclasses are cleared when
+    a unit of work is rolled back (see invalidate_all_monthly_data_caches())
+
     Attributes:
         data_dict (dict): dict of date: subclass of UtilityDataBase. utility data for the month given by date
         esb_dict (BillDict): estimated service bills
     """
+    # model class to dict of month year ("MMYYYY" format) to Optional[UtilityDataBase] subclass instance
+    _month_data_cache = {}
+    _month_data_cache_lock = threading.Lock()
+
     @abstractmethod
     def __init__(self):
         """ init function """
@@ -54,7 +70,7 @@ class ComplexServiceModelBase(SimpleServiceModelBase):
 
     @abstractmethod
     def read_service_bills_from_db_by_resppdr(self, real_estate_list=(), service_provider_list=(), paid_date_min=None,
-                                              paid_date_max=None, to_pd_df=None):
+                                              paid_date_max=None, to_pd_df=None, fields=None):
         """ Read service bills from table by real estate(s), service provider(s), paid date range inclusive
 
         Service bills are inserted in self.asb_dict or self.esb_dict
@@ -69,6 +85,9 @@ class ComplexServiceModelBase(SimpleServiceModelBase):
             paid_date_max (Optional[datetime.date]): bills with paid date less than or equal to this date. Default None
                 for no maximum
             to_pd_df (boolean): True to return data as a dataframe. Default False to return bill list
+            fields (Optional[list[str]]): bill table columns to read. Bills only have these attributes (and the
+                MySQLAM.COMPLEX_BILL_KEY_FIELDS attributes) set and the dataframe only has these columns (see
+                self.bills_post_read()). Default None for all columns
 
         Returns:
             Union[list[ComplexServiceBillDataBase], pd.DataFrame]:
@@ -96,6 +115,8 @@ class ComplexServiceModelBase(SimpleServiceModelBase):
     def insert_monthly_data_to_db(self, utility_data):
         """ Insert monthly utility data to table
 
+        Subclasses call self.invalidate_monthly_data_cache() after the insert
+
         Args:
             utility_data (UtilityDataBase): subclass instance to insert
 
@@ -105,10 +126,26 @@ class ComplexServiceModelBase(SimpleServiceModelBase):
         raise NotImplementedError("insert_monthly_data_to_db() not implemented by subclass")
 
     @abstractmethod
+    def read_monthly_data_from_db_by_month_date_range(self, start_date, end_date):
+        """ read utility data from data table by month date range inclusive with one query
+
+        Args:
+            start_date (datetime.date): utility data with month date greater than or equal to this date
+            end_date (datetime.date): utility data with month date less than or equal to this date
+
+        Returns:
+            list[UtilityDataBase]: subclass instances. empty if no utility data found in date range
+
+        Raises:
+            MySQLException: if issue with database read
+        """
+        raise NotImplementedError("read_monthly_data_from_db_by_month_date_range() not implemented by subclass")
+
     def read_monthly_data_from_db_by_month_year(self, month_year):
         """ read utility data from data table by month and year
 
-        self.data_dict[month_year] is set with returned instance of UtilityDataBase subclass or None
+        self.data_dict[month_year] is set with returned instance of UtilityDataBase subclass or None. The database is
+        only read if month_year is not in the month data cache (see prefetch_monthly_data())
 
         Args:
             month_year (str): month and year of data ("MMYYYY" format)
@@ -119,7 +156,76 @@ class ComplexServiceModelBase(SimpleServiceModelBase):
         Raises:
             MySQLException: if issue with database read
         """
-        raise NotImplementedError("read_monthly_data_from_db_by_month_year() not implemented by subclass")
+        month_date = datetime.datetime.strptime(month_year, "%m%Y").date()
+        self.prefetch_monthly_data(month_date, month_date)
+
+        return self.data_dict[month_year]
+
+    def prefetch_monthly_data(self, start_date, end_date):
+        """ Load the utility data of every month from start_date to end_date into the month data cache and data_dict
+
+        Months already in the month data cache (including months known to have no utility data) are not read again.
+        All missing months are read with one query that spans from the first missing month to the last missing month.
+        self.data_dict[month_year] is set for every month in the range with a UtilityDataBase subclass instance or None
+
+        Args:
+            start_date (datetime.date): first month to load (day is ignored)
+            end_date (datetime.date): last month to load (day is ignored)
+
+        Raises:
+            MySQLException: if issue with database read
+        """
+        month_dates = self.month_dates(start_date, end_date)
+        cache = self._month_data_cache.get(type(self), {})
+        missing = [md for md in month_dates if md.strftime("%m%Y") not in cache]
+
+        if len(missing) > 0:
+            range_end = missing[-1].replace(day=calendar.monthrange(missing[-1].year, missing[-1].month)[1])
+            data_list = self.read_monthly_data_from_db_by_month_date_range(missing[0], range_end)
+            found = {}
+            for utility_data in data_list:
+                found.setdefault(utility_data.month_year, utility_data)
+            with self._month_data_cache_lock:
+                cache = self._month_data_cache.setdefault(type(self), {})
+                for month_date in missing:
+                    month_year = month_date.strftime("%m%Y")
+                    cache[month_year] = found.get(month_year, None)
+                cache = dict(cache)
+
+        for month_date in month_dates:
+            month_year = month_date.strftime("%m%Y")
+            self.data_dict[month_year] = cache[month_year]
+
+    @classmethod
+    def invalidate_monthly_data_cache(cls):
+        """ Clear the month data cache of this class so that utility data is read again from the database """
+        with cls._month_data_cache_lock:
+            cls._month_data_cache.pop(cls, None)
+
+    @classmethod
+    def invalidate_all_monthly_data_caches(cls):
+        """ Clear the month data cache of every subclass. Called when a UnitOfWork is rolled back """
+        with cls._month_data_cache_lock:
+            cls._month_data_cache.clear()
+
+    @staticmethod
+    def month_dates(start_date, end_date):
+        """ First day of each month from start_date to end_date inclusive
+
+        Args:
+            start_date (datetime.date): first month (day is ignored)
+            end_date (datetime.date): last month (day is ignored)
+
+        Returns:
+            list[datetime.date]: in increasing order. empty if end_date is in a month before start_date
+        """
+        month_dates = []
+        month_date = start_date.replace(day=1)
+        while month_date <= end_date:
+            month_dates.append(month_date)
+            month_date = (month_date + datetime.timedelta(days=32)).replace(day=1)
+
+        return month_dates
 
     @abstractmethod
     def initialize_complex_service_bill_estimate(self, address, start_date, end_date, provider=None):
@@ -161,6 +267,106 @@ class ComplexServiceModelBase(SimpleServiceModelBase):
         """
         raise NotImplementedError("do_estimate_monthly_bill() not implemented by subclass")
 
+    @abstractmethod
+    def do_estimate_monthly_bills(self, bill_pairs, data_dict=None):
+        """ Run the process of estimating many complex service bills in one pass (e.g. a real estate's full history)
+
+        Produces the same estimates as do_estimate_monthly_bill() (including rounding) for each pair, but each estimate
+        step is computed once for all bills over aligned arrays of bill and utility data values.
+
+        Args:
+            bill_pairs (list[tuple[ComplexServiceBillDataBase, ComplexServiceBillDataBase]]): (actual bill, estimate
+                bill) subclass instances. each estimate bill is initialized from its actual bill (see
+                initialize_complex_service_bill_estimate()) and has its estimation input data set
+            data_dict (Optional[dict]): of month year ("MMYYYY" format) to subclass of UtilityDataBase. must have the
+                data for the start and end month of every bill. Default None to use self.data_dict
+
+        Returns:
+            list[ComplexServiceBillDataBase]: estimate bills of bill_pairs, in order, with all applicable estimate
+                fields set. ready to be inserted with insert_service_bills_to_db()
+
+        Raises:
+            ValueError: if data_dict does not contain utility data for the start or end month of a bill
+        """
+        raise NotImplementedError("do_estimate_monthly_bills() not implemented by subclass")
+
+    @staticmethod
+    def bill_arrays(bill_list, names):
+        """ Get attribute values of bills as aligned arrays
+
+        Arrays have object dtype so that arithmetic on them is done by the element types (e.g. Decimal), exactly as it
+        is for scalar values
+
+        Args:
+            bill_list (list): bills (or other objects, e.g. utility data)
+            names (list[str]): attribute names
+
+        Returns:
+            dict: of attribute name to np.ndarray of bill_list attribute values in bill_list order
+        """
+        arrays = {}
+        for name in names:
+            arrays[name] = np.empty(len(bill_list), dtype=object)
+            arrays[name][:] = [getattr(bill, name) for bill in bill_list]
+        return arrays
+
+    @staticmethod
+    def set_bill_arrays(bill_list, arrays):
+        """ Set attribute values of bills from aligned arrays. see bill_arrays()
+
+        Args:
+            bill_list (list): bills to update
+            arrays (dict): of attribute name to np.ndarray of values in bill_list order
+        """
+        for name, values in arrays.items():
+            for bill, value in zip(bill_list, values.tolist()):
+                setattr(bill, name, value)
+
+    def month_data_arrays(self, bill_list, data_dict, names):
+        """ Get the utility data of the start and end month of each bill as aligned arrays
+
+        Args:
+            bill_list (list[ComplexServiceBillDataBase]): subclass instances
+            data_dict (dict): see do_estimate_monthly_bills()
+            names (list[str]): utility data attribute names
+
+        Returns:
+            tuple[dict, dict]: start month and end month arrays. see bill_arrays()
+
+        Raises:
+            ValueError: if data_dict does not contain utility data for the start or end month of a bill
+        """
+        start_list, end_list = [], []
+        for bill in bill_list:
+            data_start = data_dict.get(bill.start_date.strftime("%m%Y"), None)
+            data_end = data_dict.get(bill.end_date.strftime("%m%Y"), None)
+            if data_start is None or data_end is None:
+                raise ValueError("start month and end month utility data for " + str(bill.real_estate.address.value)
+                                 + ", " + str(bill.start_date) + " - " + str(bill.end_date) + " must be set before "
+                                 + "calling this function")
+            start_list.append(data_start)
+            end_list.append(data_end)
+
+        return self.bill_arrays(start_list, names), self.bill_arrays(end_list, names)
+
+    @staticmethod
+    def month_ratios(bill_list):
+        """ Ratio of each bill's days in its end month and start month
+
+        Same as Decimal(end_date.day / ((end_date - start_date).days + 1)) and 1 minus that for each bill
+
+        Args:
+            bill_list (list[ComplexServiceBillDataBase]): subclass instances
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: (start month ratios, end month ratios) of Decimal, in bill_list order
+        """
+        end_days = np.array([bill.end_date.day for bill in bill_list], dtype=np.int64)
+        bill_days = np.array([(bill.end_date - bill.start_date).days + 1 for bill in bill_list], dtype=np.int64)
+        e_rat = np.frompyfunc(Decimal, 1, 1)((end_days / bill_days).astype(object))
+        s_rat = 1 - e_rat
+        return s_rat, e_rat
+
     def read_all_service_bills_from_db_unpaid(self):
         """ Read all complex bills that have a null paid date and are actual bills
 
@@ -175,12 +381,14 @@ class ComplexServiceModelBase(SimpleServiceModelBase):
         """
         raise NotImplementedError("read_all_service_bills_from_db_unpaid() not implemented by subclass")
 
-    def bills_post_read(self, bill_list, to_pd_df=False, **kwargs):
+    def bills_post_read(self, bill_list, to_pd_df=False, fields=None, **kwargs):
         """ Convenience function to save bill_list to model and convert bill_list to dataframe if specified
 
         Args:
             bill_list (list[ComplexServiceBillDataBase]): subclass instances
             to_pd_df (boolean): True to return data as a dataframe. Default False to return bill_list unaltered
+            fields (Optional[list[str]]): bill table columns the bills were read with. see self.narrow_df(). Default
+                None for all columns
 
         Returns:
             Union[list[ComplexServiceBillDataBase], pd.DataFrame]:
@@ -191,16 +399,15 @@ class ComplexServiceModelBase(SimpleServiceModelBase):
             if len(bill_list) == 0:
                 df = self.read_one_bill().to_pd_df(**kwargs).head(0)
             else:
-                df = pd.DataFrame()
+                df = BillFrame.from_bills(bill_list)
 
                 for bill in bill_list:
-                    df = pd.concat([df, bill.to_pd_df()], ignore_index=True)
                     if bill.is_actual:
                         self.asb_dict.insert_bills(bill)
                     else:
                         self.esb_dict.insert_bills(bill)
 
-            return df.sort_values(by=["start_date", "is_actual"])
+            return self.narrow_df(df.sort_values(by=["start_date", "is_actual"]), fields)
         else:
             for bill in bill_list:
                 if bill.is_actual:
@@ -233,4 +440,7 @@ class ComplexServiceModelBase(SimpleServiceModelBase):
                 wheres=[["real_estate_id", "=", real_estate.id], ["service_provider_id", "=", provider.id]],
                 order_bys=["note_order"])
 
-        return notes_list
\ No newline at end of file
+        return notes_list
+
+
+UnitOfWork.add_rollback_callback(ComplexServiceModelBase.invalidate_all_monthly_data_caches)
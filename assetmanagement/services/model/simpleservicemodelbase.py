@@ -5,6 +5,7 @@ import datetime
 import pandas as pd
 
 from assetmanagement.database.mysqlam import MySQLAM
+from assetmanagement.database.popo.billframe import BillFrame
 from assetmanagement.database.popo.realestate import Address, RealEstate
 from assetmanagement.database.popo.simpleservicebilldatabase import SimpleServiceBillDataBase
 
@@ -169,7 +170,7 @@ class SimpleServiceModelBase(ABC):
 
     @abstractmethod
     def read_service_bills_from_db_by_resppdr(self, real_estate_list=(), service_provider_list=(), paid_date_min=None,
-                                              paid_date_max=None, to_pd_df=None):
+                                              paid_date_max=None, to_pd_df=None, fields=None):
         """ Read service bills from table by real estate(s), service provider(s), paid date range inclusive
 
         Service bills are inserted in self.asb_dict
@@ -184,6 +185,9 @@ class SimpleServiceModelBase(ABC):
             paid_date_max (Optional[datetime.date]): bills with paid date less than or equal to this date. Default None
                 for no maximum
             to_pd_df (boolean): True to return data as a dataframe. Default False to return bill list
+            fields (Optional[list[str]]): bill table columns to read. Bills only have these attributes (and the
+                MySQLAM.BILL_KEY_FIELDS attributes) set and the dataframe only has these columns (see
+                self.bills_post_read()). Default None for all columns
 
         Returns:
             Union[list[SimpleServiceBillDataBase], pd.DataFrame]:
@@ -258,13 +262,45 @@ class SimpleServiceModelBase(ABC):
 
         return wheres
 
-    def bills_post_read(self, bill_list, to_pd_df=False, **kwargs):
+    @staticmethod
+    def read_bills_union_from_db_by_resppdr(tables, real_estate_list=(), service_provider_list=(), paid_date_min=None,
+                                            paid_date_max=None, fields=MySQLAM.BILL_UNION_FIELDS, aliases=None,
+                                            order_bys=()):
+        """ Read fields of bills in several bill tables by real estate(s), service provider(s), paid date range
+        inclusive
+
+        One UNION ALL query for all tables instead of one read_service_bills_from_db_by_resppdr() per model. Bills are
+        not constructed or inserted in self.asb_dict. See MySQLAM.bill_data_union_read()
+
+        Args:
+            tables (list[str]): bill data tables (e.g. ["simple_bill_data", "electric_bill_data"])
+            real_estate_list, service_provider_list, paid_date_min, paid_date_max: see
+                SimpleServiceModelBase.resppdr_wheres_clause()
+            fields, aliases, order_bys: see MySQLAM.bill_data_union_read(). Default MySQLAM.BILL_UNION_FIELDS, None
+                and ()
+
+        Returns:
+            pd.DataFrame: see MySQLAM.bill_data_union_read()
+
+        Raises:
+            MySQLException: if issue with database read
+        """
+        wheres = SimpleServiceModelBase.resppdr_wheres_clause(
+            real_estate_list=real_estate_list, service_provider_list=service_provider_list, paid_date_min=paid_date_min,
+            paid_date_max=paid_date_max)
+
+        with MySQLAM() as mam:
+            return mam.bill_data_union_read(tables, fields=fields, wheres=wheres, order_bys=order_bys, aliases=aliases)
+
+    def bills_post_read(self, bill_list, to_pd_df=False, fields=None, **kwargs):
         """ Convenience function to save bill_list to model and convert bill_list to dataframe if specified
 
         Args:
             bill_list (list[SimpleServiceBillDataBase]): subclass instances
             to_pd_df (boolean): True to return data as a dataframe with column headers (even if bill_list is empty).
                 Default False to return bill_list unaltered
+            fields (Optional[list[str]]): bill table columns the bills were read with. see self.narrow_df(). Default
+                None for all columns
             kwargs: see SimpleServiceBillDataBase.to_pd_df(kwargs) (and subclasses)
 
         Returns:
@@ -278,16 +314,34 @@ class SimpleServiceModelBase(ABC):
             if len(bill_list) == 0:
                 df = self.read_one_bill().to_pd_df(**kwargs).head(0)
             else:
-                df = pd.DataFrame()
-                for bill in bill_list:
-                    df = pd.concat([df, bill.to_pd_df(**kwargs)], ignore_index=True)
+                df = BillFrame.from_bills(bill_list, **kwargs).sort_values(by=["start_date"])
 
-                df = df.sort_values(by=["start_date"])
-
-            return df
+            return self.narrow_df(df, fields)
         else:
             return bill_list
 
+    @staticmethod
+    def narrow_df(df, fields):
+        """ Keep only the columns of a bill dataframe that were read with a MySQLAM *_bill_data_read() fields projection
+
+        Args:
+            df (pd.DataFrame): from bill to_pd_df()
+            fields (Optional[list[str]]): bill table columns read. None to keep all columns
+
+        Returns:
+            pd.DataFrame: df with only MySQLAM.COMPLEX_BILL_KEY_FIELDS and fields columns (those that are in df), in
+                that order
+        """
+        if fields is None:
+            return df
+
+        cols = []
+        for col in list(MySQLAM.COMPLEX_BILL_KEY_FIELDS) + list(fields):
+            if col in df.columns and col not in cols:
+                cols.append(col)
+
+        return df[cols]
+
     def read_real_estate_by_address(self, address):
         """ Read real estate from real_estate table by address
 
@@ -4,13 +4,13 @@ import os
 import pathlib
 
 import pandas as pd
-import tabula
 
 from ...model.simpleservicemodelbase import SimpleServiceModelBase
 from assetmanagement.database.mysqlam import MySQLAM
 from assetmanagement.database.popo.mortgagebilldata import MortgageBillData
 from assetmanagement.database.popo.realestate import Address
 from assetmanagement.database.popo.serviceprovider import ServiceProvider, ServiceProviderEnum
+from assetmanagement.util.pdfcache import PdfCache
 
 
 class MS(SimpleServiceModelBase):
@@ -47,8 +47,9 @@ class MS(SimpleServiceModelBase):
         def fmt_dec(str_val):
             return Decimal(str_val.replace("$", "").replace(" ", "").replace(",", ""))
 
-        df_list = tabula.read_pdf(pathlib.Path(__file__).parent.parent.parent.parent.parent /
-                                  (os.getenv("DI_MORGANSTANLEY_DIR") + filename), pages="all", guess=False, silent=True)
+        df_list = PdfCache.read_pdf(pathlib.Path(__file__).parent.parent.parent.parent.parent /
+                                    (os.getenv("DI_MORGANSTANLEY_DIR") + filename), pages="all", guess=False,
+                                    silent=True)
 
         df = df_list[0]
         address = ""
@@ -182,14 +183,14 @@ class MS(SimpleServiceModelBase):
         return bill_list
 
     def read_service_bills_from_db_by_resppdr(self, real_estate_list=(), service_provider_list=(), paid_date_min=None,
-                                              paid_date_max=None, to_pd_df=False):
+                                              paid_date_max=None, to_pd_df=False, fields=None):
         wheres = self.resppdr_wheres_clause(real_estate_list=real_estate_list,
                 service_provider_list=service_provider_list, paid_date_min=paid_date_min, paid_date_max=paid_date_max)
 
         with MySQLAM() as mam:
-            bill_list = mam.mortgage_bill_data_read(wheres=wheres, order_bys=["paid_date"])
+            bill_list = mam.mortgage_bill_data_read(wheres=wheres, order_bys=["paid_date"], fields=fields)
 
-        return self.bills_post_read(bill_list, to_pd_df=to_pd_df)
+        return self.bills_post_read(bill_list, to_pd_df=to_pd_df, fields=fields)
 
     def read_one_bill(self):
         with MySQLAM() as mam:
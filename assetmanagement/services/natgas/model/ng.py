@@ -4,8 +4,8 @@ import datetime
 import os
 import pathlib
 
+import numpy as np
 import pandas as pd
-import tabula
 
 from ...model.complexservicemodelbase import ComplexServiceModelBase
 from assetmanagement.database.mysqlam import MySQLAM
@@ -13,6 +13,7 @@ from assetmanagement.database.popo.natgasbilldata import NatGasBillData
 from assetmanagement.database.popo.natgasdata import NatGasData
 from assetmanagement.database.popo.realestate import RealEstate, Address
 from assetmanagement.database.popo.serviceprovider import ServiceProviderEnum
+from assetmanagement.util.pdfcache import PdfCache
 
 
 class NG(ComplexServiceModelBase):
@@ -43,7 +44,7 @@ class NG(ComplexServiceModelBase):
         Raises:
             ValueError: unable to read relevant data in bill
         """
-        df_list = tabula.read_pdf(pathlib.Path(__file__).parent.parent.parent.parent.parent /
+        df_list = PdfCache.read_pdf(pathlib.Path(__file__).parent.parent.parent.parent.parent /
                             (os.getenv("DI_NATIONALGRID_DIR") + filename), pages="all", password="11720", guess=False)
         bill_data = NatGasBillData.default_constructor()
         bill_data.saved_therms = 0
@@ -222,14 +223,14 @@ class NG(ComplexServiceModelBase):
         return bill_list
 
     def read_service_bills_from_db_by_resppdr(self, real_estate_list=(), service_provider_list=(), paid_date_min=None,
-                                              paid_date_max=None, to_pd_df=False):
+                                              paid_date_max=None, to_pd_df=False, fields=None):
         wheres = self.resppdr_wheres_clause(real_estate_list=real_estate_list,
                 service_provider_list=service_provider_list, paid_date_min=paid_date_min, paid_date_max=paid_date_max)
 
         with MySQLAM() as mam:
-            bill_list = mam.natgas_bill_data_read(wheres=wheres, order_bys=["paid_date"])
+            bill_list = mam.natgas_bill_data_read(wheres=wheres, order_bys=["paid_date"], fields=fields)
 
-        return self.bills_post_read(bill_list, to_pd_df=to_pd_df)
+        return self.bills_post_read(bill_list, to_pd_df=to_pd_df, fields=fields)
 
     def read_one_bill(self):
         with MySQLAM() as mam:
@@ -261,26 +262,23 @@ class NG(ComplexServiceModelBase):
         """
         with MySQLAM() as mam:
             mam.natgas_data_insert([natgas_data])
+        self.invalidate_monthly_data_cache()
 
-    def read_monthly_data_from_db_by_month_year(self, month_year):
-        """ read national grid data from natgas_data table by month and year
-
-        self.data_dict[month_year] is set with returned instance of NatGasData or None
+    def read_monthly_data_from_db_by_month_date_range(self, start_date, end_date):
+        """ read national grid data from natgas_data table by month date range inclusive with one query
 
         Args:
-            month_year (str): month and year of data ("MMYYYY" format)
+            start_date (datetime.date): NatGasData with month date greater than or equal to this date
+            end_date (datetime.date): NatGasData with month date less than or equal to this date
 
         Returns:
-            Optional[NatGasData]: NatGasData or None if no month_year found
+            list[NatGasData]: empty if no NatGasData found in date range
 
         Raises:
             MySQLException: if issue with database read
         """
         with MySQLAM() as mam:
-            data_list = mam.natgas_data_read(wheres=[["month_year", "=", month_year]])
-        self.data_dict[month_year] = None if len(data_list) == 0 else data_list[0]
-
-        return self.data_dict[month_year]
+            return mam.natgas_data_read(wheres=[["month_date", ">=", start_date], ["month_date", "<=", end_date]])
 
     def read_all_estimate_notes_by_reid_provider(self, real_estate, provider):
         """ read estimate notes from estimate_notes table by real estate and NationalGrid provider
@@ -348,64 +346,84 @@ class NG(ComplexServiceModelBase):
 
         return bill_data
 
+    # estimate bill attributes read by the estimate steps, actual bill attributes used in the estimate steps,
+    # utility data attributes used in the estimate steps and estimate bill attributes set by the estimate steps. see
+    # do_estimate_monthly_bills()
+    _ESTIMATE_INPUTS = ["total_therms", "saved_therms", "bsc_therms", "bsc_cost", "next_rate", "dra_rate", "sbc_rate",
+                        "tac_rate", "bc_cost", "gs_rate", "pbc_cost"]
+    _ESTIMATE_ACTUALS = ["over_rate", "ds_nysls_cost", "bsc_cost", "next_cost", "over_cost", "dra_cost", "sbc_cost",
+                         "bc_cost", "ds_nysst_rate", "ss_nysls_cost", "gs_cost", "ss_nysst_rate"]
+    _ESTIMATE_DATA = ["next_therms", "over_rate"]
+    _ESTIMATE_OUTPUTS = ["total_therms", "next_therms", "next_cost", "over_therms", "over_rate", "over_cost",
+                         "dra_cost", "sbc_rate", "sbc_cost", "tac_rate", "tac_cost", "ds_nysls_rate", "ds_nysls_cost",
+                         "ds_nysst_rate", "ds_nysst_cost", "ds_total_cost", "gs_cost", "ss_nysls_rate",
+                         "ss_nysls_cost", "ss_nysst_rate", "ss_nysst_cost", "ss_total_cost", "oca_total_cost",
+                         "total_cost"]
+
+    @staticmethod
+    def _sum_none(*nums):
+        return sum(filter(None, nums))
+
     def _do_estimate_total_therms(self, emb):
         """ Estimate what total natural gas therms would have been without solar
 
         Add the saved therms to the total, since the furnace would have been used if no solar bank was available.
 
         Args:
-            emb (NatGasBillData): estimate natural gas bill data
+            emb (dict): estimate natural gas bill data arrays. see ComplexServiceModelBase.bill_arrays()
 
         Returns:
-            NatGasBillData: emb with total_therms set appropriately
+            dict: emb with total_therms set appropriately
         """
-        emb.total_therms += emb.saved_therms
+        emb["total_therms"] = emb["total_therms"] + emb["saved_therms"]
 
         return emb
 
-    def _do_estimate_ds(self, emb, ngd_start, ngd_end, amb):
+    def _do_estimate_ds(self, emb, ngd_start, ngd_end, s_rat, e_rat, amb):
         """ Estimate delivery services charges
 
         Args:
-            emb (NatGasBillData): estimate natural gas bill data
-            ngd_start (NatGasData): for the earlier month
-            ngd_end (NatGasData): for the later month
-            amb (NatGasBillData): actual natural gas bill data
+            emb (dict): estimate natural gas bill data arrays. see ComplexServiceModelBase.bill_arrays()
+            ngd_start (dict): natural gas data arrays for the earlier month
+            ngd_end (dict): natural gas data arrays for the later month
+            s_rat (np.ndarray): ratio of each bill in the earlier month. see ComplexServiceModelBase.month_ratios()
+            e_rat (np.ndarray): ratio of each bill in the later month
+            amb (dict): actual natural gas bill data arrays
 
         Returns:
-            NatGasBillData: emb with delivery services charges estimated
+            dict: emb with delivery services charges estimated
         """
         def sum_none(*nums):
-            return sum(filter(None, nums))
-
-        e_rat = Decimal(emb.end_date.day / ((emb.end_date - emb.start_date).days + 1))
-        s_rat = 1 - e_rat
-
-        emb.next_therms = min(emb.total_therms - emb.bsc_therms,
-                              ngd_start.next_therms * s_rat + ngd_end.next_therms * e_rat)
-        emb.next_cost = emb.next_therms * emb.next_rate
-        emb.over_therms = emb.total_therms - emb.bsc_therms - emb.next_therms
-        # over rate may not be in the bill
-        emb.over_rate = ngd_start.over_rate * s_rat + ngd_end.over_rate * e_rat if amb.over_rate is None \
-            else amb.over_rate
-        emb.over_cost = emb.over_therms * emb.over_rate
-        emb.dra_cost = sum_none(emb.dra_rate) * emb.total_therms
-        emb.sbc_rate = sum_none(emb.sbc_rate)
-        emb.sbc_cost = emb.sbc_rate * emb.total_therms
-        emb.tac_rate = sum_none(emb.tac_rate)
-        emb.tac_cost = emb.tac_rate * emb.total_therms
-        emb.ds_nysls_rate = sum_none(amb.ds_nysls_cost) / sum_none(amb.bsc_cost, amb.next_cost, amb.over_cost,
-                                                                   amb.dra_cost, amb.sbc_cost, amb.bc_cost)
-        subtotal = sum_none(emb.bsc_cost, emb.next_cost, emb.over_cost, emb.dra_cost, emb.sbc_cost, emb.tac_cost,
-                            emb.bc_cost)
-        emb.ds_nysls_cost = emb.ds_nysls_rate * subtotal
-        emb.ds_nysst_rate = amb.ds_nysst_rate
-        emb.ds_nysst_cost = emb.ds_nysst_rate * (subtotal + emb.ds_nysls_cost)
-        emb.ds_total_cost = subtotal + emb.ds_nysls_cost + emb.ds_nysst_cost
+            return np.frompyfunc(self._sum_none, len(nums), 1)(*nums)
+
+        def over_rate(amb_over_rate, start_over_rate, end_over_rate, s_r, e_r):
+            # over rate may not be in the bill
+            return start_over_rate * s_r + end_over_rate * e_r if amb_over_rate is None else amb_over_rate
+
+        emb["next_therms"] = np.frompyfunc(min, 2, 1)(
+            emb["total_therms"] - emb["bsc_therms"], ngd_start["next_therms"] * s_rat + ngd_end["next_therms"] * e_rat)
+        emb["next_cost"] = emb["next_therms"] * emb["next_rate"]
+        emb["over_therms"] = emb["total_therms"] - emb["bsc_therms"] - emb["next_therms"]
+        emb["over_rate"] = np.frompyfunc(over_rate, 5, 1)(amb["over_rate"], ngd_start["over_rate"],
+                                                          ngd_end["over_rate"], s_rat, e_rat)
+        emb["over_cost"] = emb["over_therms"] * emb["over_rate"]
+        emb["dra_cost"] = sum_none(emb["dra_rate"]) * emb["total_therms"]
+        emb["sbc_rate"] = sum_none(emb["sbc_rate"])
+        emb["sbc_cost"] = emb["sbc_rate"] * emb["total_therms"]
+        emb["tac_rate"] = sum_none(emb["tac_rate"])
+        emb["tac_cost"] = emb["tac_rate"] * emb["total_therms"]
+        emb["ds_nysls_rate"] = sum_none(amb["ds_nysls_cost"]) / sum_none(
+            amb["bsc_cost"], amb["next_cost"], amb["over_cost"], amb["dra_cost"], amb["sbc_cost"], amb["bc_cost"])
+        subtotal = sum_none(emb["bsc_cost"], emb["next_cost"], emb["over_cost"], emb["dra_cost"], emb["sbc_cost"],
+                            emb["tac_cost"], emb["bc_cost"])
+        emb["ds_nysls_cost"] = emb["ds_nysls_rate"] * subtotal
+        emb["ds_nysst_rate"] = amb["ds_nysst_rate"]
+        emb["ds_nysst_cost"] = emb["ds_nysst_rate"] * (subtotal + emb["ds_nysls_cost"])
+        emb["ds_total_cost"] = subtotal + emb["ds_nysls_cost"] + emb["ds_nysst_cost"]
         return emb
 
     # noinspection PyTypeChecker
-    def _do_estimate_ss(self, emb, ed_start, ed_end, amb):
+    def _do_estimate_ss(self, emb, amb):
         """ Estimate supply services charges
 
         The bill can span over two months, but I can't determine how the ratio is determined (it's not as simple as a
@@ -414,41 +432,33 @@ class NG(ComplexServiceModelBase):
         subtotal of all previous supply service charges (e.g. dont include supply service sales tax in the subtotal)
 
         Args:
-            emb (NatGasBillData): estimate natural gas bill data
-            ed_start (NatGasData): for the earlier month
-            ed_end (NatGasData): for the later month
-            amb (NatGasBillData): actual natural gas bill data
+            emb (dict): estimate natural gas bill data arrays. see ComplexServiceModelBase.bill_arrays()
+            amb (dict): actual natural gas bill data arrays
 
         Returns:
-            NatGasBillData: emb with supply services charges estimated
+            dict: emb with supply services charges estimated
         """
-        def sum_none(*nums):
-            return sum(filter(None, nums))
-
-        emb.gs_cost = emb.gs_rate * emb.total_therms
-        emb.ss_nysls_rate = sum_none(amb.ss_nysls_cost) / amb.gs_cost
-        emb.ss_nysls_cost = emb.ss_nysls_rate * emb.gs_cost
-        emb.ss_nysst_rate = amb.ss_nysst_rate
-        emb.ss_nysst_cost = amb.ss_nysst_rate * emb.gs_cost
-        emb.ss_total_cost = emb.gs_cost + emb.ss_nysls_cost + emb.ss_nysst_cost
+        emb["gs_cost"] = emb["gs_rate"] * emb["total_therms"]
+        emb["ss_nysls_rate"] = np.frompyfunc(self._sum_none, 1, 1)(amb["ss_nysls_cost"]) / amb["gs_cost"]
+        emb["ss_nysls_cost"] = emb["ss_nysls_rate"] * emb["gs_cost"]
+        emb["ss_nysst_rate"] = amb["ss_nysst_rate"]
+        emb["ss_nysst_cost"] = amb["ss_nysst_rate"] * emb["gs_cost"]
+        emb["ss_total_cost"] = emb["gs_cost"] + emb["ss_nysls_cost"] + emb["ss_nysst_cost"]
 
         return emb
 
-    def _do_estimate_oca(self, emb, ed_start, ed_end, amb):
+    def _do_estimate_oca(self, emb):
         """ Estimate other charges/adjustments
 
         paperless billing credit is the only other charges/adjustments item
 
         Args:
-            emb (NatGasBillData): estimate natural gas bill data
-            ed_start (NatGasData): for the earlier month
-            ed_end (NatGasData): for the later month
-            amb (NatGasBillData): actual natural gas bill data
+            emb (dict): estimate natural gas bill data arrays. see ComplexServiceModelBase.bill_arrays()
 
         Returns:
-            NatGasBillData: emb with other charges/adjustments estimated
+            dict: emb with other charges/adjustments estimated
         """
-        emb.oca_total_cost = emb.pbc_cost
+        emb["oca_total_cost"] = emb["pbc_cost"]
 
         return emb
 
@@ -456,13 +466,12 @@ class NG(ComplexServiceModelBase):
         """ Estimate bill total cost
 
         Args:
-            emb (NatGasBillData): estimate natural gas bill data
+            emb (dict): estimate natural gas bill data arrays. see ComplexServiceModelBase.bill_arrays()
 
         Returns:
-            NatGasBillData: emb with total cost estimated
+            dict: emb with total cost estimated
         """
-        emb.total_cost = emb.ds_total_cost + emb.ss_total_cost + emb.oca_total_cost
-        emb = self.set_default_tax_related_cost([(emb, Decimal("NaN"))])[0]
+        emb["total_cost"] = emb["ds_total_cost"] + emb["ss_total_cost"] + emb["oca_total_cost"]
 
         return emb
 
@@ -497,13 +506,33 @@ class NG(ComplexServiceModelBase):
                              + str(start_date) + " - " + str(end_date) + " must be set before calling this function")
 
         # there should be only one actual bill and one estimated bill in each of the bill dicts
-        amb = amb[0]
-        emb = emb[0]
+        return self.do_estimate_monthly_bills([(amb[0], emb[0])])[0]
+
+    def do_estimate_monthly_bills(self, bill_pairs, data_dict=None):
+        """ Run the process of estimating the monthly bills if solar were not used. see superclass docstring
+
+        Args:
+            bill_pairs (list[tuple[NatGasBillData, NatGasBillData]]): (actual bill, estimate bill). estimate bills have
+                saved_therms set (see BillAndDataInput.input_and_load_natgas_estimation_data())
+            data_dict (Optional[dict]): of month year to NatGasData. Default None to use self.data_dict
+
+        Returns:
+            list[NatGasBillData]: estimated monthly bills with all applicable estimate fields set
+        """
+        data_dict = self.data_dict if data_dict is None else data_dict
+        amb_list = [amb for amb, _ in bill_pairs]
+        emb_list = [emb for _, emb in bill_pairs]
+
+        ngd_start, ngd_end = self.month_data_arrays(emb_list, data_dict, self._ESTIMATE_DATA)
+        s_rat, e_rat = self.month_ratios(emb_list)
+        amb = self.bill_arrays(amb_list, self._ESTIMATE_ACTUALS)
+        emb = self.bill_arrays(emb_list, self._ESTIMATE_INPUTS)
 
         emb = self._do_estimate_total_therms(emb)
-        emb = self._do_estimate_ds(emb, ngd_start, ngd_end, amb)
-        emb = self._do_estimate_ss(emb, ngd_start, ngd_end, amb)
-        emb = self._do_estimate_oca(emb, ngd_start, ngd_end, amb)
+        emb = self._do_estimate_ds(emb, ngd_start, ngd_end, s_rat, e_rat, amb)
+        emb = self._do_estimate_ss(emb, amb)
+        emb = self._do_estimate_oca(emb)
         emb = self._do_estimate_total_cost(emb)
 
-        return emb
\ No newline at end of file
+        self.set_bill_arrays(emb_list, {name: emb[name] for name in self._ESTIMATE_OUTPUTS})
+        return self.set_default_tax_related_cost([(bill, Decimal("NaN")) for bill in emb_list])
@@ -1,3 +1,4 @@
+from decimal import Decimal
 import datetime
 import os
 import pathlib
@@ -41,8 +42,19 @@ class UtilitySavings:
         self.final_df holds the final output dataframe with savings by month_year, total and ROI (return on investment)
 
         """
-        pseg_df = self.pseg_model.read_service_bills_from_db_by_resppdr(real_estate_list=[real_estate], to_pd_df=True)
-        pseg_df = pseg_df[["start_date", "end_date", "is_actual", "total_kwh", "eh_kwh", "total_cost"]]
+        # electric and natgas bills in one query. usage and saved_usage are renamed to each table's columns below
+        bill_df = self.pseg_model.read_bills_union_from_db_by_resppdr(
+            ["electric_bill_data", "natgas_bill_data"], real_estate_list=[real_estate],
+            fields=["start_date", "end_date", "is_actual", "usage", "saved_usage", "total_cost"],
+            aliases={"electric_bill_data": {"usage": "total_kwh", "saved_usage": "eh_kwh"},
+                     "natgas_bill_data": {"usage": "total_therms", "saved_usage": "saved_therms"}})
+        bill_df["start_date"] = pd.to_datetime(bill_df["start_date"]).dt.date
+        bill_df["end_date"] = pd.to_datetime(bill_df["end_date"]).dt.date
+        # the union read returns DECIMAL columns as float64. back to Decimal so savings are exact sums as before
+        bill_df["total_cost"] = bill_df["total_cost"].map(lambda x: x if pd.isna(x) else Decimal(str(x)))
+
+        pseg_df = bill_df[bill_df["bill_table"] == "electric_bill_data"].drop(columns=["bill_table"])
+        pseg_df = pseg_df.rename(columns={"usage": "total_kwh", "saved_usage": "eh_kwh"})
         pseg_df = pseg_df[pseg_df["is_actual"] == True].merge(pseg_df[pseg_df["is_actual"] == False],
                                       on=["start_date", "end_date"], how="left", suffixes=["_act", "_est"])
         pseg_df = pseg_df[~pseg_df["is_actual_est"].isnull()]
@@ -56,8 +68,8 @@ class UtilitySavings:
             lambda row: ElectricBillData.calc_bill_month_year(row[("PSEG", "start_date")], row[("PSEG", "end_date")]),
             axis=1)
 
-        ng_df = self.ng_model.read_service_bills_from_db_by_resppdr(real_estate_list=[real_estate], to_pd_df=True)
-        ng_df = ng_df[["start_date", "end_date", "is_actual", "total_therms", "saved_therms", "total_cost"]]
+        ng_df = bill_df[bill_df["bill_table"] == "natgas_bill_data"].drop(columns=["bill_table"])
+        ng_df = ng_df.rename(columns={"usage": "total_therms", "saved_usage": "saved_therms"})
         ng_df = ng_df[ng_df["is_actual"] == True].merge(ng_df[ng_df["is_actual"] == False],
                                       on=["start_date", "end_date"], how="left", suffixes=["_act", "_est"])
         ng_df = ng_df[~ng_df["is_actual_est"].isnull()]
@@ -0,0 +1,216 @@
+"""
+On disk cache of tables extracted from pdf files by tabula
+
+PdfCache is the only class of this module.
+"""
+import hashlib
+import os
+import pathlib
+import pickle
+import tempfile
+import threading
+import time
+
+import tabula
+
+
+class PdfCache:
+    """ Process wide on disk cache of tabula.read_pdf() results keyed by pdf file content
+
+    read_pdf() returns the cached list of dataframes of a pdf file if the same content was read before with the same
+    read_pdf() arguments, the same tabula version and the same cache VERSION, so re-processing unchanged bills skips pdf
+    extraction entirely. Renaming or moving a file does not invalidate its entry and changing a file's content or the
+    read_pdf() arguments reads the pdf again. Only the extracted tables are cached, so changes to bill parsing take
+    effect without invalidating the cache (increment VERSION if cached tables must be extracted again).
+
+    The cache is enabled when PDF_CACHE_DIR is set in .env (directory relative to the project directory like the other
+    .env directories). Each entry is one pickle file named <content hash>_<arguments hash>.pkl. After each write,
+    entries not read or written in max_age_days (PDF_CACHE_MAX_DAYS in .env, default 365) are removed, then least
+    recently used entries are removed until the cache is at most max_mb (PDF_CACHE_MAX_MB in .env, default 256) MB.
+
+    Re-parsing is forced for all files with refresh (PDF_CACHE_REFRESH in .env set to 1) or for one file with
+    invalidate(). clear() removes every entry.
+
+    .env settings are read when the cache is used (not at import), so values loaded after import are used.
+
+    Attributes:
+        cache_dir (Optional[str]): cache directory. None to use PDF_CACHE_DIR. "" to disable the cache
+        max_age_days (Optional[float]): max days since an entry was last read or written. None to use
+            PDF_CACHE_MAX_DAYS
+        max_mb (Optional[float]): max total size of entries in MB. None to use PDF_CACHE_MAX_MB
+        refresh (Optional[boolean]): True to always read pdf files and replace their entries. None to use
+            PDF_CACHE_REFRESH
+    """
+    VERSION = 1
+
+    cache_dir = None
+    max_age_days = None
+    max_mb = None
+    refresh = None
+
+    _lock = threading.Lock()
+
+    @classmethod
+    def read_pdf(cls, path, **kwargs):
+        """ tabula.read_pdf(path, **kwargs) using the cache
+
+        Args:
+            path (Union[str, pathlib.Path]): pdf file
+            **kwargs: tabula.read_pdf() keyword arguments
+
+        Returns:
+            list[pd.DataFrame]: tables of the pdf file
+        """
+        directory = cls.directory()
+        if directory is None:
+            return tabula.read_pdf(path, **kwargs)
+
+        entry = directory / (cls.content_hash(path) + "_" + cls.arguments_hash(kwargs) + ".pkl")
+        if not cls.is_refresh() and entry.is_file():
+            try:
+                with open(entry, "rb") as f:
+                    df_list = pickle.load(f)
+                os.utime(entry)
+                return df_list
+            except (OSError, EOFError, pickle.UnpicklingError):
+                # unreadable entry (e.g. removed by another process or partially written). read the pdf again
+                pass
+
+        df_list = tabula.read_pdf(path, **kwargs)
+
+        # write to a temporary file and rename so readers never see a partial entry
+        fd, tmp_name = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(df_list, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_name, entry)
+        except OSError:
+            pathlib.Path(tmp_name).unlink(missing_ok=True)
+            raise
+        cls.evict()
+
+        return df_list
+
+    @classmethod
+    def directory(cls):
+        """ Cache directory, created if it does not exist
+
+        Returns:
+            Optional[pathlib.Path]: None if the cache is disabled
+        """
+        cache_dir = os.getenv("PDF_CACHE_DIR") if cls.cache_dir is None else cls.cache_dir
+        if cache_dir is None or cache_dir == "":
+            return None
+        directory = pathlib.Path(__file__).parent.parent.parent / cache_dir
+        directory.mkdir(parents=True, exist_ok=True)
+
+        return directory
+
+    @classmethod
+    def age_limit_days(cls):
+        """ Max days since an entry was last read or written
+
+        Returns:
+            float: cls.max_age_days if set, otherwise PDF_CACHE_MAX_DAYS (default 365)
+        """
+        return float(os.getenv("PDF_CACHE_MAX_DAYS", "365")) if cls.max_age_days is None else cls.max_age_days
+
+    @classmethod
+    def size_limit_mb(cls):
+        """ Max total size of entries in MB
+
+        Returns:
+            float: cls.max_mb if set, otherwise PDF_CACHE_MAX_MB (default 256)
+        """
+        return float(os.getenv("PDF_CACHE_MAX_MB", "256")) if cls.max_mb is None else cls.max_mb
+
+    @classmethod
+    def is_refresh(cls):
+        """ Whether pdf files are always read and their entries replaced
+
+        Returns:
+            boolean: cls.refresh if set, otherwise True if PDF_CACHE_REFRESH is "1"
+        """
+        return os.getenv("PDF_CACHE_REFRESH", "0") == "1" if cls.refresh is None else cls.refresh
+
+    @staticmethod
+    def content_hash(path):
+        """ SHA-256 hex digest of the content of file path
+
+        Args:
+            path (Union[str, pathlib.Path]): file
+
+        Returns:
+            str: hex digest
+        """
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                digest.update(chunk)
+
+        return digest.hexdigest()
+
+    @classmethod
+    def arguments_hash(cls, kwargs):
+        """ SHA-256 hex digest of read_pdf() keyword arguments, tabula version and cache VERSION
+
+        Args:
+            kwargs (dict): tabula.read_pdf() keyword arguments
+
+        Returns:
+            str: hex digest (first 16 characters)
+        """
+        key = repr((cls.VERSION, getattr(tabula, "__version__", None), sorted(kwargs.items())))
+
+        return hashlib.sha256(key.encode()).hexdigest()[:16]
+
+    @classmethod
+    def invalidate(cls, path):
+        """ Remove all entries of the content of file path so its next read_pdf() reads the pdf
+
+        Args:
+            path (Union[str, pathlib.Path]): pdf file
+        """
+        directory = cls.directory()
+        if directory is None:
+            return
+        for entry in directory.glob(cls.content_hash(path) + "_*.pkl"):
+            entry.unlink(missing_ok=True)
+
+    @classmethod
+    def clear(cls):
+        """ Remove all entries """
+        directory = cls.directory()
+        if directory is None:
+            return
+        with cls._lock:
+            for entry in directory.glob("*.pkl"):
+                entry.unlink(missing_ok=True)
+
+    @classmethod
+    def evict(cls):
+        """ Remove expired entries, then least recently used entries until the cache is small enough
+
+        Entries not read or written in age_limit_days() are expired. The cache is small enough at size_limit_mb() MB
+        """
+        directory = cls.directory()
+        if directory is None:
+            return
+        with cls._lock:
+            entries = []
+            for entry in directory.glob("*.pkl"):
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry))
+            entries.sort()
+
+            oldest = time.time() - cls.age_limit_days() * 86400
+            max_bytes = cls.size_limit_mb() * 1024 * 1024
+            total = sum(size for _, size, _ in entries)
+            for mtime, size, entry in entries:
+                if mtime >= oldest and total <= max_bytes:
+                    break
+                entry.unlink(missing_ok=True)
+                total -= size